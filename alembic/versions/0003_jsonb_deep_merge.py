@@ -0,0 +1,67 @@
+"""jsonb_deep_merge_replace_lists() + decision_events.version
+
+Revision ID: 0003_jsonb_deep_merge
+Revises: 0002_decision_events_status
+Create Date: 2026-10-17
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003_jsonb_deep_merge"
+down_revision = "0002_decision_events_status"
+branch_labels = None
+depends_on = None
+
+
+# Same semantics as events.deep_merge_replace_lists():
+# - object + object: recursive merge
+# - JSON null in patch for an existing key: keep base
+# - anything else in patch (lists included): replace
+DEEP_MERGE_FN = """
+CREATE OR REPLACE FUNCTION jsonb_deep_merge_replace_lists(base jsonb, patch jsonb)
+RETURNS jsonb
+LANGUAGE plpgsql
+IMMUTABLE
+AS $$
+BEGIN
+    IF patch IS NULL OR jsonb_typeof(patch) = 'null' THEN
+        RETURN base;
+    END IF;
+
+    IF base IS NULL OR jsonb_typeof(base) <> 'object' OR jsonb_typeof(patch) <> 'object' THEN
+        RETURN patch;
+    END IF;
+
+    RETURN base || COALESCE(
+        (
+            SELECT jsonb_object_agg(
+                p.key,
+                CASE
+                    WHEN base ? p.key THEN jsonb_deep_merge_replace_lists(base -> p.key, p.value)
+                    ELSE p.value
+                END
+            )
+            FROM jsonb_each(patch) AS p
+        ),
+        '{}'::jsonb
+    );
+END;
+$$;
+"""
+
+
+def upgrade() -> None:
+    op.execute(DEEP_MERGE_FN)
+
+    # Optimistic concurrency for draft patches: bumped on every payload write.
+    op.add_column(
+        "decision_events",
+        sa.Column("version", sa.Integer(), nullable=False, server_default=sa.text("1")),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("decision_events", "version")
+    op.execute("DROP FUNCTION IF EXISTS jsonb_deep_merge_replace_lists(jsonb, jsonb);")
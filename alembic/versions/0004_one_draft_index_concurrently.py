@@ -0,0 +1,64 @@
+"""ensure ux_decision_events_one_draft exists (built CONCURRENTLY)
+
+Revision ID: 0004_one_draft_index_concurrently
+Revises: 0003_jsonb_deep_merge
+Create Date: 2026-10-17
+
+create_or_reuse_draft now relies on this index as its ON CONFLICT arbiter.
+0002 creates it on fresh databases; databases migrated before 0002 carried
+it may not have it. Built CONCURRENTLY so decision_events stays writable.
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004_one_draft_index_concurrently"
+down_revision = "0003_jsonb_deep_merge"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The unique build fails on duplicate drafts. Keep the most recently
+    # updated draft per (case_id, event_type): the one the old endpoint reused.
+    op.execute(
+        """
+        DELETE FROM decision_events d
+        USING (
+            SELECT id,
+                   row_number() OVER (PARTITION BY case_id, event_type ORDER BY updated_at DESC, id) AS rn
+            FROM decision_events
+            WHERE status = 'DRAFT'
+        ) ranked
+        WHERE d.id = ranked.id AND ranked.rn > 1;
+        """
+    )
+
+    with op.get_context().autocommit_block():
+        # A previously interrupted CONCURRENTLY build leaves an INVALID index behind.
+        invalid = op.get_bind().execute(
+            sa.text(
+                """
+                SELECT NOT i.indisvalid
+                FROM pg_index i
+                JOIN pg_class c ON c.oid = i.indexrelid
+                WHERE c.relname = 'ux_decision_events_one_draft'
+                """
+            )
+        ).scalar()
+        if invalid:
+            op.execute("DROP INDEX CONCURRENTLY IF EXISTS ux_decision_events_one_draft;")
+
+        op.execute(
+            """
+            CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ux_decision_events_one_draft
+            ON decision_events (case_id, event_type)
+            WHERE status = 'DRAFT';
+            """
+        )
+
+
+def downgrade() -> None:
+    # The index is owned by 0002 on fresh databases; leave it in place.
+    pass
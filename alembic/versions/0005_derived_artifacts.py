@@ -0,0 +1,34 @@
+"""create derived_artifacts (LLM output cache keyed by input hash)
+
+Revision ID: 0005_derived_artifacts
+Revises: 0004_one_draft_index_concurrently
+Create Date: 2026-10-17
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0005_derived_artifacts"
+down_revision = "0004_one_draft_index_concurrently"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "derived_artifacts",
+        # sha256 of (route, event_type, canonical payload, prompt_version, model)
+        sa.Column("input_hash", sa.Text, primary_key=True, nullable=False),
+        sa.Column("route", sa.Text, nullable=False),
+        sa.Column("event_type", sa.Text, nullable=True),
+        sa.Column("prompt_version", sa.Text, nullable=False),
+        sa.Column("model", sa.Text, nullable=False),
+        sa.Column("output", postgresql.JSONB, nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("derived_artifacts")
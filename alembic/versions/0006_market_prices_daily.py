@@ -0,0 +1,38 @@
+"""create market_prices_daily (daily price facts)
+
+Revision ID: 0006_market_prices_daily
+Revises: 0005_derived_artifacts
+Create Date: 2026-10-17
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006_market_prices_daily"
+down_revision = "0005_derived_artifacts"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Some environments created this table by hand before it was migrated.
+    if sa.inspect(op.get_bind()).has_table("market_prices_daily"):
+        return
+
+    op.create_table(
+        "market_prices_daily",
+        sa.Column("ticker", sa.String, primary_key=True, nullable=False),
+        sa.Column("date", sa.Date, primary_key=True, nullable=False),
+        sa.Column("close", sa.Numeric(18, 6), nullable=True),
+        sa.Column("adj_close", sa.Numeric(18, 6), nullable=True),
+        sa.Column("volume", sa.BigInteger, nullable=True),
+        sa.Column("ret_1d", sa.Numeric(18, 8), nullable=True),
+        sa.Column("vol_20d", sa.Numeric(18, 8), nullable=True),
+        sa.Column("source", sa.String, server_default="yahoo", nullable=False),
+        sa.Column("loaded_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("market_prices_daily")
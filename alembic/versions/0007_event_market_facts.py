@@ -0,0 +1,51 @@
+"""create event_market_facts (forward returns per FINAL event)
+
+Revision ID: 0007_event_market_facts
+Revises: 0006_market_prices_daily
+Create Date: 2026-10-17
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0007_event_market_facts"
+down_revision = "0006_market_prices_daily"
+branch_labels = None
+depends_on = None
+
+HORIZONS = (1, 5, 20, 60)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "event_market_facts",
+        # decision_events.id; no FK so facts can be rebuilt/truncated independently
+        sa.Column("event_id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
+        sa.Column("case_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("ticker", sa.Text, nullable=False),
+        sa.Column("event_type", sa.Text, nullable=False),
+        sa.Column("event_ts", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("direction", sa.Text, nullable=True),
+        sa.Column("sign", sa.SmallInteger, nullable=True),
+        sa.Column("base_date", sa.Date, nullable=True),
+        sa.Column("base_close", sa.Float, nullable=True),
+        *[sa.Column(f"ret_{h}d", sa.Float, nullable=True) for h in HORIZONS],
+        *[sa.Column(f"signed_ret_{h}d", sa.Float, nullable=True) for h in HORIZONS],
+        sa.Column("complete", sa.Boolean, server_default=sa.text("false"), nullable=False),
+        sa.Column("computed_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+    op.create_index("ix_event_market_facts_case_id_event_type", "event_market_facts", ["case_id", "event_type"])
+    op.create_index(
+        "ix_event_market_facts_incomplete_ticker",
+        "event_market_facts",
+        ["ticker"],
+        postgresql_where=sa.text("NOT complete"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_event_market_facts_incomplete_ticker", table_name="event_market_facts")
+    op.drop_index("ix_event_market_facts_case_id_event_type", table_name="event_market_facts")
+    op.drop_table("event_market_facts")
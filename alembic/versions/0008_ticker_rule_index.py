@@ -0,0 +1,52 @@
+"""partial expression index for TICKER_RULE lookups (built CONCURRENTLY)
+
+Revision ID: 0008_ticker_rule_index
+Revises: 0007_event_market_facts
+Create Date: 2026-10-17
+
+list_ticker_rules filters decision_events on payload ->> 'ticker' for
+event_type = 'TICKER_RULE'; without this index that is a sequential scan
+of the whole journal. Built CONCURRENTLY so decision_events stays writable.
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008_ticker_rule_index"
+down_revision = "0007_event_market_facts"
+branch_labels = None
+depends_on = None
+
+INDEX = "ix_decision_events_ticker_rule"
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        # A previously interrupted CONCURRENTLY build leaves an INVALID index behind.
+        invalid = op.get_bind().execute(
+            sa.text(
+                """
+                SELECT NOT i.indisvalid
+                FROM pg_index i
+                JOIN pg_class c ON c.oid = i.indexrelid
+                WHERE c.relname = :name
+                """
+            ),
+            {"name": INDEX},
+        ).scalar()
+        if invalid:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {INDEX};")
+
+        op.execute(
+            f"""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS {INDEX}
+            ON decision_events ((payload ->> 'ticker'), event_ts)
+            WHERE event_type = 'TICKER_RULE';
+            """
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {INDEX};")
@@ -0,0 +1,68 @@
+"""stored generated columns for hot decision_events payload fields
+
+Revision ID: 0009_event_payload_columns
+Revises: 0008_ticker_rule_index
+Create Date: 2026-10-17
+
+Adds STORED generated columns (direction, conviction, position_intent_pct,
+conviction_delta, to_pct, risk_type, severity, due_by, outcome), each set
+only for FINAL events of its event type whose payload value has the expected
+JSON type, plus partial B-tree indexes for the filter columns.
+
+All columns are added in one ALTER TABLE, so decision_events is rewritten
+once, under an ACCESS EXCLUSIVE lock: run in a maintenance window on large
+journals. due_by stays text (a ::date cast is not immutable).
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0009_event_payload_columns"
+down_revision = "0008_ticker_rule_index"
+branch_labels = None
+depends_on = None
+
+# column -> (SQL type, event_type, JSON type, cast)
+FIELDS = {
+    "direction": ("text", "INITIATE", "string", ""),
+    "conviction": ("integer", "INITIATE", "number", "numeric::int"),
+    "position_intent_pct": ("double precision", "INITIATE", "number", "float8"),
+    "conviction_delta": ("integer", "THESIS_UPDATE", "number", "numeric::int"),
+    "to_pct": ("double precision", "RESIZE", "number", "float8"),
+    "risk_type": ("text", "RISK_NOTE", "string", ""),
+    "severity": ("text", "RISK_NOTE", "string", ""),
+    "due_by": ("text", "RISK_NOTE", "string", ""),
+    "outcome": ("text", "POST_MORTEM", "string", ""),
+}
+
+INDEXES = {
+    "ix_decision_events_risk_type_severity": (["risk_type", "severity"], "risk_type IS NOT NULL"),
+    "ix_decision_events_due_by": (["due_by"], "due_by IS NOT NULL"),
+    "ix_decision_events_outcome": (["outcome"], "outcome IS NOT NULL"),
+}
+
+
+def generation_sql(key: str, event_type: str, jsonb_type: str, cast: str) -> str:
+    value = f"(payload ->> '{key}')" + (f"::{cast}" if cast else "")
+    return (
+        f"CASE WHEN event_type = '{event_type}' AND status = 'FINAL' "
+        f"AND jsonb_typeof(payload -> '{key}') = '{jsonb_type}' THEN {value} END"
+    )
+
+
+def upgrade() -> None:
+    adds = ",\n".join(
+        f"ADD COLUMN {name} {sql_type} GENERATED ALWAYS AS ({generation_sql(name, et, jt, cast)}) STORED"
+        for name, (sql_type, et, jt, cast) in FIELDS.items()
+    )
+    op.execute(f"ALTER TABLE decision_events\n{adds};")
+
+    for name, (cols, where) in INDEXES.items():
+        op.create_index(name, "decision_events", cols, postgresql_where=sa.text(where))
+
+
+def downgrade() -> None:
+    for name in INDEXES:
+        op.drop_index(name, table_name="decision_events")
+    op.execute("ALTER TABLE decision_events " + ", ".join(f"DROP COLUMN {name}" for name in FIELDS) + ";")
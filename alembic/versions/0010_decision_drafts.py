@@ -0,0 +1,79 @@
+"""move drafts out of decision_events into decision_drafts
+
+Revision ID: 0010_decision_drafts
+Revises: 0009_event_payload_columns
+Create Date: 2026-10-17
+
+Drafts are rewritten on every chat answer. In decision_events each write
+was a non-HOT update of the journal table and its indexes; decision_drafts
+carries only its PK and the (case_id, event_type) unique constraint, with
+fillfactor 50 so payload updates fit on the same page (HOT).
+
+Existing DRAFT rows are moved (same ids) and the partial unique index
+ux_decision_events_one_draft is dropped: decision_events now only holds FINAL rows.
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0010_decision_drafts"
+down_revision = "0009_event_payload_columns"
+branch_labels = None
+depends_on = None
+
+COLUMNS = "id, case_id, event_ts, event_type, payload, version, updated_at, created_at"
+
+
+def upgrade() -> None:
+    op.create_table(
+        "decision_drafts",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
+        sa.Column(
+            "case_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("trade_cases.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("event_ts", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("event_type", sa.Text, nullable=False),
+        sa.Column("payload", postgresql.JSONB, server_default=sa.text("'{}'::jsonb"), nullable=False),
+        sa.Column("version", sa.Integer, server_default=sa.text("1"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.UniqueConstraint("case_id", "event_type", name="ux_decision_drafts_case_type"),
+    )
+    op.execute(
+        "ALTER TABLE decision_drafts SET (fillfactor = 50, autovacuum_vacuum_scale_factor = 0.05);"
+    )
+
+    # ux_decision_events_one_draft (0002/0004) guarantees no (case_id, event_type) collisions.
+    op.execute(
+        f"""
+        WITH moved AS (
+            DELETE FROM decision_events WHERE status = 'DRAFT'
+            RETURNING {COLUMNS}
+        )
+        INSERT INTO decision_drafts ({COLUMNS})
+        SELECT {COLUMNS} FROM moved;
+        """
+    )
+    op.execute("DROP INDEX IF EXISTS ux_decision_events_one_draft;")
+
+
+def downgrade() -> None:
+    op.execute(
+        f"""
+        INSERT INTO decision_events ({COLUMNS}, status)
+        SELECT {COLUMNS}, 'DRAFT' FROM decision_drafts;
+        """
+    )
+    op.create_index(
+        "ux_decision_events_one_draft",
+        "decision_events",
+        ["case_id", "event_type"],
+        unique=True,
+        postgresql_where=sa.text("status = 'DRAFT'"),
+    )
+    op.drop_table("decision_drafts")
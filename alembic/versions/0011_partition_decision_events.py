@@ -0,0 +1,173 @@
+"""partition decision_events by month on event_ts
+
+Revision ID: 0011_partition_decision_events
+Revises: 0010_decision_drafts
+Create Date: 2026-10-17
+
+decision_events becomes a declaratively partitioned table (RANGE on
+event_ts, one partition per UTC month, plus a DEFAULT partition as a safety
+net). The primary key becomes (id, event_ts): a unique constraint on a
+partitioned table must include the partition key.
+
+Partitions are created by ensure_decision_events_partitions(from, to), which
+is idempotent. This migration calls it for the existing data range plus
+three months ahead; the app calls it at startup and before writing events
+into a month it has not seen (app/services/partitions.py).
+
+Offline migration: rows are copied into the new table and the tables are
+swapped under an ACCESS EXCLUSIVE lock. Indexes are built after the copy.
+"""
+from __future__ import annotations
+
+from alembic import op
+
+revision = "0011_partition_decision_events"
+down_revision = "0010_decision_drafts"
+branch_labels = None
+depends_on = None
+
+# Writable (non-generated) columns, for copying between the two layouts.
+COLUMNS = "id, case_id, event_ts, event_type, payload, status, updated_at, version, created_at"
+
+INDEXES = [
+    "CREATE INDEX ix_decision_events_case_id ON decision_events (case_id)",
+    "CREATE INDEX ix_decision_events_event_ts ON decision_events (event_ts)",
+    "CREATE INDEX ix_decision_events_case_id_event_ts ON decision_events (case_id, event_ts)",
+    "CREATE INDEX ix_decision_events_case_type_status ON decision_events (case_id, event_type, status)",
+    "CREATE INDEX ix_decision_events_ticker_rule ON decision_events ((payload ->> 'ticker'), event_ts) "
+    "WHERE event_type = 'TICKER_RULE'",
+    "CREATE INDEX ix_decision_events_risk_type_severity ON decision_events (risk_type, severity) "
+    "WHERE risk_type IS NOT NULL",
+    "CREATE INDEX ix_decision_events_due_by ON decision_events (due_by) WHERE due_by IS NOT NULL",
+    "CREATE INDEX ix_decision_events_outcome ON decision_events (outcome) WHERE outcome IS NOT NULL",
+]
+
+ENSURE_FUNCTION = r"""
+CREATE OR REPLACE FUNCTION ensure_decision_events_partitions(p_from timestamptz, p_to timestamptz)
+RETURNS integer
+LANGUAGE plpgsql AS $$
+DECLARE
+    m date := date_trunc('month', p_from AT TIME ZONE 'UTC')::date;
+    last_month date := date_trunc('month', p_to AT TIME ZONE 'UTC')::date;
+    part text;
+    created integer := 0;
+BEGIN
+    WHILE m <= last_month LOOP
+        part := 'decision_events_p' || to_char(m, 'YYYYMM');
+        IF to_regclass(part) IS NULL THEN
+            BEGIN
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF decision_events FOR VALUES FROM (%L) TO (%L)',
+                    part,
+                    (m::timestamp AT TIME ZONE 'UTC'),
+                    ((m + interval '1 month')::timestamp AT TIME ZONE 'UTC')
+                );
+                created := created + 1;
+            EXCEPTION
+                -- Rows for this month already sit in the DEFAULT partition; leave them there.
+                WHEN check_violation THEN
+                    RAISE WARNING 'decision_events: % not created, DEFAULT partition holds rows for it', part;
+                -- A concurrent caller created it first.
+                WHEN duplicate_table THEN
+                    NULL;
+            END;
+        END IF;
+        m := (m + interval '1 month')::date;
+    END LOOP;
+    RETURN created;
+END
+$$;
+"""
+
+
+def upgrade() -> None:
+    op.execute("LOCK TABLE decision_events IN ACCESS EXCLUSIVE MODE;")
+    op.execute("ALTER TABLE decision_events RENAME TO decision_events_unpartitioned;")
+    # Old index/constraint names would clash with the new table's.
+    op.execute(
+        """
+        DO $$
+        DECLARE r record;
+        BEGIN
+            FOR r IN
+                SELECT c.relname FROM pg_index i
+                JOIN pg_class c ON c.oid = i.indexrelid
+                WHERE i.indrelid = 'decision_events_unpartitioned'::regclass AND NOT i.indisprimary
+            LOOP
+                EXECUTE format('DROP INDEX %I', r.relname);
+            END LOOP;
+        END $$;
+        """
+    )
+    op.execute("ALTER TABLE decision_events_unpartitioned DROP CONSTRAINT IF EXISTS decision_events_pkey;")
+
+    op.execute(
+        """
+        CREATE TABLE decision_events (
+            LIKE decision_events_unpartitioned INCLUDING DEFAULTS INCLUDING GENERATED,
+            PRIMARY KEY (id, event_ts),
+            FOREIGN KEY (case_id) REFERENCES trade_cases (id) ON DELETE CASCADE
+        ) PARTITION BY RANGE (event_ts);
+        """
+    )
+    op.execute("CREATE TABLE decision_events_default PARTITION OF decision_events DEFAULT;")
+    op.execute(ENSURE_FUNCTION)
+    op.execute(
+        """
+        SELECT ensure_decision_events_partitions(
+            COALESCE((SELECT min(event_ts) FROM decision_events_unpartitioned), now()),
+            now() + interval '3 months'
+        );
+        """
+    )
+
+    op.execute(
+        f"""
+        INSERT INTO decision_events ({COLUMNS})
+        SELECT {COLUMNS} FROM decision_events_unpartitioned;
+        """
+    )
+    for stmt in INDEXES:
+        op.execute(stmt + ";")
+    op.execute("DROP TABLE decision_events_unpartitioned;")
+    op.execute("ANALYZE decision_events;")
+
+
+def downgrade() -> None:
+    op.execute("LOCK TABLE decision_events IN ACCESS EXCLUSIVE MODE;")
+    op.execute("ALTER TABLE decision_events RENAME TO decision_events_partitioned;")
+    op.execute(
+        """
+        DO $$
+        DECLARE r record;
+        BEGIN
+            FOR r IN
+                SELECT c.relname FROM pg_index i
+                JOIN pg_class c ON c.oid = i.indexrelid
+                WHERE i.indrelid = 'decision_events_partitioned'::regclass AND NOT i.indisprimary
+            LOOP
+                EXECUTE format('DROP INDEX %I', r.relname);
+            END LOOP;
+        END $$;
+        """
+    )
+    op.execute("ALTER TABLE decision_events_partitioned DROP CONSTRAINT IF EXISTS decision_events_pkey;")
+    op.execute(
+        """
+        CREATE TABLE decision_events (
+            LIKE decision_events_partitioned INCLUDING DEFAULTS INCLUDING GENERATED,
+            PRIMARY KEY (id),
+            FOREIGN KEY (case_id) REFERENCES trade_cases (id) ON DELETE CASCADE
+        );
+        """
+    )
+    op.execute(
+        f"""
+        INSERT INTO decision_events ({COLUMNS})
+        SELECT {COLUMNS} FROM decision_events_partitioned;
+        """
+    )
+    for stmt in INDEXES:
+        op.execute(stmt + ";")
+    op.execute("DROP TABLE decision_events_partitioned CASCADE;")
+    op.execute("DROP FUNCTION IF EXISTS ensure_decision_events_partitions(timestamptz, timestamptz);")
@@ -0,0 +1,69 @@
+"""BRIN indexes on append-ordered timestamps; archived_cases
+
+Revision ID: 0012_brin_and_archive
+Revises: 0011_partition_decision_events
+Create Date: 2026-10-17
+
+- decision_events.event_ts: the global B-tree ix_decision_events_event_ts is
+  replaced by a BRIN index. Rows arrive roughly in event_ts order and each
+  monthly partition is a narrow range, so a BRIN summary is a few pages
+  instead of a B-tree entry per event. Per-case reads keep using
+  ix_decision_events_case_id_event_ts.
+- BRIN on decision_events.created_at, thesis_snapshots.created_at and
+  trade_cases.opened_at (insert-ordered; none had an index).
+- archived_cases: one row per case whose FINAL events were moved to a
+  compressed JSONL segment by app/services/archive.py.
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0012_brin_and_archive"
+down_revision = "0011_partition_decision_events"
+branch_labels = None
+depends_on = None
+
+PAGES_PER_RANGE = 32
+
+BRIN = {
+    "brin_decision_events_event_ts": ("decision_events", "event_ts"),
+    "brin_decision_events_created_at": ("decision_events", "created_at"),
+    "brin_thesis_snapshots_created_at": ("thesis_snapshots", "created_at"),
+    "brin_trade_cases_opened_at": ("trade_cases", "opened_at"),
+}
+
+
+def upgrade() -> None:
+    for name, (table, column) in BRIN.items():
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS {name} ON {table} USING brin ({column}) "
+            f"WITH (pages_per_range = {PAGES_PER_RANGE});"
+        )
+    op.execute("DROP INDEX IF EXISTS ix_decision_events_event_ts;")
+
+    op.create_table(
+        "archived_cases",
+        sa.Column(
+            "case_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("trade_cases.id", ondelete="CASCADE"),
+            primary_key=True,
+            nullable=False,
+        ),
+        sa.Column("segment", sa.Text, nullable=False),  # path relative to ARCHIVE_ROOT
+        sa.Column("sha256", sa.Text, nullable=False),
+        sa.Column("event_count", sa.Integer, nullable=False),
+        sa.Column("first_event_ts", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_event_ts", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("archived_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    # Archived events are not restored here; run the archive restore first.
+    op.drop_table("archived_cases")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_decision_events_event_ts ON decision_events (event_ts);")
+    for name in BRIN:
+        op.execute(f"DROP INDEX IF EXISTS {name};")
@@ -0,0 +1,46 @@
+"""one replay checkpoint per (case_id, asof_ts)
+
+Revision ID: 0013_checkpoint_unique
+Revises: 0012_brin_and_archive
+Create Date: 2026-10-17
+
+Concurrent replays of the same case could each insert the checkpoints they
+crossed. Duplicates are dropped (oldest row kept) before the partial unique
+index is built; save_checkpoints inserts with ON CONFLICT DO NOTHING on it.
+"""
+from __future__ import annotations
+
+from alembic import op
+
+revision = "0013_checkpoint_unique"
+down_revision = "0012_brin_and_archive"
+branch_labels = None
+depends_on = None
+
+INDEX = "uq_thesis_snapshots_checkpoint"
+CHECKPOINT_MODEL = "checkpoint:fold:v1"
+
+
+def upgrade() -> None:
+    op.execute(
+        f"""
+        DELETE FROM thesis_snapshots s
+        USING thesis_snapshots k
+        WHERE s.model = '{CHECKPOINT_MODEL}'
+          AND k.model = '{CHECKPOINT_MODEL}'
+          AND k.case_id = s.case_id
+          AND k.asof_ts = s.asof_ts
+          AND (k.created_at, k.id) < (s.created_at, s.id);
+        """
+    )
+    op.execute(
+        f"""
+        CREATE UNIQUE INDEX IF NOT EXISTS {INDEX}
+        ON thesis_snapshots (case_id, asof_ts)
+        WHERE model = '{CHECKPOINT_MODEL}';
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(f"DROP INDEX IF EXISTS {INDEX};")
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_async_db
+from app.services.adv import adv_cache, compute_adv, resize_adv_facts
+from app.services.book_risk import book_risk
+from app.services.exposure import (
+    EXPOSURE_SQL,
+    SERIES_CASES_SQL,
+    SERIES_EVENTS_SQL,
+    day_end,
+    exposure_from_positions,
+    exposure_series,
+)
+from app.settings import settings
+
+router = APIRouter()
+
+CASE_TICKER_SQL = text("SELECT ticker FROM trade_cases WHERE id = :case_id")
+
+# Pattern counts over the generated payload columns of FINAL events (0009).
+PATTERN_SQL = {
+    "initiates": text(
+        """
+        SELECT e.direction, count(*) AS n, avg(e.conviction)::float8 AS avg_conviction
+        FROM decision_events e
+        JOIN trade_cases c ON c.id = e.case_id
+        WHERE c.book = :book AND e.direction IS NOT NULL
+          AND e.event_ts >= :since AND e.event_ts <= :until
+        GROUP BY e.direction
+        ORDER BY e.direction
+        """
+    ),
+    "risk_notes": text(
+        """
+        SELECT e.risk_type, e.severity, count(*) AS n
+        FROM decision_events e
+        JOIN trade_cases c ON c.id = e.case_id
+        WHERE c.book = :book AND e.risk_type IS NOT NULL
+          AND e.event_ts >= :since AND e.event_ts <= :until
+        GROUP BY e.risk_type, e.severity
+        ORDER BY e.risk_type, e.severity
+        """
+    ),
+    "outcomes": text(
+        """
+        SELECT e.outcome, count(*) AS n
+        FROM decision_events e
+        JOIN trade_cases c ON c.id = e.case_id
+        WHERE c.book = :book AND e.outcome IS NOT NULL
+          AND e.event_ts >= :since AND e.event_ts <= :until
+        GROUP BY e.outcome
+        ORDER BY e.outcome
+        """
+    ),
+}
+
+
+def normalize_book(value: str) -> str:
+    b = str(value or "").strip()
+    if not b:
+        raise HTTPException(400, "book is required")
+    return b
+
+
+@router.get("/books/{book}/exposure")
+async def book_exposure(
+    book: str,
+    asof: Optional[datetime] = Query(default=None, description="Default: now"),
+    db: AsyncSession = Depends(get_async_db),
+) -> Dict[str, Any]:
+    """
+    Gross / net / long / short exposure (% of NAV) and per-ticker signed weights
+    for the book's open cases as of a time. One query (DISTINCT ON per case).
+    """
+    b = normalize_book(book)
+    t = asof or datetime.now(timezone.utc)
+    rows = (await db.execute(EXPOSURE_SQL, {"book": b, "asof": t})).all()
+    return {"book": b, "asof": t.isoformat(), **exposure_from_positions(rows)}
+
+
+@router.get("/books/{book}/exposure/series")
+async def book_exposure_series(
+    book: str,
+    start: date = Query(...),
+    end: date = Query(...),
+    db: AsyncSession = Depends(get_async_db),
+) -> Dict[str, Any]:
+    """
+    Daily exposure totals for start..end (inclusive, UTC days), computed from
+    one fetch of cases + INITIATE/RESIZE events and a single forward sweep.
+    """
+    b = normalize_book(book)
+    if end < start:
+        raise HTTPException(400, "end must be >= start")
+    if (end - start).days + 1 > settings.BOOK_SERIES_MAX_DAYS:
+        raise HTTPException(400, f"Range too long (max {settings.BOOK_SERIES_MAX_DAYS} days)")
+
+    params = {
+        "book": b,
+        "since": datetime.combine(start, datetime.min.time(), tzinfo=timezone.utc),
+        "until": day_end(end),
+    }
+    cases = (await db.execute(SERIES_CASES_SQL, params)).all()
+    events = (await db.execute(SERIES_EVENTS_SQL, params)).all()
+    return {"book": b, "points": exposure_series(cases, events, start, end)}
+
+
+@router.get("/books/{book}/risk")
+async def book_risk_facts(
+    book: str,
+    asof: Optional[datetime] = Query(default=None, description="Default: now"),
+    lookback: int = Query(default=60, ge=2, le=756, description="Trading days of ret_1d"),
+    top: int = Query(default=10, ge=1, le=100),
+    include_corr: bool = Query(default=False, description="Include the full correlation matrix"),
+    db: AsyncSession = Depends(get_async_db),
+) -> Dict[str, Any]:
+    """
+    Realized vol of the weighted book, correlation, Herfindahl concentration and
+    top variance contributors for the book's open cases as of a time.
+    """
+    b = normalize_book(book)
+    t = asof or datetime.now(timezone.utc)
+    exposure = exposure_from_positions((await db.execute(EXPOSURE_SQL, {"book": b, "asof": t})).all())
+    weights = {w["ticker"]: w["weight"] for w in exposure["weights"]}
+    risk = await book_risk(db, b, t.date(), weights, lookback=lookback, top=top, include_corr=include_corr)
+    return {"book": b, "asof": t.isoformat(), "lookback": lookback, "gross": exposure["gross"], "net": exposure["net"], **risk}
+
+
+def resolve_nav(nav: Optional[float]) -> Optional[float]:
+    if nav is not None and nav <= 0:
+        raise HTTPException(400, "nav must be > 0")
+    return nav or settings.BOOK_NAV_USD or None
+
+
+@router.get("/books/{book}/adv_facts")
+async def book_adv_facts(
+    book: str,
+    nav: Optional[float] = Query(default=None, description="Book NAV in USD; default BOOK_NAV_USD"),
+    asof: Optional[date] = Query(default=None, description="Default: latest bars (cached)"),
+    db: AsyncSession = Depends(get_async_db),
+) -> Dict[str, Any]:
+    """
+    20d / 60d ADV and the ADV share implied by each open position's size
+    (latest RESIZE to_pct, else INITIATE intent) for the book's open cases.
+    """
+    b = normalize_book(book)
+    v = resolve_nav(nav)
+    now = datetime.now(timezone.utc)
+    exposure = exposure_from_positions((await db.execute(EXPOSURE_SQL, {"book": b, "asof": now})).all())
+    rows = exposure["positions"] + exposure["unsigned"]
+    tickers = [p["ticker"] for p in rows]
+    if asof is None:
+        adv = await adv_cache.get_many(db, tickers)
+    else:
+        adv = await compute_adv(db, tickers, asof)
+    positions = [
+        {"case_id": p["case_id"], "direction": p["direction"], **resize_adv_facts(adv.get(p["ticker"].upper()), to_pct=p["pct"], nav=v)}
+        for p in rows
+    ]
+    return {"book": b, "nav": v, "positions": positions}
+
+
+@router.get("/cases/{case_id}/adv_facts")
+async def case_adv_facts(
+    case_id: UUID,
+    to_pct: Optional[float] = Query(default=None),
+    from_pct: Optional[float] = Query(default=None),
+    nav: Optional[float] = Query(default=None, description="Book NAV in USD; default BOOK_NAV_USD"),
+    db: AsyncSession = Depends(get_async_db),
+) -> Dict[str, Any]:
+    """
+    ADV facts for a case's ticker and, with to_pct, the position / trade size
+    as a share of 20d and 60d ADV.
+    """
+    v = resolve_nav(nav)
+    ticker = (await db.execute(CASE_TICKER_SQL, {"case_id": case_id})).scalar_one_or_none()
+    if ticker is None:
+        raise HTTPException(404, "Not found")
+    adv = (await adv_cache.get_many(db, [ticker])).get(ticker.upper())
+    return {"case_id": case_id, **resize_adv_facts(adv, to_pct=to_pct, from_pct=from_pct, nav=v)}
+
+
+@router.get("/books/{book}/patterns")
+async def book_patterns(
+    book: str,
+    since: Optional[datetime] = Query(default=None, description="event_ts >= since"),
+    until: Optional[datetime] = Query(default=None, description="event_ts <= until"),
+    db: AsyncSession = Depends(get_async_db),
+) -> Dict[str, Any]:
+    """
+    Counts of FINAL INITIATE directions (with average conviction), RISK_NOTE
+    risk_type x severity and POST_MORTEM outcomes for the book. Reads the
+    generated payload columns, not the JSONB payload.
+    """
+    b = normalize_book(book)
+    params = {
+        "book": b,
+        "since": since or datetime(1970, 1, 1, tzinfo=timezone.utc),
+        "until": until or datetime.now(timezone.utc),
+    }
+    out: Dict[str, Any] = {"book": b}
+    for name, stmt in PATTERN_SQL.items():
+        out[name] = [dict(r._mapping) for r in (await db.execute(stmt, params)).all()]
+    return out
@@ -1,15 +1,33 @@
 # app/api/routes/events.py
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Any, Dict, List
-from uuid import UUID
-
-from fastapi import APIRouter, HTTPException
+import base64
+import json
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+from uuid import UUID, uuid4
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, case, cast, delete, func, insert, literal, literal_column, select, tuple_, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.session import SessionLocal
+from app.db.session import AsyncSessionLocal, SessionLocal, get_async_db
+from app.models.decision_drafts import DecisionDraft
 from app.models.decision_events import DecisionEvent
+from app.models.trade_cases import TradeCase
+from app.services.adv import adv_cache, refresh_open_case_adv, resize_adv_facts
+from app.services.archive import archived_events, decode_event, merge_events
+from app.services.event_facts import refresh_event_market_facts
+from app.services.partitions import ensure_partitions, ensure_partitions_async
+from app.services.thesis_state import checkpoint_invalidation_stmt, checkpoint_lock_stmt
+from app.services.ticker_rules import ticker_rules_cache
+from app.settings import settings
 
 router = APIRouter()
 
@@ -62,6 +80,13 @@ POST_MORTEM_PRIMARY_REASON = {"THESIS", "TIMING", "RISK_MGMT", "EXOGENOUS"}
 STATUS_DRAFT = "DRAFT"
 STATUS_FINAL = "FINAL"
 
+# Bulk ingestion: rows per multi-row INSERT ... RETURNING (one transaction per chunk).
+BULK_CHUNK_SIZE = 1000
+BULK_MAX_LINES = 100_000
+
+# NDJSON event streaming: rows fetched per server-side cursor round trip.
+NDJSON_YIELD_PER = 500
+
 # ---------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------
@@ -69,27 +94,29 @@ STATUS_FINAL = "FINAL"
 
 def utcnow() -> datetime:
     """
-    Consistent timestamp helper.
+    Consistent timestamp helper (timezone-aware UTC; asyncpg binds timestamptz from aware datetimes).
     """
-    return datetime.utcnow()
+    return datetime.now(timezone.utc)
 
 
 def parse_event_ts(value: Any) -> datetime:
     """
-    Accept datetime or ISO string; return datetime.
+    Accept datetime or ISO string; return an aware datetime (naive values are
+    taken as UTC, like parse_asof, so event_ts values always compare).
     """
     if value is None:
         return utcnow()
 
     if isinstance(value, datetime):
-        return value
-
-    if isinstance(value, str):
+        dt = value
+    elif isinstance(value, str):
         try:
-            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+            dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
         except Exception:
             raise HTTPException(400, "event_ts must be ISO datetime string")
-    raise HTTPException(400, "event_ts must be ISO string or datetime")
+    else:
+        raise HTTPException(400, "event_ts must be ISO string or datetime")
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
 
 
 def deep_merge_replace_lists(base: Any, patch: Any) -> Any:
@@ -281,15 +308,32 @@ def compute_missing_fields(event_type: str, payload: Dict[str, Any]) -> List[str
     return missing
 
 
-def event_with_missing_fields(de: DecisionEvent) -> Dict[str, Any]:
+def event_with_missing_fields(dr: DecisionDraft) -> Dict[str, Any]:
     """
-    Stable response shape for chat UI.
+    Stable response shape for chat UI (drafts carry status DRAFT as before the move
+    to decision_drafts).
     """
-    d = sa_to_dict(de)
+    d = {**sa_to_dict(dr), "status": STATUS_DRAFT}
     missing = compute_missing_fields(d["event_type"], d.get("payload") or {})
     return {"event": d, "missing_fields": missing}
 
 
+def draft_facts(de: DecisionDraft, background_tasks: BackgroundTasks) -> Optional[Dict[str, Any]]:
+    """
+    Deterministic facts shown next to the questions (RESIZE: ADV share of to_pct).
+    Read from the per-worker cache only; a miss schedules a background refresh.
+    """
+    if de.event_type != "RESIZE":
+        return None
+    adv = adv_cache.for_case(de.case_id)
+    if adv is None:
+        background_tasks.add_task(refresh_open_case_adv)
+        return None
+    payload = de.payload or {}
+    nav = settings.BOOK_NAV_USD or None
+    return {"adv": resize_adv_facts(adv, to_pct=payload.get("to_pct"), from_pct=payload.get("from_pct"), nav=nav)}
+
+
 # ---------------------------------------------------------------------
 # Payload validators
 # ---------------------------------------------------------------------
@@ -482,156 +526,248 @@ def validate_payload(event_type: str, payload: Dict[str, Any]) -> None:
 
 
 @router.post("/cases/{case_id}/drafts")
-def create_or_reuse_draft(case_id: UUID, body: dict) -> Dict[str, Any]:
+async def create_or_reuse_draft(
+    case_id: UUID,
+    body: dict,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+) -> Dict[str, Any]:
     """
-    Create or reuse a DRAFT DecisionEvent for this (case_id, event_type).
+    Create or reuse the draft (decision_drafts) for this (case_id, event_type).
+
+    Single statement: INSERT ... ON CONFLICT (case_id, event_type) DO UPDATE
+    ... RETURNING, arbitrated by ux_decision_drafts_case_type, so racing calls
+    converge on one draft.
 
     Body:
       - event_type: str (required)
-      - seed_payload: dict (optional)
-      - event_ts: str|datetime (optional)
+      - seed_payload: dict (optional; applied to an existing draft only if its payload is empty)
+      - event_ts: str|datetime (optional; used only when a new draft is created)
     """
-    db: Session = SessionLocal()
-    try:
-        if not isinstance(body, dict):
-            raise HTTPException(400, "Body must be a JSON object")
+    if not isinstance(body, dict):
+        raise HTTPException(400, "Body must be a JSON object")
 
-        event_type = str(body.get("event_type", "")).strip()
-        if event_type not in EVENT_TYPES:
-            raise HTTPException(400, f"Invalid event_type. Allowed: {sorted(EVENT_TYPES)}")
-
-        seed_payload = body.get("seed_payload") or {}
-        if not isinstance(seed_payload, dict):
-            raise HTTPException(400, "seed_payload must be a JSON object")
-
-        event_ts_dt = parse_event_ts(body.get("event_ts"))
-
-        existing = (
-            db.query(DecisionEvent)
-            .filter(
-                DecisionEvent.case_id == case_id,
-                DecisionEvent.event_type == event_type,
-                DecisionEvent.status == STATUS_DRAFT,
-            )
-            .order_by(DecisionEvent.updated_at.desc())
-            .first()
-        )
+    event_type = str(body.get("event_type", "")).strip()
+    if event_type not in EVENT_TYPES:
+        raise HTTPException(400, f"Invalid event_type. Allowed: {sorted(EVENT_TYPES)}")
 
-        if existing:
-            existing_payload = existing.payload or {}
+    seed_payload = body.get("seed_payload") or {}
+    if not isinstance(seed_payload, dict):
+        raise HTTPException(400, "seed_payload must be a JSON object")
 
-            # Conservative rule: apply seed only if payload is empty
-            if existing_payload == {} and seed_payload:
-                existing.payload = deep_merge_replace_lists(existing_payload, seed_payload)
-                existing.updated_at = utcnow()
-                db.add(existing)
-                db.commit()
-                db.refresh(existing)
+    event_ts_dt = parse_event_ts(body.get("event_ts"))
 
-            return event_with_missing_fields(existing)
+    ins = pg_insert(DecisionDraft).values(
+        id=uuid4(),
+        case_id=case_id,
+        event_ts=event_ts_dt,
+        event_type=event_type,
+        payload=seed_payload,
+        updated_at=func.now(),
+    )
 
-        de = DecisionEvent(
-            case_id=case_id,
-            event_ts=event_ts_dt,
-            event_type=event_type,
-            payload=seed_payload,
-            status=STATUS_DRAFT,
+    # Conservative rule: apply seed only if the existing payload is empty
+    empty = literal_column("'{}'::jsonb")
+    apply_seed = and_(DecisionDraft.payload == empty, ins.excluded.payload != empty)
+
+    stmt = (
+        ins.on_conflict_do_update(
+            constraint="ux_decision_drafts_case_type",
+            set_={
+                "payload": case((apply_seed, ins.excluded.payload), else_=DecisionDraft.payload),
+                "version": case((apply_seed, DecisionDraft.version + 1), else_=DecisionDraft.version),
+                "updated_at": case((apply_seed, func.now()), else_=DecisionDraft.updated_at),
+            },
         )
-        de.updated_at = utcnow()
-        db.add(de)
-        db.commit()
-        db.refresh(de)
-        return event_with_missing_fields(de)
-    finally:
-        db.close()
+        .returning(DecisionDraft)
+        .execution_options(populate_existing=True)
+    )
+    dr = (await db.execute(stmt)).scalars().first()
+    await db.commit()
+    return {**event_with_missing_fields(dr), "facts": draft_facts(dr, background_tasks)}
 
 
 @router.patch("/cases/{case_id}/events/{event_id}")
-def patch_draft_event(case_id: UUID, event_id: UUID, body: dict) -> Dict[str, Any]:
+async def patch_draft_event(
+    case_id: UUID,
+    event_id: UUID,
+    body: dict,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+) -> Dict[str, Any]:
     """
     Deep-merge payload_patch into the DRAFT payload.
     Lists are replaced entirely.
     FINAL events are immutable.
 
+    The merge runs server-side (jsonb_deep_merge_replace_lists) as a single
+    UPDATE decision_drafts ... RETURNING, so concurrent patches never
+    overwrite each other's keys. No indexed column changes, so the update is HOT.
+
     Body:
       - payload_patch: dict (required)
+      - expected_version: int (optional; 409 if the draft has moved on)
     """
-    db: Session = SessionLocal()
-    try:
-        if not isinstance(body, dict):
-            raise HTTPException(400, "Body must be a JSON object")
-
-        payload_patch = body.get("payload_patch")
-        if not isinstance(payload_patch, dict):
-            raise HTTPException(400, "payload_patch must be a JSON object")
-
-        de = (
-            db.query(DecisionEvent)
-            .filter(
-                DecisionEvent.id == event_id,
-                DecisionEvent.case_id == case_id,
-            )
-            .first()
+    if not isinstance(body, dict):
+        raise HTTPException(400, "Body must be a JSON object")
+
+    payload_patch = body.get("payload_patch")
+    if not isinstance(payload_patch, dict):
+        raise HTTPException(400, "payload_patch must be a JSON object")
+
+    expected_version = body.get("expected_version")
+    if expected_version is not None and (isinstance(expected_version, bool) or not isinstance(expected_version, int)):
+        raise HTTPException(400, "expected_version must be an integer")
+
+    conditions = [
+        DecisionDraft.id == event_id,
+        DecisionDraft.case_id == case_id,
+    ]
+    if expected_version is not None:
+        conditions.append(DecisionDraft.version == expected_version)
+
+    stmt = (
+        update(DecisionDraft)
+        .where(*conditions)
+        .values(
+            payload=func.jsonb_deep_merge_replace_lists(DecisionDraft.payload, cast(payload_patch, JSONB)),
+            version=DecisionDraft.version + 1,
+            updated_at=func.now(),
         )
-        if not de:
-            raise HTTPException(404, "Not found")
+        .returning(DecisionDraft)
+        .execution_options(synchronize_session=False)
+    )
+    dr = (await db.execute(stmt)).scalars().first()
+    await db.commit()
+
+    if dr:
+        return {**event_with_missing_fields(dr), "facts": draft_facts(dr, background_tasks)}
 
-        if de.status != STATUS_DRAFT:
+    # Miss path only: explain why nothing was updated.
+    version = (
+        await db.execute(
+            select(DecisionDraft.version).where(DecisionDraft.id == event_id, DecisionDraft.case_id == case_id)
+        )
+    ).scalar_one_or_none()
+    if version is None:
+        if await final_event_exists(db, case_id, event_id):
             raise HTTPException(409, "Only DRAFT events can be patched")
+        raise HTTPException(404, "Not found")
+    raise HTTPException(
+        status_code=409,
+        detail={"error": "version_conflict", "expected_version": expected_version, "current_version": version},
+    )
 
-        current = de.payload or {}
-        de.payload = deep_merge_replace_lists(current, payload_patch)
-        de.updated_at = utcnow()
 
-        db.add(de)
-        db.commit()
-        db.refresh(de)
-        return event_with_missing_fields(de)
-    finally:
-        db.close()
+async def final_event_exists(db: AsyncSession, case_id: UUID, event_id: UUID) -> bool:
+    row = (
+        await db.execute(
+            select(DecisionEvent.id).where(DecisionEvent.id == event_id, DecisionEvent.case_id == case_id)
+        )
+    ).first()
+    return row is not None
 
 
 @router.post("/cases/{case_id}/events/{event_id}/finalize")
-def finalize_event(case_id: UUID, event_id: UUID) -> Dict[str, Any]:
+async def finalize_event(
+    case_id: UUID,
+    event_id: UUID,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+) -> Dict[str, Any]:
     """
-    Strict validation at finalize-time; flip DRAFT -> FINAL.
+    Strict validation at finalize-time; move the draft into decision_events as FINAL.
+
+    The draft row is locked (FOR UPDATE) while it is validated, then moved in
+    one statement: DELETE FROM decision_drafts ... RETURNING feeding
+    INSERT INTO decision_events, keeping the id. A concurrent patch waits on
+    the lock and then misses (409).
+    Forward-return facts for the event are computed after the response.
     """
-    db: Session = SessionLocal()
-    try:
-        de = (
-            db.query(DecisionEvent)
-            .filter(
-                DecisionEvent.id == event_id,
-                DecisionEvent.case_id == case_id,
-            )
-            .first()
+    dr = (
+        await db.execute(
+            select(DecisionDraft)
+            .where(DecisionDraft.id == event_id, DecisionDraft.case_id == case_id)
+            .with_for_update()
         )
-        if not de:
-            raise HTTPException(404, "Not found")
-
-        if de.status != STATUS_DRAFT:
+    ).scalars().first()
+    if not dr:
+        if await final_event_exists(db, case_id, event_id):
             raise HTTPException(409, "Only DRAFT events can be finalized")
+        raise HTTPException(404, "Not found")
 
-        payload = de.payload or {}
+    payload = dr.payload or {}
 
-        missing = compute_missing_fields(de.event_type, payload)
-        if missing:
-            raise HTTPException(
-                status_code=409,
-                detail={"error": "missing_fields", "missing_fields": missing},
-            )
+    missing = compute_missing_fields(dr.event_type, payload)
+    if missing:
+        raise HTTPException(
+            status_code=409,
+            detail={"error": "missing_fields", "missing_fields": missing},
+        )
 
-        validate_payload(de.event_type, payload)
+    validate_payload(dr.event_type, payload)
+    await ensure_partitions_async([dr.event_ts])
+
+    moved = (
+        delete(DecisionDraft)
+        .where(DecisionDraft.id == dr.id)
+        .returning(
+            DecisionDraft.id,
+            DecisionDraft.case_id,
+            DecisionDraft.event_ts,
+            DecisionDraft.event_type,
+            DecisionDraft.payload,
+            DecisionDraft.version,
+            DecisionDraft.created_at,
+        )
+        .cte("moved")
+    )
+    stmt = (
+        insert(DecisionEvent)
+        .from_select(
+            ["id", "case_id", "event_ts", "event_type", "payload", "version", "created_at", "status", "updated_at"],
+            select(
+                moved.c.id,
+                moved.c.case_id,
+                moved.c.event_ts,
+                moved.c.event_type,
+                moved.c.payload,
+                moved.c.version,
+                moved.c.created_at,
+                literal(STATUS_FINAL),
+                func.now(),
+            ),
+        )
+        .returning(DecisionEvent)
+    )
+    de = (await db.execute(stmt)).scalars().first()
+    # A draft may be older than existing replay checkpoints.
+    await db.execute(checkpoint_lock_stmt(case_id))
+    await db.execute(checkpoint_invalidation_stmt(case_id, de.event_ts))
+    await db.commit()
+    schedule_event_facts(background_tasks, case_id, de.event_type, [de.id])
+    invalidate_ticker_rules([(de.event_type, de.payload)])
+    return {"event": sa_to_dict(de), "missing_fields": []}
 
-        de.status = STATUS_FINAL
-        de.updated_at = utcnow()
 
-        db.add(de)
-        db.commit()
-        db.refresh(de)
-        return {"event": sa_to_dict(de), "missing_fields": []}
-    finally:
-        db.close()
+def schedule_event_facts(background_tasks: BackgroundTasks, case_id: UUID, event_type: str, event_ids: List[UUID]) -> None:
+    """
+    Queue event_market_facts for new FINAL events. An INITIATE can change the
+    direction that signs every later event of the case, so it redoes the case.
+    """
+    if event_type == "INITIATE":
+        background_tasks.add_task(refresh_event_market_facts, case_ids=[case_id], recompute=True)
+    else:
+        background_tasks.add_task(refresh_event_market_facts, event_ids=event_ids)
+
+
+def invalidate_ticker_rules(events: List[Tuple[str, Any]]) -> None:
+    """
+    Drop cached active rules for tickers of newly written TICKER_RULE events.
+    """
+    tickers = [p.get("ticker") for t, p in events if t == "TICKER_RULE" and isinstance(p, dict)]
+    if tickers:
+        ticker_rules_cache.invalidate(tickers)
 
 
 # ---------------------------------------------------------------------
@@ -640,7 +776,7 @@ def finalize_event(case_id: UUID, event_id: UUID) -> Dict[str, Any]:
 
 
 @router.post("/cases/{case_id}/events")
-def add_event(case_id: UUID, event: dict) -> Dict[str, Any]:
+def add_event(case_id: UUID, event: dict, background_tasks: BackgroundTasks) -> Dict[str, Any]:
     """
     Add a new FINAL event for a trade case (strict).
 
@@ -669,32 +805,370 @@ def add_event(case_id: UUID, event: dict) -> Dict[str, Any]:
         )
         de.updated_at = utcnow()
 
+        ensure_partitions([de.event_ts])
         db.add(de)
+        db.execute(checkpoint_lock_stmt(case_id))
+        db.execute(checkpoint_invalidation_stmt(case_id, de.event_ts))
         db.commit()
         db.refresh(de)
+        schedule_event_facts(background_tasks, case_id, de.event_type, [de.id])
+        invalidate_ticker_rules([(de.event_type, de.payload)])
         return sa_to_dict(de)
     finally:
         db.close()
 
 
+def encode_cursor(event_ts: datetime, event_id: UUID) -> str:
+    """
+    Opaque keyset cursor for (event_ts, id).
+    """
+    raw = f"{event_ts.isoformat()}|{event_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, *, label: str) -> Tuple[datetime, UUID]:
+    """
+    Inverse of encode_cursor. Raises HTTPException(400) on malformed input.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        ts, event_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(ts), UUID(event_id)
+    except Exception:
+        raise HTTPException(400, f"{label} is not a valid cursor")
+
+
+def final_events_query(
+    case_id: UUID,
+    *,
+    order: str = "asc",
+    limit: Optional[int] = None,
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    event_type: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+):
+    """
+    FINAL events for a case, keyset-ordered on (event_ts, id).
+
+    Every filter is a range on event_ts (plus event_type), so the scan stays
+    on ix_decision_events_case_id_event_ts; the id comparison only breaks ties.
+    """
+    if order not in {"asc", "desc"}:
+        raise HTTPException(400, "order must be 'asc' or 'desc'")
+    if event_type is not None and event_type not in EVENT_TYPES:
+        raise HTTPException(400, f"Invalid event_type. Allowed: {sorted(EVENT_TYPES)}")
+
+    key = tuple_(DecisionEvent.event_ts, DecisionEvent.id)
+    q = select(DecisionEvent).where(
+        DecisionEvent.case_id == case_id,
+        DecisionEvent.status == STATUS_FINAL,
+    )
+
+    if event_type is not None:
+        q = q.where(DecisionEvent.event_type == event_type)
+    if since is not None:
+        q = q.where(DecisionEvent.event_ts >= since)
+    if until is not None:
+        q = q.where(DecisionEvent.event_ts <= until)
+    if after is not None:
+        ts, event_id = decode_cursor(after, label="after")
+        q = q.where(DecisionEvent.event_ts >= ts, key > tuple_(ts, event_id))
+    if before is not None:
+        ts, event_id = decode_cursor(before, label="before")
+        q = q.where(DecisionEvent.event_ts <= ts, key < tuple_(ts, event_id))
+
+    if order == "desc":
+        q = q.order_by(DecisionEvent.event_ts.desc(), DecisionEvent.id.desc())
+    else:
+        q = q.order_by(DecisionEvent.event_ts.asc(), DecisionEvent.id.asc())
+
+    if limit is not None:
+        q = q.limit(limit)
+    return q
+
+
+def _utc(dt: Optional[datetime]) -> Optional[datetime]:
+    return dt.replace(tzinfo=timezone.utc) if dt is not None and dt.tzinfo is None else dt
+
+
+def archived_page(
+    events: Sequence[Dict[str, Any]],
+    *,
+    order: str = "asc",
+    limit: Optional[int] = None,
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    event_type: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> List[Dict[str, Any]]:
+    """
+    final_events_query applied in Python to an archived case's events
+    (decoded segment merged with its hot rows, in (event_ts, id) order).
+    """
+    since, until = _utc(since), _utc(until)
+    lo = decode_cursor(after, label="after") if after is not None else None
+    hi = decode_cursor(before, label="before") if before is not None else None
+    out: List[Dict[str, Any]] = []
+    for e in events:
+        key = (e["event_ts"], e["id"])
+        if event_type is not None and e["event_type"] != event_type:
+            continue
+        if (since is not None and key[0] < since) or (until is not None and key[0] > until):
+            continue
+        if (lo is not None and key <= lo) or (hi is not None and key >= hi):
+            continue
+        out.append(e)
+    if order == "desc":
+        out.reverse()
+    return out[:limit] if limit is not None else out
+
+
+async def stream_events_ndjson(q) -> AsyncIterator[bytes]:
+    """
+    Stream rows from a server-side cursor as NDJSON.
+
+    Uses its own session: the response body is produced after the route (and
+    its request-scoped session) has returned.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(q.execution_options(yield_per=NDJSON_YIELD_PER))
+        async for de in result.scalars():
+            yield json.dumps(jsonable_encoder(sa_to_dict(de))).encode("utf-8") + b"\n"
+
+
+def ndjson_lines(events: Sequence[Dict[str, Any]]) -> Iterator[bytes]:
+    for e in events:
+        yield json.dumps(jsonable_encoder(e)).encode("utf-8") + b"\n"
+
+
 @router.get("/cases/{case_id}/events")
-def get_events(case_id: UUID) -> List[Dict[str, Any]]:
+async def get_events(
+    case_id: UUID,
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(default=None, ge=1, le=1000, description="Page size (keyset pagination)"),
+    before: Optional[str] = Query(default=None, description="Cursor: only events strictly before this one"),
+    after: Optional[str] = Query(default=None, description="Cursor: only events strictly after this one"),
+    order: str = Query(default="asc", description="asc (chronological) or desc (newest first)"),
+    event_type: Optional[str] = Query(default=None, description="Filter by event_type"),
+    since: Optional[datetime] = Query(default=None, description="event_ts >= since"),
+    until: Optional[datetime] = Query(default=None, description="event_ts <= until"),
+    db: AsyncSession = Depends(get_async_db),
+):
     """
-    Return all FINAL events for a case, ordered chronologically by event_ts.
+    Return FINAL events for a case, ordered by (event_ts, id).
+
+    Without parameters this is the full chronological list. With `limit`, the
+    cursor for the next page (pass as `after` for asc, `before` for desc) is
+    returned in the X-Next-Cursor header when the page is full.
+
+    With `Accept: application/x-ndjson` rows are streamed one JSON object per
+    line from a server-side cursor instead of being materialized.
+
+    Archived cases (app/services/archive.py) are served from their segment
+    merged with the hot rows they kept (TICKER_RULE), filtered in Python.
 
     Note: Drafts are excluded by default to keep derived artifacts stable.
     """
-    db: Session = SessionLocal()
+    filters = dict(
+        order=order,
+        limit=limit,
+        before=before,
+        after=after,
+        event_type=event_type,
+        since=since,
+        until=until,
+    )
+    q = final_events_query(case_id, **filters)
+    ndjson = "application/x-ndjson" in request.headers.get("accept", "")
+
+    lines = await archived_events(db, case_id)
+    if lines is not None:
+        hot = (await db.execute(final_events_query(case_id))).scalars().all()
+        events = archived_page(merge_events(map(decode_event, lines), map(sa_to_dict, hot)), **filters)
+        if ndjson:
+            return StreamingResponse(ndjson_lines(events), media_type="application/x-ndjson")
+    elif ndjson:
+        return StreamingResponse(stream_events_ndjson(q), media_type="application/x-ndjson")
+    else:
+        events = [sa_to_dict(e) for e in (await db.execute(q)).scalars().all()]
+
+    if limit is not None and len(events) == limit:
+        last = events[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last["event_ts"], last["id"])
+
+    return events
+
+
+# ---------------------------------------------------------------------
+# Bulk ingestion (NDJSON backfill)
+# ---------------------------------------------------------------------
+
+
+def parse_ndjson(raw: bytes) -> List[Tuple[int, Any]]:
+    """
+    Split an NDJSON body into (line_no, decoded_or_exception) pairs.
+    Blank lines are skipped; line numbers are 1-based and refer to the raw body.
+    """
     try:
-        events = (
-            db.query(DecisionEvent)
-            .filter(
-                DecisionEvent.case_id == case_id,
-                DecisionEvent.status == STATUS_FINAL,
-            )
-            .order_by(DecisionEvent.event_ts.asc())
-            .all()
-        )
-        return [sa_to_dict(e) for e in events]
-    finally:
-        db.close()
+        text = raw.decode("utf-8")
+    except UnicodeDecodeError:
+        raise HTTPException(400, "Body must be UTF-8 encoded NDJSON")
+
+    out: List[Tuple[int, Any]] = []
+    for i, line in enumerate(text.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            out.append((i, json.loads(line)))
+        except ValueError as e:
+            out.append((i, e))
+
+    if len(out) > BULK_MAX_LINES:
+        raise HTTPException(413, f"Too many lines (max {BULK_MAX_LINES})")
+    return out
+
+
+def prepare_bulk_row(event: Any, *, case_id: Optional[UUID]) -> Dict[str, Any]:
+    """
+    Validate one NDJSON line with the same strict rules as add_event and
+    return the decision_events row to insert. Raises HTTPException on failure.
+
+    If case_id is given (case-scoped endpoint) a line may omit case_id, but
+    must not name a different case.
+    """
+    if not isinstance(event, dict):
+        raise HTTPException(400, "Line must be a JSON object")
+
+    raw_case_id = event.get("case_id")
+    if case_id is None:
+        if not raw_case_id:
+            raise HTTPException(400, "Missing case_id")
+        try:
+            line_case_id = UUID(str(raw_case_id))
+        except ValueError:
+            raise HTTPException(400, "case_id must be a UUID")
+    else:
+        line_case_id = case_id
+        if raw_case_id is not None and str(raw_case_id) != str(case_id):
+            raise HTTPException(400, "case_id does not match the URL case_id")
+
+    validate_common(event)
+    validate_payload(event["event_type"], event["payload"])
+
+    return {
+        "id": uuid4(),
+        "case_id": line_case_id,
+        "event_ts": parse_event_ts(event.get("event_ts")),
+        "event_type": event["event_type"],
+        "payload": event["payload"],
+        "status": STATUS_FINAL,
+        "updated_at": utcnow(),
+    }
+
+
+async def bulk_insert_events(
+    db: AsyncSession,
+    lines: List[Tuple[int, Any]],
+    *,
+    case_id: Optional[UUID],
+    background_tasks: Optional[BackgroundTasks] = None,
+) -> Dict[str, Any]:
+    """
+    Validate every line, then write the good ones as FINAL events with one
+    multi-row INSERT ... RETURNING per chunk. A failing chunk is rolled back
+    and reported per line; other chunks are unaffected.
+    """
+    errors: List[Dict[str, Any]] = []
+    pending: List[Tuple[int, Dict[str, Any]]] = []
+
+    for line_no, obj in lines:
+        if isinstance(obj, Exception):
+            errors.append({"line": line_no, "error": f"Invalid JSON: {obj}"})
+            continue
+        try:
+            pending.append((line_no, prepare_bulk_row(obj, case_id=case_id)))
+        except HTTPException as e:
+            errors.append({"line": line_no, "error": e.detail})
+
+    # Unknown case ids would fail the FK and abort a whole chunk; reject them up front.
+    case_ids = {row["case_id"] for _, row in pending}
+    if case_ids:
+        known = set((await db.execute(select(TradeCase.id).where(TradeCase.id.in_(case_ids)))).scalars())
+        kept: List[Tuple[int, Dict[str, Any]]] = []
+        for line_no, row in pending:
+            if row["case_id"] in known:
+                kept.append((line_no, row))
+            else:
+                errors.append({"line": line_no, "error": "Case not found"})
+        pending = kept
+
+    inserted: List[Dict[str, Any]] = []
+    touched: set[UUID] = set()
+    stmt = insert(DecisionEvent).returning(DecisionEvent.id, sort_by_parameter_order=True)
+    for start in range(0, len(pending), BULK_CHUNK_SIZE):
+        chunk = pending[start : start + BULK_CHUNK_SIZE]
+        # Backfilled events can land before existing replay checkpoints.
+        earliest: Dict[UUID, datetime] = {}
+        for _, row in chunk:
+            cid = row["case_id"]
+            if cid not in earliest or row["event_ts"] < earliest[cid]:
+                earliest[cid] = row["event_ts"]
+        try:
+            await ensure_partitions_async([row["event_ts"] for _, row in chunk])
+            ids = (await db.execute(stmt, [row for _, row in chunk])).scalars().all()
+            # Sorted so concurrent bulk loads take the case locks in one order.
+            for cid, since in sorted(earliest.items()):
+                await db.execute(checkpoint_lock_stmt(cid))
+                await db.execute(checkpoint_invalidation_stmt(cid, since))
+            await db.commit()
+        except SQLAlchemyError as e:
+            await db.rollback()
+            for line_no, _ in chunk:
+                errors.append({"line": line_no, "error": f"Insert failed: {e.__class__.__name__}"})
+            continue
+        inserted.extend({"line": line_no, "id": event_id} for (line_no, _), event_id in zip(chunk, ids))
+        touched.update(earliest)
+        invalidate_ticker_rules([(row["event_type"], row["payload"]) for _, row in chunk])
+
+    if touched and background_tasks is not None:
+        # Backfill may include INITIATEs, so facts are redone per touched case.
+        background_tasks.add_task(refresh_event_market_facts, case_ids=sorted(touched, key=str), recompute=True)
+
+    errors.sort(key=lambda e: e["line"])
+    return {"inserted": len(inserted), "failed": len(errors), "events": inserted, "errors": errors}
+
+
+@router.post("/cases/{case_id}/events:bulk")
+async def add_events_bulk(
+    case_id: UUID,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+) -> Dict[str, Any]:
+    """
+    Backfill FINAL events for one case from an NDJSON body (one event per line).
+
+    Each line uses the add_event envelope ({event_ts, event_type, payload}) and
+    is validated strictly. Invalid lines are reported in `errors` by line number
+    without aborting the valid ones.
+    """
+    lines = parse_ndjson(await request.body())
+    return await bulk_insert_events(db, lines, case_id=case_id, background_tasks=background_tasks)
+
+
+@router.post("/events:bulk")
+async def add_events_bulk_cross_case(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+) -> Dict[str, Any]:
+    """
+    Cross-case NDJSON backfill: same as /cases/{case_id}/events:bulk, but every
+    line must carry its own case_id.
+    """
+    lines = parse_ndjson(await request.body())
+    return await bulk_insert_events(db, lines, case_id=None, background_tasks=background_tasks)
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_async_db
+
+router = APIRouter()
+
+
+@router.get("/health")
+async def health(db: AsyncSession = Depends(get_async_db)) -> Dict[str, Any]:
+    await db.execute(text("SELECT 1"))
+    return {"ok": True}
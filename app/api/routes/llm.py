@@ -1,18 +1,30 @@
 # app/api/routes/llm.py
 from __future__ import annotations
 
+import asyncio
 import re
-from typing import Any, Dict, List, Optional
+import threading
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import any_, cast, select
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.config import get_settings
-from app.db.session import SessionLocal
+from app.config import Settings, get_settings
+from app.db.session import SessionLocal, get_async_db
 from app.models.decision_events import DecisionEvent
 
-from app.api.utils.openai_client import call_structured
+from app.api.utils.openai_client import call_structured_async
+from app.api.utils.llm_cache import (
+    artifact_key,
+    cached_call_structured,
+    lookup_artifacts_async,
+    store_artifacts_async,
+)
+from app.api.utils.command_parser import parse_command
 from app.api.utils.llm_guardrails import contains_forbidden_text, deterministic_event_fallback
 
 router = APIRouter()
@@ -211,6 +223,41 @@ def _action_ok_against_allowlists(
     return True
 
 
+def event_summary_prompts(event_type: str, payload: Dict[str, Any], s: Settings) -> Tuple[str, str]:
+    """
+    (system, user) prompts for an event summary.
+    """
+    system = (
+        "You are a portfolio journaling assistant. "
+        "You must not introduce new facts, predictions, causal claims, or recommendations. "
+        "You may only restate and format the provided event payload. "
+        "Never use the words: should, recommend, buy, sell, likely, expect, forecast."
+        f" Prompt version: {s.llm_prompt_version}."
+    )
+
+    user = (
+        "Produce a concise summary for a chat transcript.\n"
+        f"event_type: {event_type}\n"
+        f"payload: {payload}\n"
+        "Return JSON strictly matching the schema."
+    )
+    return system, user
+
+
+def shape_event_summary(out: Dict[str, Any], event_type: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Guardrails + truncation for an event summary; deterministic fallback on violation.
+    """
+    if contains_forbidden_text(out):
+        return deterministic_event_fallback(event_type, payload)
+
+    headline = (out.get("headline") or "")[:120]
+    bullets = [(b or "")[:120] for b in (out.get("bullets") or [])][:6]
+    tags = [(t or "")[:32] for t in (out.get("tags") or [])][:8]
+
+    return {"headline": headline, "bullets": bullets, "tags": tags}
+
+
 def _default_noop() -> Dict[str, Any]:
     return {
         "mode": "NOOP",
@@ -248,34 +295,111 @@ def llm_event_summary(body: dict) -> Dict[str, Any]:
         event_type = de.event_type
 
         s = get_settings()
-
-        system = (
-            "You are a portfolio journaling assistant. "
-            "You must not introduce new facts, predictions, causal claims, or recommendations. "
-            "You may only restate and format the provided event payload. "
-            "Never use the words: should, recommend, buy, sell, likely, expect, forecast."
-            f" Prompt version: {s.llm_prompt_version}."
+        system, user = event_summary_prompts(event_type, payload, s)
+
+        out = cached_call_structured(
+            db,
+            route="event_summary",
+            event_type=event_type,
+            payload=payload,
+            system=system,
+            user=user,
+            json_schema=EVENT_SUMMARY_SCHEMA,
         )
+        return shape_event_summary(out, event_type, payload)
+    finally:
+        db.close()
 
-        user = (
-            "Produce a concise summary for a chat transcript.\n"
-            f"event_type: {event_type}\n"
-            f"payload: {payload}\n"
-            "Return JSON strictly matching the schema."
+
+@router.post("/llm/event_summaries")
+async def llm_event_summaries(body: dict, db: AsyncSession = Depends(get_async_db)) -> Dict[str, Any]:
+    """
+    Batch variant of /llm/event_summary for timelines.
+
+    Loads all events with one `id = ANY(:ids)` query, answers cached summaries
+    immediately and fans out the misses concurrently (PMDOS_LLM_BATCH_CONCURRENCY).
+    Items come back in input order; on guardrail violation, timeout or LLM error
+    the item carries the deterministic fallback.
+
+    Input:  { event_ids: [uuid, ...] }  (max PMDOS_LLM_BATCH_MAX_ITEMS)
+    Output: { items: [{event_id, summary, source}] }  source: cache | llm | fallback | not_found
+    """
+    if not isinstance(body, dict):
+        raise HTTPException(400, "Body must be a JSON object")
+
+    raw_ids = body.get("event_ids")
+    if not isinstance(raw_ids, list):
+        raise HTTPException(400, "event_ids must be an array")
+
+    s = get_settings()
+    if len(raw_ids) > s.llm_batch_max_items:
+        raise HTTPException(400, f"Too many event_ids (max {s.llm_batch_max_items})")
+
+    try:
+        event_ids = [UUID(str(x)) for x in raw_ids]
+    except ValueError:
+        raise HTTPException(400, "event_ids must be UUIDs")
+
+    unique_ids = list(dict.fromkeys(event_ids))
+    events: Dict[UUID, DecisionEvent] = {}
+    if unique_ids:
+        rows = await db.execute(
+            select(DecisionEvent).where(DecisionEvent.id == any_(cast(unique_ids, ARRAY(PG_UUID(as_uuid=True)))))
         )
+        events = {e.id: e for e in rows.scalars()}
 
-        out = call_structured(system=system, user=user, json_schema=EVENT_SUMMARY_SCHEMA)
+    keys = {
+        eid: artifact_key(route="event_summary", event_type=e.event_type, payload=e.payload or {}, s=s)
+        for eid, e in events.items()
+    }
+    outputs = await lookup_artifacts_async(db, set(keys.values()))
+    cached_keys = set(outputs)
+
+    sem = asyncio.Semaphore(s.llm_batch_concurrency)
+
+    async def summarize(e: DecisionEvent) -> Optional[Dict[str, Any]]:
+        system, user = event_summary_prompts(e.event_type, e.payload or {}, s)
+        async with sem:
+            try:
+                return await asyncio.wait_for(
+                    call_structured_async(system=system, user=user, json_schema=EVENT_SUMMARY_SCHEMA),
+                    timeout=s.llm_timeout_s,
+                )
+            except Exception:
+                return None
+
+    misses = [e for eid, e in events.items() if keys[eid] not in outputs]
+    fresh = await asyncio.gather(*(summarize(e) for e in misses))
+
+    new_artifacts = []
+    for e, out in zip(misses, fresh):
+        if out is None:
+            continue
+        outputs[keys[e.id]] = out
+        new_artifacts.append((keys[e.id], "event_summary", e.event_type, out))
+    await store_artifacts_async(db, new_artifacts, s=s)
+
+    items: List[Dict[str, Any]] = []
+    for eid in event_ids:
+        e = events.get(eid)
+        if e is None:
+            items.append({"event_id": str(eid), "summary": None, "source": "not_found"})
+            continue
 
+        payload = e.payload or {}
+        out = outputs.get(keys[eid])
+        if out is None:
+            items.append({"event_id": str(eid), "summary": deterministic_event_fallback(e.event_type, payload), "source": "fallback"})
+            continue
+
+        summary = shape_event_summary(out, e.event_type, payload)
         if contains_forbidden_text(out):
-            return deterministic_event_fallback(event_type, payload)
+            source = "fallback"
+        else:
+            source = "cache" if keys[eid] in cached_keys else "llm"
+        items.append({"event_id": str(eid), "summary": summary, "source": source})
 
-        headline = (out.get("headline") or "")[:120]
-        bullets = [(b or "")[:120] for b in (out.get("bullets") or [])][:6]
-        tags = [(t or "")[:32] for t in (out.get("tags") or [])][:8]
-
-        return {"headline": headline, "bullets": bullets, "tags": tags}
-    finally:
-        db.close()
+    return {"items": items}
 
 
 @router.post("/llm/missing_field_prompts")
@@ -306,7 +430,20 @@ def llm_missing_field_prompts(body: dict) -> Dict[str, Any]:
         "Write one short prompt per missing field."
     )
 
-    out = call_structured(system=system, user=user, json_schema=MISSING_PROMPTS_SCHEMA)
+    db: Session = SessionLocal()
+    try:
+        out = cached_call_structured(
+            db,
+            route="missing_field_prompts",
+            event_type=event_type,
+            payload={"missing_fields": missing_fields},
+            system=system,
+            user=user,
+            json_schema=MISSING_PROMPTS_SCHEMA,
+        )
+    finally:
+        db.close()
+
     if contains_forbidden_text(out):
         return {"prompts": [{"field": f, "prompt": f"Provide {event_type}.{f}"} for f in missing_fields]}
 
@@ -355,7 +492,20 @@ def llm_coach(body: dict) -> Dict[str, Any]:
         "All must be grounded in the payload fields and phrased neutrally."
     )
 
-    out = call_structured(system=system, user=user, json_schema=COACH_SCHEMA)
+    db: Session = SessionLocal()
+    try:
+        out = cached_call_structured(
+            db,
+            route="coach",
+            event_type=event_type,
+            payload=payload,
+            system=system,
+            user=user,
+            json_schema=COACH_SCHEMA,
+        )
+    finally:
+        db.close()
+
     if contains_forbidden_text(out):
         return {"questions": [], "checks": [], "warnings": []}
 
@@ -370,8 +520,81 @@ def llm_coach(body: dict) -> Dict[str, Any]:
 # ---------------------------------------------------------------------
 
 
+class InterpretStats:
+    """
+    Per-worker counters for how /llm/interpret requests were answered:
+    fast_path (grammar), llm (model called), no_model (empty / no-ticker clarify).
+    """
+
+    KINDS = ("fast_path", "llm", "no_model")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts = {k: 0 for k in self.KINDS}
+
+    def record(self, kind: str) -> None:
+        with self._lock:
+            self._counts[kind] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self._counts)
+        total = sum(counts.values())
+        return {
+            **counts,
+            "total": total,
+            "fast_path_hit_rate": (counts["fast_path"] / total) if total else 0.0,
+        }
+
+
+interpret_stats = InterpretStats()
+
+
+def _fast_path_interpret(
+    text: str,
+    *,
+    allowed_tickers: List[str],
+    pending_field: Optional[str],
+    allow_answer_fields: Optional[List[str]],
+) -> Optional[Dict[str, Any]]:
+    """
+    EXECUTE envelope for input the command grammar understands, or None.
+    Same seed sanitizing and allowlist gating as model output; anything the
+    gate rejects falls through to the normal path.
+    """
+    action = parse_command(text, pending_field=pending_field)
+    if action is None:
+        return None
+
+    action["seed_payload"] = _sanitize_seed_payload(action.get("event_type"), action.get("seed_payload"))
+
+    if not _action_ok_against_allowlists(
+        action,
+        allowed_tickers=allowed_tickers,
+        pending_field=pending_field,
+        allow_answer_fields=allow_answer_fields,
+    ):
+        return None
+
+    return {
+        "mode": "EXECUTE",
+        "confidence": 1.0,
+        "action": action,
+        "clarify": None,
+        "message": None,
+    }
+
+
+@router.get("/llm/interpret/stats")
+def llm_interpret_stats() -> Dict[str, Any]:
+    """
+    Fast-path hit rate for /llm/interpret in this worker since start.
+    """
+    return interpret_stats.snapshot()
+
+
 @router.post("/llm/interpret")
-def llm_interpret(body: dict) -> Dict[str, Any]:
+async def llm_interpret(body: dict) -> Dict[str, Any]:
     """
     Translate user free text into a small set of allowed intents.
     This endpoint never executes. The UI applies deterministic gating and execution.
@@ -387,6 +610,7 @@ def llm_interpret(body: dict) -> Dict[str, Any]:
 
     text = str(body.get("text", "")).strip()
     if not text:
+        interpret_stats.record("no_model")
         return _default_noop()
 
     allowed_tickers = body.get("allowed_tickers")
@@ -398,7 +622,33 @@ def llm_interpret(body: dict) -> Dict[str, Any]:
 
     # Strict: uppercase tickers only, explicit in allowed_tickers.
     allowed_tickers = [t for t in allowed_tickers if _TICKER_TOKEN_RE.match(t)]
+
+    draft = body.get("draft") or {}
+    if not isinstance(draft, dict):
+        draft = {}
+
+    pending_field = draft.get("pending_field")
+    if pending_field is not None and not isinstance(pending_field, str):
+        pending_field = None
+
+    allow_answer_fields = draft.get("missing_fields")
+    if allow_answer_fields is not None:
+        if not isinstance(allow_answer_fields, list) or not all(isinstance(x, str) for x in allow_answer_fields):
+            allow_answer_fields = None
+
+    # Deterministic fast path: console commands and pending-field answers never reach the model.
+    fast = _fast_path_interpret(
+        text,
+        allowed_tickers=allowed_tickers,
+        pending_field=pending_field,
+        allow_answer_fields=allow_answer_fields,
+    )
+    if fast is not None:
+        interpret_stats.record("fast_path")
+        return fast
+
     if not allowed_tickers:
+        interpret_stats.record("no_model")
         # No explicit uppercase tickers present; refuse to guess.
         return {
             "mode": "CLARIFY",
@@ -434,19 +684,6 @@ def llm_interpret(body: dict) -> Dict[str, Any]:
             "message": None,
         }
 
-    draft = body.get("draft") or {}
-    if not isinstance(draft, dict):
-        draft = {}
-
-    pending_field = draft.get("pending_field")
-    if pending_field is not None and not isinstance(pending_field, str):
-        pending_field = None
-
-    allow_answer_fields = draft.get("missing_fields")
-    if allow_answer_fields is not None:
-        if not isinstance(allow_answer_fields, list) or not all(isinstance(x, str) for x in allow_answer_fields):
-            allow_answer_fields = None
-
     s = get_settings()
 
     system = (
@@ -472,7 +709,8 @@ def llm_interpret(body: dict) -> Dict[str, Any]:
         "Do not invent event payload structure."
     )
 
-    out = call_structured(system=system, user=user, json_schema=INTERPRET_SCHEMA)
+    interpret_stats.record("llm")
+    out = await call_structured_async(system=system, user=user, json_schema=INTERPRET_SCHEMA)
 
     # Hard normalization + gating.
     if not isinstance(out, dict):
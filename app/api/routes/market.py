@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.models.event_market_facts import EventMarketFact
+from app.models.market_prices import MarketPriceDaily
+from app.services.event_facts import refresh_event_market_facts
+from app.services.market_data import get_source, ingest
+from app.settings import settings
+
+router = APIRouter()
+
+
+def sa_to_dict(obj: Any) -> Dict[str, Any]:
+    d = dict(getattr(obj, "__dict__", {}) or {})
+    d.pop("_sa_instance_state", None)
+    return d
+
+
+def parse_day(raw: Any, field: str) -> Optional[date]:
+    if raw in (None, ""):
+        return None
+    try:
+        return date.fromisoformat(str(raw))
+    except ValueError:
+        raise HTTPException(400, f"{field} must be YYYY-MM-DD")
+
+
+def parse_flag(raw: Any, field: str) -> bool:
+    if raw is None:
+        return False
+    if not isinstance(raw, bool):
+        raise HTTPException(400, f"{field} must be a boolean")
+    return raw
+
+
+@router.post("/market/ingest")
+def market_ingest(body: dict) -> Dict[str, Any]:
+    """
+    Load daily prices for a few tickers (full history in [start, end) with ret_1d / vol_20d).
+
+    Input:  { tickers: [..], start?: YYYY-MM-DD, end?: YYYY-MM-DD, source?: "yahoo"|"file", incremental?: bool }
+    Output: { tickers, rows, upserted, empty, failed, restated }
+
+    incremental=true appends bars after the stored tail (start is ignored).
+
+    Bulk universe loads go through the CLI: python -m app.services.market_data
+    """
+    if not isinstance(body, dict):
+        raise HTTPException(400, "Body must be a JSON object")
+
+    tickers = body.get("tickers")
+    if not isinstance(tickers, list) or not tickers or not all(isinstance(t, str) for t in tickers):
+        raise HTTPException(400, "tickers must be a non-empty array of strings")
+    if len(tickers) > settings.MARKET_INGEST_MAX_TICKERS:
+        raise HTTPException(400, f"Too many tickers (max {settings.MARKET_INGEST_MAX_TICKERS})")
+
+    try:
+        source = get_source(str(body.get("source") or settings.MARKET_SOURCE), root=settings.MARKET_FILE_ROOT)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+
+    return ingest(
+        tickers,
+        source=source,
+        start=parse_day(body.get("start"), "start"),
+        end=parse_day(body.get("end"), "end"),
+        workers=settings.MARKET_INGEST_WORKERS,
+        incremental=parse_flag(body.get("incremental"), "incremental"),
+    )
+
+
+@router.get("/market/{ticker}/prices")
+def list_prices(
+    ticker: str,
+    start: Optional[date] = Query(default=None),
+    end: Optional[date] = Query(default=None),
+) -> List[Dict[str, Any]]:
+    t = ticker.strip().upper()
+    if not t:
+        raise HTTPException(400, "ticker is required")
+
+    db: Session = SessionLocal()
+    try:
+        q = select(MarketPriceDaily).where(MarketPriceDaily.ticker == t)
+        if start is not None:
+            q = q.where(MarketPriceDaily.date >= start)
+        if end is not None:
+            q = q.where(MarketPriceDaily.date <= end)
+        rows = db.execute(q.order_by(MarketPriceDaily.date.asc())).scalars().all()
+        return [sa_to_dict(r) for r in rows]
+    finally:
+        db.close()
+
+
+@router.get("/cases/{case_id}/event_market_facts")
+def list_event_market_facts(
+    case_id: UUID,
+    event_type: Optional[str] = Query(default=None),
+) -> List[Dict[str, Any]]:
+    """
+    Forward returns (1d/5d/20d/60d, raw and signed by INITIATE direction) per FINAL event.
+    """
+    db: Session = SessionLocal()
+    try:
+        q = select(EventMarketFact).where(EventMarketFact.case_id == case_id)
+        if event_type:
+            q = q.where(EventMarketFact.event_type == event_type.strip().upper())
+        rows = db.execute(q.order_by(EventMarketFact.event_ts.asc(), EventMarketFact.event_id.asc())).scalars().all()
+        return [sa_to_dict(r) for r in rows]
+    finally:
+        db.close()
+
+
+@router.post("/market/event_facts:refresh")
+def refresh_event_facts(body: dict) -> Dict[str, Any]:
+    """
+    Rebuild event_market_facts.
+
+    Input:  { tickers?: [..], recompute?: bool }  (no tickers = every FINAL event)
+    Output: { events, complete }
+    """
+    if not isinstance(body, dict):
+        raise HTTPException(400, "Body must be a JSON object")
+
+    tickers = body.get("tickers")
+    if tickers is not None and (not isinstance(tickers, list) or not all(isinstance(t, str) for t in tickers)):
+        raise HTTPException(400, "tickers must be an array of strings")
+
+    return refresh_event_market_facts(tickers=tickers, recompute=parse_flag(body.get("recompute"), "recompute"))
@@ -1,17 +1,37 @@
 from __future__ import annotations
 
+import asyncio
+import json
 from datetime import datetime
 from typing import Any, Dict, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import JSON, Text, select, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import SessionLocal
+from app.db.session import get_async_db
+from app.models.decision_events import PAYLOAD_FIELDS
 from app.models.thesis_snapshots import ThesisSnapshot
-from app.models.decision_events import DecisionEvent
 from app.models.trade_cases import TradeCase
-from app.models.market_prices import MarketPriceDaily
+from app.services.archive import archived_fold_events, as_utc, fold_event, lines_asof, merge_events, read_segment
+from app.services.thesis_state import (
+    CHECKPOINT_MODEL,
+    FOLD_MODEL,
+    empty_state,
+    event_dict,
+    fold,
+    fold_asofs,
+    fold_with_checkpoints,
+    folded_state_asof,
+    latest_checkpoint,
+    save_checkpoints,
+    state_cursor,
+    tail_events_query,
+)
+from app.services.price_cache import price_cache
+from app.settings import settings
 
 router = APIRouter()
 
@@ -22,95 +42,251 @@ def sa_to_dict(obj: Any) -> Dict[str, Any]:
     return d
 
 
+async def market_summary_asof(db: AsyncSession, ticker: str, asof: datetime) -> Optional[Dict[str, Any]]:
+    series = await price_cache.get_async(db, ticker)
+    return series.summary_asof(asof.date())
+
+
+def thesis_narrative(ticker: str, state: Dict[str, Any], asof: datetime) -> str:
+    """
+    Deterministic one-liner over the folded state (no invented content).
+    """
+    return (
+        f"{ticker} {state['direction'] or 'no direction'}: conviction {state['conviction']}, "
+        f"position {state['position_pct']}%, {len(state['drivers'])} drivers, "
+        f"{len(state['risks'])} risks, {len(state['triggers'])} triggers. "
+        f"Compiled from {state['event_count']} FINAL events through {asof.isoformat()}."
+    )
+
+
 @router.post("/cases/{case_id}/thesis/compile")
-def compile_thesis(case_id: UUID, asof: datetime = Query(...)) -> Dict[str, Any]:
+async def compile_thesis(
+    case_id: UUID,
+    asof: datetime = Query(...),
+    db: AsyncSession = Depends(get_async_db),
+) -> Dict[str, Any]:
     """
-    Deterministic stub: events up to asof, plus latest market summary for case.ticker asof.
-    Produces a stable compiled_json + narrative for UI.
+    Deterministic fold of FINAL events up to asof, plus latest market summary for case.ticker asof.
+    Starts from the nearest checkpoint, so cost is O(THESIS_CHECKPOINT_EVERY), not O(events).
     """
-    db: Session = SessionLocal()
-    try:
-        case = db.query(TradeCase).filter(TradeCase.id == case_id).first()
-        if not case:
-            raise HTTPException(404, "Case not found")
-
-        events = (
-            db.query(DecisionEvent)
-            .filter(DecisionEvent.case_id == case_id, DecisionEvent.event_ts <= asof)
-            .order_by(DecisionEvent.event_ts.asc())
-            .all()
-        )
+    asof = as_utc(asof)
+    case = (await db.execute(select(TradeCase).where(TradeCase.id == case_id))).scalars().first()
+    if not case:
+        raise HTTPException(404, "Case not found")
 
-        mp = (
-            db.query(MarketPriceDaily)
-            .filter(MarketPriceDaily.ticker == case.ticker, MarketPriceDaily.date <= asof.date())
-            .order_by(MarketPriceDaily.date.desc())
-            .first()
-        )
+    state = await folded_state_asof(db, case_id, asof, checkpoint_every=settings.THESIS_CHECKPOINT_EVERY)
+    compiled = {**state, "market": await market_summary_asof(db, case.ticker, asof)}
 
-        event_types = [e.event_type for e in events]
-        compiled = {
-            "thesis": f"Case for {case.ticker}. Events: {event_types}",
-            "risks": ["market risk", "liquidity risk"] if event_types else [],
-            "triggers": ["exit" if "CLOSE" in event_types else "monitor"],
-            "confidence": 0.7 if events else 0.4,
-            "market": {"date": str(mp.date), "close": float(mp.close)} if mp else None,
-        }
-
-        narrative = f"Compiled from {len(events)} events through {asof.isoformat()} for {case.ticker}."
-
-        snapshot = ThesisSnapshot(
-            case_id=case_id,
-            asof_ts=asof,
-            compiled_json=compiled,
-            narrative=narrative,
-            model="stub",
-        )
-        db.add(snapshot)
-        db.commit()
-        db.refresh(snapshot)
-        return sa_to_dict(snapshot)
-    finally:
-        db.close()
+    snapshot = ThesisSnapshot(
+        case_id=case_id,
+        asof_ts=asof,
+        compiled_json=compiled,
+        narrative=thesis_narrative(case.ticker, state, asof),
+        model=FOLD_MODEL,
+    )
+    db.add(snapshot)
+    await db.commit()
+    await db.refresh(snapshot)
+    return sa_to_dict(snapshot)
+
+
+# One round trip: case, FINAL events, latest user-facing snapshot, nearest
+# checkpoint + the tail after it, assembled in Postgres. `body` is returned to
+# the client as-is; only the tail is decoded to fold state. The market summary
+# comes from the per-worker price cache. Generated payload columns (0009) are
+# dropped from event rows so they match sa_to_dict(DecisionEvent). `segment`
+# is set for archived cases (0012).
+_GENERATED = ", ".join(f"'{c}'" for c in PAYLOAD_FIELDS)
+
+REPLAY_SQL = text(
+    f"""
+    SELECT
+        json_build_object(
+            'case', to_jsonb(c),
+            'events', COALESCE(ev.items, '[]'::json),
+            'latest_snapshot', CASE WHEN snap.id IS NULL THEN NULL ELSE to_jsonb(snap) END
+        )::text AS body,
+        c.ticker AS ticker,
+        cp.compiled_json AS checkpoint,
+        COALESCE(tail.items, '[]'::json) AS tail,
+        a.segment AS segment,
+        a.sha256 AS sha256
+    FROM trade_cases c
+    LEFT JOIN archived_cases a ON a.case_id = c.id
+    LEFT JOIN LATERAL (
+        SELECT json_agg(to_jsonb(e) - ARRAY[{_GENERATED}] ORDER BY e.event_ts, e.id) AS items
+        FROM decision_events e
+        WHERE :include_events
+          AND e.case_id = c.id
+          AND e.status = 'FINAL'
+          AND e.event_ts <= :asof
+    ) ev ON true
+    LEFT JOIN LATERAL (
+        SELECT s.*
+        FROM thesis_snapshots s
+        WHERE s.case_id = c.id
+          AND s.asof_ts <= :asof
+          AND (s.model IS NULL OR s.model <> :checkpoint_model)
+        ORDER BY s.asof_ts DESC
+        LIMIT 1
+    ) snap ON true
+    LEFT JOIN LATERAL (
+        SELECT s.compiled_json
+        FROM thesis_snapshots s
+        WHERE s.case_id = c.id
+          AND s.model = :checkpoint_model
+          AND s.asof_ts <= :asof
+        ORDER BY s.asof_ts DESC
+        LIMIT 1
+    ) cp ON true
+    LEFT JOIN LATERAL (
+        SELECT json_agg(
+                   json_build_object('id', e.id, 'event_ts', e.event_ts, 'event_type', e.event_type, 'payload', e.payload)
+                   ORDER BY e.event_ts, e.id
+               ) AS items
+        FROM decision_events e
+        WHERE e.case_id = c.id
+          AND e.status = 'FINAL'
+          AND e.event_ts <= :asof
+          AND (
+              cp.compiled_json IS NULL
+              OR (e.event_ts, e.id) > (
+                  (cp.compiled_json -> 'state' ->> 'last_event_ts')::timestamptz,
+                  (cp.compiled_json -> 'state' ->> 'last_event_id')::uuid
+              )
+          )
+    ) tail ON true
+    WHERE c.id = :case_id
+    """
+).columns(body=Text, ticker=Text, checkpoint=JSONB, tail=JSON, segment=Text, sha256=Text)
+
+
+def tail_event(e: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Event from the json_agg tail, with event_ts back as a datetime.
+    """
+    return {**e, "event_ts": datetime.fromisoformat(e["event_ts"])}
 
 
 @router.get("/cases/{case_id}/replay")
-def replay(case_id: UUID, asof: datetime = Query(...)) -> Dict[str, Any]:
+async def replay(
+    case_id: UUID,
+    asof: datetime = Query(...),
+    include_events: bool = Query(default=True, description="Include the FINAL event list (O(events))"),
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
     """
-    Replay case state as of a point in time (case, events, latest snapshot, market summary).
+    Replay case state as of a point in time (case, folded state, events, latest snapshot, market summary).
+
+    Served by one SQL statement (REPLAY_SQL) whose JSON is passed through as
+    pre-serialized bytes; Python only folds the tail after the nearest
+    checkpoint and splices `state` and the cached `market_summary` in. With include_events=false the whole
+    call is O(THESIS_CHECKPOINT_EVERY) regardless of case length.
     """
-    db: Session = SessionLocal()
-    try:
-        case = db.query(TradeCase).filter(TradeCase.id == case_id).first()
-        if not case:
-            raise HTTPException(404, "Case not found")
-
-        events = (
-            db.query(DecisionEvent)
-            .filter(DecisionEvent.case_id == case_id, DecisionEvent.event_ts <= asof)
-            .order_by(DecisionEvent.event_ts.asc())
-            .all()
+    asof = as_utc(asof)
+    row = (
+        await db.execute(
+            REPLAY_SQL,
+            {
+                "case_id": case_id,
+                "asof": asof,
+                "include_events": include_events,
+                "checkpoint_model": CHECKPOINT_MODEL,
+            },
         )
+    ).first()
+    if not row:
+        raise HTTPException(404, "Case not found")
 
-        snapshot = (
-            db.query(ThesisSnapshot)
-            .filter(ThesisSnapshot.case_id == case_id, ThesisSnapshot.asof_ts <= asof)
-            .order_by(ThesisSnapshot.asof_ts.desc())
-            .first()
+    body = row.body
+    if row.segment is not None:
+        # Archived case: segment merged with the hot rows left (TICKER_RULE, late writes);
+        # no checkpoints are written for it.
+        lines = await asyncio.to_thread(read_segment, settings.ARCHIVE_ROOT, row.segment, row.sha256)
+        cold = lines_asof(lines, asof)
+        hot = (await db.execute(tail_events_query(case_id, asof, None))).scalars().all()
+        state = fold(merge_events(map(fold_event, cold), (event_dict(e) for e in hot)))
+        if include_events:
+            doc = json.loads(body)
+            doc["events"] = merge_events(cold, doc["events"])
+            body = json.dumps(doc, separators=(",", ":"))
+    else:
+        base = row.checkpoint["state"] if row.checkpoint else empty_state()
+        state, checkpoints = fold_with_checkpoints(
+            case_id,
+            base,
+            (tail_event(e) for e in row.tail),
+            checkpoint_every=settings.THESIS_CHECKPOINT_EVERY,
         )
+        await save_checkpoints(db, case_id, checkpoints)
 
-        mp = (
-            db.query(MarketPriceDaily)
-            .filter(MarketPriceDaily.ticker == case.ticker, MarketPriceDaily.date <= asof.date())
-            .order_by(MarketPriceDaily.date.desc())
-            .first()
-        )
+    market = await market_summary_asof(db, row.ticker, asof)
+    body = (
+        body[:-1]
+        + ',"state":' + json.dumps(state, separators=(",", ":"))
+        + ',"market_summary":' + json.dumps(market, separators=(",", ":"))
+        + "}"
+    )
+    return Response(content=body.encode("utf-8"), media_type="application/json")
+
+
+def parse_asof(raw: Any) -> datetime:
+    """
+    ISO-8601 timestamp; naive values are taken as UTC so they sort against event_ts.
+    """
+    return as_utc(datetime.fromisoformat(str(raw).strip().replace("Z", "+00:00")))
+
+
+@router.post("/cases/{case_id}/replay:batch")
+async def replay_batch(
+    case_id: UUID,
+    body: dict,
+    db: AsyncSession = Depends(get_async_db),
+) -> Dict[str, Any]:
+    """
+    Case state at many points in time (scrubbing, conviction/position charts).
+
+    Events are fetched once; the as-of points are sorted and the fold sweeps
+    forward in a single pass starting from the checkpoint at or before the
+    earliest point. Market summaries are one searchsorted over the cached series.
+
+    Input:  { asofs: [iso8601, ...] }  (max REPLAY_BATCH_MAX_POINTS)
+    Output: { case, points: [{asof, state, market_summary}] }  in input order
+    """
+    if not isinstance(body, dict):
+        raise HTTPException(400, "Body must be a JSON object")
+
+    raw = body.get("asofs")
+    if not isinstance(raw, list) or not raw:
+        raise HTTPException(400, "asofs must be a non-empty array")
+    if len(raw) > settings.REPLAY_BATCH_MAX_POINTS:
+        raise HTTPException(400, f"Too many asofs (max {settings.REPLAY_BATCH_MAX_POINTS})")
+
+    try:
+        asofs = [parse_asof(x) for x in raw]
+    except ValueError:
+        raise HTTPException(400, "asofs must be ISO-8601 timestamps")
+
+    case = (await db.execute(select(TradeCase).where(TradeCase.id == case_id))).scalars().first()
+    if not case:
+        raise HTTPException(404, "Case not found")
+
+    cp = await latest_checkpoint(db, case_id, min(asofs))
+    base = cp.compiled_json["state"] if cp else empty_state()
+    rows = (await db.execute(tail_events_query(case_id, max(asofs), state_cursor(base)))).scalars().all()
+    events = [event_dict(e) for e in rows]
+    if cp is None:
+        archived = await archived_fold_events(db, case_id, max(asofs))
+        if archived is not None:
+            events = merge_events(archived, events)
+    states = fold_asofs(events, asofs, base)
+
+    series = await price_cache.get_async(db, case.ticker)
+    markets = series.summaries_asof([a.date() for a in asofs])
+
+    points = [
+        {"asof": asof.isoformat(), "state": state, "market_summary": market}
+        for asof, state, market in zip(asofs, states, markets)
+    ]
 
-        return {
-            "case": sa_to_dict(case),
-            "events": [sa_to_dict(e) for e in events],
-            "latest_snapshot": sa_to_dict(snapshot) if snapshot else None,
-            "market_summary": {"date": str(mp.date), "close": float(mp.close)} if mp else None,
-        }
-    finally:
-        db.close()
+    return {"case": sa_to_dict(case), "points": points}
@@ -9,6 +9,8 @@ from sqlalchemy.orm import Session
 
 from app.db.session import SessionLocal
 from app.models.decision_events import DecisionEvent
+from app.services.partitions import ensure_partitions
+from app.services.ticker_rules import active_rules_stmt, ticker_rules_cache
 
 router = APIRouter()
 
@@ -23,20 +25,17 @@ def list_ticker_rules(ticker: str) -> List[Dict[str, Any]]:
     if not t:
         raise HTTPException(400, "ticker is required")
 
+    cached = ticker_rules_cache.get(t)
+    if cached is not None:
+        return cached
+
     db: Session = SessionLocal()
     try:
         # TICKER_RULE events are stored in decision_events with payload.ticker
-        rules = (
-            db.query(DecisionEvent)
-            .filter(
-                DecisionEvent.event_type == "TICKER_RULE",
-                DecisionEvent.payload["ticker"].astext == t,
-                DecisionEvent.payload["status"].astext == "ACTIVE",
-            )
-            .order_by(DecisionEvent.event_ts.asc())
-            .all()
-        )
-        return [sa_to_dict(r) for r in rules]
+        # (partial expression index ix_decision_events_ticker_rule)
+        rules = [sa_to_dict(r) for r in db.execute(active_rules_stmt(t)).scalars().all()]
+        ticker_rules_cache.put(t, rules)
+        return rules
     finally:
         db.close()
 
@@ -70,8 +69,10 @@ def create_ticker_rule(ticker: str, body: dict) -> Dict[str, Any]:
                 "status": "ACTIVE",
             },
         )
+        ensure_partitions([now])
         db.add(ev)
         db.commit()
+        ticker_rules_cache.invalidate([t])
         db.refresh(ev)
         return sa_to_dict(ev)
     finally:
@@ -93,6 +94,7 @@ def deactivate_ticker_rule(ticker: str, event_id: UUID) -> Dict[str, Any]:
         payload["status"] = "INACTIVE"
         ev.payload = payload
         db.commit()
+        ticker_rules_cache.invalidate([t])
         db.refresh(ev)
         return sa_to_dict(ev)
     finally:
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, Optional
+
+# Server-side mirror of parseCommand() in app/static/app.js. Anything this
+# grammar does not match is free-form text and goes to the LLM interpreter.
+# `long|short X` is not mirrored: the console handles it locally (sets the
+# ticker context, seeds INITIATE.direction), which no interpret action can
+# express (START_EVENT ignores ticker; INITIATE seeds are not allowlisted).
+
+_TICKER_RE = re.compile(r"^[A-Z][A-Z0-9]{0,5}(\.[A-Z])?$")
+_TICKER_CMD_RE = re.compile(r"^ticker\s+(\S+)\s*$")
+
+UTILITY_COMMANDS: Dict[str, str] = {
+    "events": "SHOW_EVENTS",
+    "draft": "SHOW_DRAFT",
+    "finalize": "FINALIZE_DRAFT",
+    "cancel": "CANCEL",
+}
+
+# prefix -> (event_type, seed key for the remaining text)
+EVENT_STARTERS = [
+    ("update:", "THESIS_UPDATE", "update_summary"),
+    ("risk:", "RISK_NOTE", "note"),
+    ("size:", "RESIZE", "rationale"),
+    ("rule:", "TICKER_RULE", "rule_text"),
+    ("post:", "POST_MORTEM", "lesson"),
+]
+
+
+def make_action(
+    action_type: str,
+    *,
+    ticker: Optional[str] = None,
+    event_type: Optional[str] = None,
+    field: Optional[str] = None,
+    answer_text: Optional[str] = None,
+    seed_payload: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Action object with every key INTERPRET_SCHEMA requires.
+    """
+    return {
+        "type": action_type,
+        "ticker": ticker,
+        "event_type": event_type,
+        "field": field,
+        "answer_text": answer_text,
+        "seed_payload": seed_payload,
+    }
+
+
+def parse_command(text: str, *, pending_field: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Deterministically map console input to an interpret action, or None.
+
+    Order matches the console: a pending field takes the input as its answer;
+    otherwise utility commands, `ticker X` and the `prefix:` event starters.
+    `long|short X` returns None. Tickers must already be uppercase.
+    """
+    line = (text or "").strip()
+    if not line:
+        return None
+
+    if pending_field:
+        return make_action("ANSWER_FIELD", field=pending_field, answer_text=line)
+
+    low = line.lower()
+    if low in UTILITY_COMMANDS:
+        return make_action(UTILITY_COMMANDS[low])
+
+    m = _TICKER_CMD_RE.match(line)
+    if m:
+        if not _TICKER_RE.match(m.group(1)):
+            return None
+        return make_action("SET_CONTEXT", ticker=m.group(1))
+
+    for prefix, event_type, seed_key in EVENT_STARTERS:
+        if low.startswith(prefix):
+            rest = line[len(prefix) :].strip()
+            return make_action(
+                "START_EVENT",
+                event_type=event_type,
+                seed_payload={seed_key: rest} if rest else None,
+            )
+
+    return None
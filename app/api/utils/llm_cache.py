@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Text, any_, cast, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.api.utils.openai_client import call_structured
+from app.config import Settings, get_settings
+from app.models.derived_artifacts import DerivedArtifact
+
+# In-process front for derived_artifacts (per worker).
+LRU_MAX_ITEMS = 4096
+
+
+class ArtifactLRU:
+    """
+    Small thread-safe LRU of input_hash -> LLM output.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                return None
+            self._data.move_to_end(key)
+            return copy.deepcopy(value)
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        with self._lock:
+            self._data[key] = copy.deepcopy(value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+artifact_lru = ArtifactLRU(LRU_MAX_ITEMS)
+
+
+def canonical_json(obj: Any) -> str:
+    """
+    Stable serialization for hashing: sorted keys, no whitespace.
+    """
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def artifact_key(*, route: str, event_type: Optional[str], payload: Any, s: Settings) -> str:
+    """
+    sha256 over everything that determines the LLM output for a route.
+    """
+    material = canonical_json(
+        {
+            "route": route,
+            "event_type": event_type,
+            "payload": payload,
+            "prompt_version": s.llm_prompt_version,
+            "model": s.llm_model,
+        }
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def cached_call_structured(
+    db: Session,
+    *,
+    route: str,
+    event_type: Optional[str],
+    payload: Any,
+    system: str,
+    user: str,
+    json_schema: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Read-through cache around call_structured: LRU -> derived_artifacts -> OpenAI.
+
+    The cached value is the raw structured output; routes still apply their
+    guardrails and truncation on every call, so those can change without
+    invalidating the cache.
+    """
+    s = get_settings()
+    key = artifact_key(route=route, event_type=event_type, payload=payload, s=s)
+
+    hit = artifact_lru.get(key)
+    if hit is not None:
+        return hit
+
+    row = db.get(DerivedArtifact, key)
+    if row is not None:
+        artifact_lru.put(key, row.output)
+        return copy.deepcopy(row.output)
+
+    out = call_structured(system=system, user=user, json_schema=json_schema)
+
+    db.execute(insert_artifacts_stmt([artifact_row(key, route, event_type, out, s=s)]))
+    db.commit()
+    artifact_lru.put(key, out)
+    return out
+
+
+def artifact_row(key: str, route: str, event_type: Optional[str], output: Dict[str, Any], *, s: Settings) -> Dict[str, Any]:
+    return {
+        "input_hash": key,
+        "route": route,
+        "event_type": event_type,
+        "prompt_version": s.llm_prompt_version,
+        "model": s.llm_model,
+        "output": output,
+    }
+
+
+def insert_artifacts_stmt(rows: List[Dict[str, Any]]):
+    """
+    Multi-row insert; concurrent writers of the same hash are harmless.
+    """
+    return (
+        pg_insert(DerivedArtifact)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=[DerivedArtifact.input_hash])
+    )
+
+
+async def lookup_artifacts_async(db: AsyncSession, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Batch lookup: LRU first, then one `input_hash = ANY(:keys)` query for the rest.
+    """
+    found: Dict[str, Dict[str, Any]] = {}
+    missing: List[str] = []
+    for key in keys:
+        hit = artifact_lru.get(key)
+        if hit is not None:
+            found[key] = hit
+        else:
+            missing.append(key)
+
+    if missing:
+        rows = await db.execute(
+            select(DerivedArtifact.input_hash, DerivedArtifact.output).where(
+                DerivedArtifact.input_hash == any_(cast(missing, ARRAY(Text)))
+            )
+        )
+        for key, output in rows:
+            artifact_lru.put(key, output)
+            found[key] = output
+    return found
+
+
+async def store_artifacts_async(
+    db: AsyncSession,
+    items: List[Tuple[str, str, Optional[str], Dict[str, Any]]],
+    *,
+    s: Settings,
+) -> None:
+    """
+    Persist (key, route, event_type, output) tuples in one statement and warm the LRU.
+    """
+    if not items:
+        return
+    await db.execute(insert_artifacts_stmt([artifact_row(k, r, et, out, s=s) for k, r, et, out in items]))
+    await db.commit()
+    for key, _, _, out in items:
+        artifact_lru.put(key, out)
@@ -1,39 +1,79 @@
 from __future__ import annotations
 
 import json
+from functools import lru_cache
 from typing import Any, Dict
 
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI, OpenAI
 
-from app.config import get_settings
+from app.config import Settings, get_settings
 
 
+def _http_timeout(s: Settings) -> httpx.Timeout:
+    # read/write/pool bounded by the LLM timeout; connect fails fast
+    return httpx.Timeout(s.llm_timeout_s, connect=s.llm_connect_timeout_s)
+
+
+def _http_limits(s: Settings) -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=s.llm_max_connections,
+        max_keepalive_connections=s.llm_max_connections,
+        keepalive_expiry=s.llm_keepalive_s,
+    )
+
+
+@lru_cache(maxsize=1)
 def get_client() -> OpenAI:
+    """
+    Process-wide client: one keep-alive connection pool per worker, so calls
+    reuse warm TLS connections. Retries use the SDK's exponential backoff
+    with jitter (PMDOS_LLM_MAX_RETRIES).
+    """
     s = get_settings()
-    return OpenAI(api_key=s.openai_api_key)
+    return OpenAI(
+        api_key=s.openai_api_key,
+        timeout=_http_timeout(s),
+        max_retries=s.llm_max_retries,
+        http_client=httpx.Client(limits=_http_limits(s), timeout=_http_timeout(s)),
+    )
 
 
-def call_structured(
-    *,
-    system: str,
-    user: str,
-    json_schema: Dict[str, Any],
-) -> Dict[str, Any]:
+@lru_cache(maxsize=1)
+def get_async_client() -> AsyncOpenAI:
     """
-    Calls OpenAI with strict structured output. Returns parsed JSON dict.
-    Raises on non-JSON outputs (should be rare with strict schemas).
+    Async counterpart of get_client (shared by async routes in this worker).
     """
     s = get_settings()
-    client = get_client()
+    return AsyncOpenAI(
+        api_key=s.openai_api_key,
+        timeout=_http_timeout(s),
+        max_retries=s.llm_max_retries,
+        http_client=httpx.AsyncClient(limits=_http_limits(s), timeout=_http_timeout(s)),
+    )
+
 
-    resp = client.chat.completions.create(
-        model=s.llm_model,
-        temperature=s.llm_temperature,
-        messages=[
+async def close_clients() -> None:
+    """
+    Release pooled connections (app shutdown). Only closes clients that were created.
+    """
+    if get_client.cache_info().currsize:
+        get_client().close()
+        get_client.cache_clear()
+    if get_async_client.cache_info().currsize:
+        await get_async_client().close()
+        get_async_client.cache_clear()
+
+
+def _completion_kwargs(s: Settings, *, system: str, user: str, json_schema: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "model": s.llm_model,
+        "temperature": s.llm_temperature,
+        "messages": [
             {"role": "system", "content": system},
             {"role": "user", "content": user},
         ],
-        response_format={
+        "response_format": {
             "type": "json_schema",
             "json_schema": {
                 "name": "pm_decision_os",
@@ -41,10 +81,43 @@ def call_structured(
                 "strict": True,
             },
         },
-    )
+    }
+
 
+def _parse_content(resp: Any) -> Dict[str, Any]:
     content = resp.choices[0].message.content or ""
     try:
         return json.loads(content)
     except Exception:
         raise RuntimeError(f"LLM returned non-JSON content: {content[:2000]}")
+
+
+def call_structured(
+    *,
+    system: str,
+    user: str,
+    json_schema: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Calls OpenAI with strict structured output. Returns parsed JSON dict.
+    Raises on non-JSON outputs (should be rare with strict schemas).
+    """
+    s = get_settings()
+    client = get_client()
+    resp = client.chat.completions.create(**_completion_kwargs(s, system=system, user=user, json_schema=json_schema))
+    return _parse_content(resp)
+
+
+async def call_structured_async(
+    *,
+    system: str,
+    user: str,
+    json_schema: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Async variant of call_structured for async routes (does not hold a threadpool worker).
+    """
+    s = get_settings()
+    client = get_async_client()
+    resp = await client.chat.completions.create(**_completion_kwargs(s, system=system, user=user, json_schema=json_schema))
+    return _parse_content(resp)
@@ -1,11 +1,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from dotenv import load_dotenv
-import os
+from functools import lru_cache
 
-
-load_dotenv()
+from app.settings import settings as app_settings
 
 
 @dataclass(frozen=True)
@@ -15,25 +13,36 @@ class Settings:
     llm_model: str
     llm_temperature: float
     llm_prompt_version: str
+    llm_timeout_s: float
+    llm_connect_timeout_s: float
+    llm_max_retries: int
+    llm_max_connections: int
+    llm_keepalive_s: float
+    llm_batch_max_items: int
+    llm_batch_concurrency: int
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    database_url = os.getenv("DATABASE_URL") or os.getenv("PG_URL") or ""
-    if not database_url:
-        raise RuntimeError("Missing DATABASE_URL (or PG_URL)")
-
-    openai_api_key = os.getenv("OPENAI_API_KEY") or ""
-    if not openai_api_key:
+    """
+    LLM view of the app.settings singleton (the only place env / .env is read).
+    Cached per process; OPENAI_API_KEY is required here, not at import.
+    """
+    s = app_settings
+    if not s.OPENAI_API_KEY:
         raise RuntimeError("Missing OPENAI_API_KEY")
 
-    llm_model = os.getenv("PMDOS_LLM_MODEL", "gpt-4.1")
-    llm_temperature = float(os.getenv("PMDOS_LLM_TEMPERATURE", "0.2"))
-    llm_prompt_version = os.getenv("PMDOS_LLM_PROMPT_VERSION", "dev")
-
     return Settings(
-        database_url=database_url,
-        openai_api_key=openai_api_key,
-        llm_model=llm_model,
-        llm_temperature=llm_temperature,
-        llm_prompt_version=llm_prompt_version,
+        database_url=s.DATABASE_URL,
+        openai_api_key=s.OPENAI_API_KEY,
+        llm_model=s.PMDOS_LLM_MODEL,
+        llm_temperature=s.PMDOS_LLM_TEMPERATURE,
+        llm_prompt_version=s.PMDOS_LLM_PROMPT_VERSION,
+        llm_timeout_s=s.PMDOS_LLM_TIMEOUT_S,
+        llm_connect_timeout_s=s.PMDOS_LLM_CONNECT_TIMEOUT_S,
+        llm_max_retries=s.PMDOS_LLM_MAX_RETRIES,
+        llm_max_connections=s.PMDOS_LLM_MAX_CONNECTIONS,
+        llm_keepalive_s=s.PMDOS_LLM_KEEPALIVE_S,
+        llm_batch_max_items=s.PMDOS_LLM_BATCH_MAX_ITEMS,
+        llm_batch_concurrency=s.PMDOS_LLM_BATCH_CONCURRENCY,
     )
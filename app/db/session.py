@@ -1,6 +1,41 @@
+from typing import AsyncIterator
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.settings import settings
 
 engine = create_engine(settings.DATABASE_URL, future=True)
 SessionLocal = sessionmaker(bind=engine)
+
+
+def async_database_url(url: str) -> URL:
+    """
+    Same database, asyncpg driver (DATABASE_URL may name psycopg2/psycopg or no driver).
+    """
+    return make_url(url).set(drivername="postgresql+asyncpg")
+
+
+def asyncpg_dsn(url: str) -> str:
+    """
+    Plain postgresql:// DSN for raw asyncpg connections (e.g. LISTEN).
+    """
+    return make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+async_engine = create_async_engine(
+    async_database_url(settings.DATABASE_URL),
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_pre_ping=True,
+)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """
+    Request-scoped AsyncSession (FastAPI dependency).
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,14 +1,36 @@
 from __future__ import annotations
 
+import asyncio
 from pathlib import Path
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 
 from app.api.routes import health, market, cases, events, thesis, tickers
-from app.api.routes import llm
+from app.api.routes import llm, books
+from app.api.utils.openai_client import close_clients
+from app.db.session import asyncpg_dsn
+from app.services.adv import refresh_open_case_adv
+from app.services.partitions import ensure_future_partitions
+from app.services.price_cache import price_cache
+from app.settings import settings
 
 app = FastAPI()
 
+
+@app.on_event("startup")
+async def startup() -> None:
+    await price_cache.start_listener(asyncpg_dsn(settings.DATABASE_URL))
+    await ensure_future_partitions()
+    # Warm ADV facts for open cases off the request path.
+    app.state.adv_warmup = asyncio.get_running_loop().create_task(refresh_open_case_adv())
+
+
+@app.on_event("shutdown")
+async def shutdown() -> None:
+    await close_clients()
+    await price_cache.stop_listener()
+
+
 app.include_router(health.router, prefix="/api")
 app.include_router(market.router, prefix="/api")
 app.include_router(cases.router, prefix="/api")
@@ -16,6 +38,7 @@ app.include_router(events.router, prefix="/api")
 app.include_router(thesis.router, prefix="/api")
 app.include_router(tickers.router, prefix="/api")
 app.include_router(llm.router, prefix="/api")
+app.include_router(books.router, prefix="/api")
 
 
 # Serve app/static/index.html at "/"
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, Text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+class ArchivedCase(Base):
+    """
+    A closed case whose FINAL events live in a gzip JSONL segment under
+    ARCHIVE_ROOT instead of decision_events (see app/services/archive.py).
+    """
+    __tablename__ = "archived_cases"
+    case_id = Column(UUID(as_uuid=True), ForeignKey("trade_cases.id", ondelete="CASCADE"), primary_key=True)
+    segment = Column(Text, nullable=False)        # path relative to ARCHIVE_ROOT
+    sha256 = Column(Text, nullable=False)         # of the segment file, checked on first read
+    event_count = Column(Integer, nullable=False)
+    first_event_ts = Column(DateTime(timezone=True), nullable=True)
+    last_event_ts = Column(DateTime(timezone=True), nullable=True)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,35 @@
+# app/models/decision_drafts.py
+from __future__ import annotations
+
+from uuid import uuid4
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, Text, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+class DecisionDraft(Base):
+    """
+    Mutable DRAFT decision events, one per (case_id, event_type).
+
+    Patched on every chat answer, so kept out of the FINAL journal: the only
+    index besides the PK is the (case_id, event_type) unique constraint, and
+    the table is created with fillfactor 50 (migration 0010) so payload
+    updates stay HOT. Finalize moves the row (same id) into decision_events.
+    """
+    __tablename__ = "decision_drafts"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    case_id = Column(UUID(as_uuid=True), ForeignKey("trade_cases.id", ondelete="CASCADE"), nullable=False)
+
+    event_ts = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    event_type = Column(Text, nullable=False)
+    payload = Column(JSONB, nullable=False, server_default="{}")
+
+    version = Column(Integer, nullable=False, server_default="1")  # bumped on every payload write
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        # one draft per (case_id, event_type); ON CONFLICT arbiter for create_or_reuse_draft
+        UniqueConstraint("case_id", "event_type", name="ux_decision_drafts_case_type"),
+    )
@@ -3,29 +3,93 @@ from __future__ import annotations
 
 from datetime import datetime
 from uuid import uuid4
-from sqlalchemy import Column, DateTime, ForeignKey, Index, Text
+from sqlalchemy import Column, Computed, DateTime, Float, ForeignKey, Index, Integer, Text, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 from app.db.base import Base
 
+
+def payload_field_sql(event_type: str, key: str, jsonb_type: str, cast: str) -> str:
+    """
+    Generation expression for a hot payload field (migration 0009): set only on
+    FINAL events of `event_type` whose value has the expected JSON type.
+    """
+    value = f"(payload ->> '{key}')" + (f"::{cast}" if cast else "")
+    return (
+        f"CASE WHEN event_type = '{event_type}' AND status = 'FINAL' "
+        f"AND jsonb_typeof(payload -> '{key}') = '{jsonb_type}' THEN {value} END"
+    )
+
+
+# column -> (event_type, JSON type, SQL cast); mirrored in migration 0009
+PAYLOAD_FIELDS = {
+    "direction": ("INITIATE", "string", ""),
+    "conviction": ("INITIATE", "number", "numeric::int"),
+    "position_intent_pct": ("INITIATE", "number", "float8"),
+    "conviction_delta": ("THESIS_UPDATE", "number", "numeric::int"),
+    "to_pct": ("RESIZE", "number", "float8"),
+    "risk_type": ("RISK_NOTE", "string", ""),
+    "severity": ("RISK_NOTE", "string", ""),
+    "due_by": ("RISK_NOTE", "string", ""),  # text: a ::date cast is not immutable
+    "outcome": ("POST_MORTEM", "string", ""),
+}
+
+
+def _payload_field(name: str, type_: object) -> Column:
+    event_type, jsonb_type, cast = PAYLOAD_FIELDS[name]
+    # Deferred: not part of event dicts (sa_to_dict); selected explicitly by analytics queries.
+    return deferred(Column(type_, Computed(payload_field_sql(event_type, name, jsonb_type, cast), persisted=True)))
+
+
 class DecisionEvent(Base):
     __tablename__ = "decision_events"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     case_id = Column(UUID(as_uuid=True), ForeignKey("trade_cases.id", ondelete="CASCADE"), nullable=False)
 
-    event_ts = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    # Partition key (monthly RANGE, migration 0011); part of the table PK (id, event_ts).
+    event_ts = Column(DateTime(timezone=True), primary_key=True, nullable=False, server_default=func.now())
     event_type = Column(Text, nullable=False)
     payload = Column(JSONB, nullable=False, server_default="{}")
 
-    status = Column(Text, nullable=False, server_default="FINAL")   # new
+    status = Column(Text, nullable=False, server_default="FINAL")   # always FINAL since drafts moved to decision_drafts (0010)
     updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())  # new
+    version = Column(Integer, nullable=False, server_default="1")  # bumped on every draft payload write
 
     created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
 
+    # Stored generated columns over hot payload fields (NULL unless FINAL and of the right type).
+    direction = _payload_field("direction", Text)
+    conviction = _payload_field("conviction", Integer)
+    position_intent_pct = _payload_field("position_intent_pct", Float)
+    conviction_delta = _payload_field("conviction_delta", Integer)
+    to_pct = _payload_field("to_pct", Float)
+    risk_type = _payload_field("risk_type", Text)
+    severity = _payload_field("severity", Text)
+    due_by = _payload_field("due_by", Text)
+    outcome = _payload_field("outcome", Text)
+
     __table_args__ = (
         Index("ix_decision_events_case_id", "case_id"),
-        Index("ix_decision_events_event_ts", "event_ts"),
+        # BRIN (0012): event_ts / created_at arrive in roughly insert order
+        Index("brin_decision_events_event_ts", "event_ts", postgresql_using="brin", postgresql_with={"pages_per_range": 32}),
+        Index("brin_decision_events_created_at", "created_at", postgresql_using="brin", postgresql_with={"pages_per_range": 32}),
         Index("ix_decision_events_case_id_event_ts", "case_id", "event_ts"),
         Index("ix_decision_events_case_type_status", "case_id", "event_type", "status"),  # new
+        Index("ix_decision_events_risk_type_severity", "risk_type", "severity", postgresql_where=text("risk_type IS NOT NULL")),
+        Index("ix_decision_events_due_by", "due_by", postgresql_where=text("due_by IS NOT NULL")),
+        Index("ix_decision_events_outcome", "outcome", postgresql_where=text("outcome IS NOT NULL")),
+        {"postgresql_partition_by": "RANGE (event_ts)"},
     )
+    # Identity stays the event id; event_ts is in the table PK only because of partitioning.
+    __mapper_args__ = {"primary_key": [id]}
+
+
+# Active-rule lookup by ticker (tickers routes); partial expression index from 0008.
+Index(
+    "ix_decision_events_ticker_rule",
+    DecisionEvent.payload["ticker"].astext,
+    DecisionEvent.event_ts,
+    postgresql_where=text("event_type = 'TICKER_RULE'"),
+)
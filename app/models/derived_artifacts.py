@@ -0,0 +1,14 @@
+from sqlalchemy import Column, DateTime, Text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+class DerivedArtifact(Base):
+    __tablename__ = "derived_artifacts"
+    input_hash = Column(Text, primary_key=True)  # sha256(route, event_type, payload, prompt_version, model)
+    route = Column(Text, nullable=False)
+    event_type = Column(Text, nullable=True)
+    prompt_version = Column(Text, nullable=False)
+    model = Column(Text, nullable=False)
+    output = Column(JSONB, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,35 @@
+from sqlalchemy import Boolean, Column, Date, DateTime, Float, Index, SmallInteger, Text, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+class EventMarketFact(Base):
+    """
+    Derived: forward returns after each FINAL decision event (rebuildable from
+    decision_events + market_prices_daily; see app/services/event_facts.py).
+    """
+    __tablename__ = "event_market_facts"
+    event_id = Column(UUID(as_uuid=True), primary_key=True)  # decision_events.id (no FK: facts are rebuildable)
+    case_id = Column(UUID(as_uuid=True), nullable=False)
+    ticker = Column(Text, nullable=False)
+    event_type = Column(Text, nullable=False)
+    event_ts = Column(DateTime(timezone=True), nullable=False)
+    direction = Column(Text, nullable=True)        # LONG | SHORT from the case's INITIATE as of event_ts
+    sign = Column(SmallInteger, nullable=True)     # +1 LONG, -1 SHORT
+    base_date = Column(Date, nullable=True)        # last bar on or before the event date
+    base_close = Column(Float, nullable=True)
+    ret_1d = Column(Float, nullable=True)
+    ret_5d = Column(Float, nullable=True)
+    ret_20d = Column(Float, nullable=True)
+    ret_60d = Column(Float, nullable=True)
+    signed_ret_1d = Column(Float, nullable=True)
+    signed_ret_5d = Column(Float, nullable=True)
+    signed_ret_20d = Column(Float, nullable=True)
+    signed_ret_60d = Column(Float, nullable=True)
+    complete = Column(Boolean, nullable=False, server_default=text("false"))  # all horizons filled
+    computed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_event_market_facts_case_id_event_type", "case_id", "event_type"),
+        Index("ix_event_market_facts_incomplete_ticker", "ticker", postgresql_where=text("NOT complete")),
+    )
@@ -1,14 +1,29 @@
 import uuid
-from sqlalchemy import Column, DateTime, ForeignKey
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Text, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.sql import func
 from app.db.base import Base
 
 class ThesisSnapshot(Base):
     __tablename__ = "thesis_snapshots"
-    snapshot_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    case_id = Column(UUID(as_uuid=True), ForeignKey("trade_cases.case_id"), nullable=False)
-    asof = Column(DateTime(timezone=True), nullable=False, index=True)
-    snapshot = Column(JSONB, nullable=False)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    case_id = Column(UUID(as_uuid=True), ForeignKey("trade_cases.id", ondelete="CASCADE"), nullable=False)
+    asof_ts = Column(DateTime(timezone=True), nullable=False)
+    compiled_json = Column(JSONB, nullable=False)
+    narrative = Column(Text, nullable=True)
+    model = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
+    __table_args__ = (
+        Index("ix_thesis_snapshots_case_id", "case_id"),
+        Index("ix_thesis_snapshots_asof_ts", "asof_ts"),
+        Index("ix_thesis_snapshots_case_id_asof_ts", "case_id", "asof_ts"),
+        Index(
+            "uq_thesis_snapshots_checkpoint",
+            "case_id",
+            "asof_ts",
+            unique=True,
+            postgresql_where=text("model = 'checkpoint:fold:v1'"),
+        ),
+        Index("brin_thesis_snapshots_created_at", "created_at", postgresql_using="brin", postgresql_with={"pages_per_range": 32}),
+    )
@@ -0,0 +1,218 @@
+# app/services/adv.py
+"""
+Average daily volume (ADV) facts for RESIZE decisions.
+
+ADV per ticker = mean of the last 20 / 60 bars of volume (shares) and of
+volume * close (USD), from one LATERAL query over market_prices_daily for
+all requested tickers, reduced with NumPy over an N x 60 matrix.
+
+Given a NAV, a RESIZE's to_pct / from_pct imply:
+- position_usd = |to_pct| % of NAV, trade_usd = |to_pct - from_pct| % of NAV
+- position / trade as a percentage of 20d and 60d ADV (USD)
+
+These sit next to the user-entered constraint flags
+(constraints.adv_cap_binding); they never set them.
+
+Per worker, facts for every OPEN case's ticker are batch-computed ahead of
+time (startup, and in the background after a miss or a price change), so
+draft responses only read the cache.
+"""
+from __future__ import annotations
+
+import logging
+import math
+import threading
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.price_cache import price_cache
+
+log = logging.getLogger(__name__)
+
+ADV_WINDOWS = (20, 60)
+MIN_OBS_FRACTION = 0.5
+
+ADV_SQL = text(
+    """
+    SELECT t.ticker, p.date, p.volume::float8 AS volume, p.close::float8 AS close
+    FROM unnest(CAST(:tickers AS text[])) AS t(ticker)
+    CROSS JOIN LATERAL (
+        SELECT m.date, m.volume, m.close
+        FROM market_prices_daily m
+        WHERE m.ticker = t.ticker AND m.date <= :asof
+        ORDER BY m.date DESC
+        LIMIT :depth
+    ) p
+    ORDER BY t.ticker, p.date DESC
+    """
+)
+
+OPEN_CASES_SQL = text("SELECT id, ticker FROM trade_cases WHERE status = 'OPEN'")
+
+
+def _num(x: float) -> Optional[float]:
+    return None if not math.isfinite(x) else float(x)
+
+
+def adv_from_rows(rows: Sequence[Any], tickers: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    ADV facts per ticker from rows ordered by (ticker, date DESC).
+    """
+    depth = max(ADV_WINDOWS)
+    n = len(tickers)
+    vol = np.full((n, depth), np.nan)
+    usd = np.full((n, depth), np.nan)
+    last_date: Dict[str, date] = {}
+
+    if rows:
+        col = {t: j for j, t in enumerate(tickers)}
+        ti = np.asarray([col[r.ticker] for r in rows])
+        # Position of each row inside its ticker group (rows are grouped by ticker).
+        starts = np.r_[0, np.flatnonzero(np.diff(ti)) + 1]
+        k = np.arange(ti.shape[0]) - np.repeat(starts, np.diff(np.r_[starts, ti.shape[0]]))
+        v = np.asarray([r.volume if r.volume is not None else np.nan for r in rows], dtype=np.float64)
+        c = np.asarray([r.close if r.close is not None else np.nan for r in rows], dtype=np.float64)
+        vol[ti, k] = v
+        usd[ti, k] = v * c
+        for r in rows:
+            last_date.setdefault(r.ticker, r.date)
+
+    out: Dict[str, Dict[str, Any]] = {}
+    stats = {}
+    for w in ADV_WINDOWS:
+        ok = (~np.isnan(usd[:, :w])).sum(axis=1) >= math.ceil(MIN_OBS_FRACTION * w)
+        # Means over the rows with enough observations only (an all-NaN row warns).
+        mean_vol = np.full(n, np.nan)
+        mean_usd = np.full(n, np.nan)
+        mean_vol[ok] = np.nanmean(vol[ok, :w], axis=1)
+        mean_usd[ok] = np.nanmean(usd[ok, :w], axis=1)
+        stats[w] = (mean_vol, mean_usd)
+    for j, t in enumerate(tickers):
+        facts: Dict[str, Any] = {"ticker": t, "asof_date": str(last_date[t]) if t in last_date else None}
+        for w in ADV_WINDOWS:
+            facts[f"adv_{w}d_shares"] = _num(stats[w][0][j])
+            facts[f"adv_{w}d_usd"] = _num(stats[w][1][j])
+        out[t] = facts
+    return out
+
+
+async def compute_adv(db: AsyncSession, tickers: Sequence[str], asof: date) -> Dict[str, Dict[str, Any]]:
+    uniq = sorted({t.upper() for t in tickers if t})
+    if not uniq:
+        return {}
+    rows = (await db.execute(ADV_SQL, {"tickers": uniq, "asof": asof, "depth": max(ADV_WINDOWS)})).all()
+    return adv_from_rows(rows, uniq)
+
+
+def resize_adv_facts(
+    adv: Optional[Dict[str, Any]],
+    *,
+    to_pct: Any,
+    from_pct: Any = None,
+    nav: Optional[float],
+) -> Dict[str, Any]:
+    """
+    ADV facts plus what to_pct / from_pct imply against them for a NAV.
+    """
+    out: Dict[str, Any] = {**(adv or {}), "nav": nav}
+    to = float(to_pct) if isinstance(to_pct, (int, float)) and not isinstance(to_pct, bool) else None
+    frm = float(from_pct) if isinstance(from_pct, (int, float)) and not isinstance(from_pct, bool) else 0.0
+    position_usd = abs(to) / 100.0 * nav if to is not None and nav else None
+    trade_usd = abs(to - frm) / 100.0 * nav if to is not None and nav else None
+    out["position_usd"] = position_usd
+    out["trade_usd"] = trade_usd
+    for w in ADV_WINDOWS:
+        adv_usd = (adv or {}).get(f"adv_{w}d_usd")
+        out[f"position_pct_adv_{w}d"] = position_usd / adv_usd * 100.0 if position_usd is not None and adv_usd else None
+        out[f"trade_pct_adv_{w}d"] = trade_usd / adv_usd * 100.0 if trade_usd is not None and adv_usd else None
+    return out
+
+
+class AdvCache:
+    """
+    Per-worker ADV facts for OPEN case tickers, plus case_id -> ticker.
+    """
+
+    def __init__(self) -> None:
+        self._facts: Dict[str, Dict[str, Any]] = {}
+        self._case_ticker: Dict[UUID, str] = {}
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def invalidate(self, tickers: Sequence[str]) -> None:
+        with self._lock:
+            for t in tickers:
+                self._facts.pop(t.upper(), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._facts.clear()
+
+    def for_case(self, case_id: UUID) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            t = self._case_ticker.get(case_id)
+            return dict(self._facts[t]) if t is not None and t in self._facts else None
+
+    async def get_many(self, db: AsyncSession, tickers: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Current ADV for tickers; misses are computed in one query and cached.
+        """
+        want = sorted({t.upper() for t in tickers if t})
+        with self._lock:
+            out = {t: dict(self._facts[t]) for t in want if t in self._facts}
+        missing = [t for t in want if t not in out]
+        if missing:
+            facts = await compute_adv(db, missing, date.today())
+            with self._lock:
+                self._facts.update(facts)
+            out.update(facts)
+        return out
+
+    def claim_refresh(self) -> bool:
+        with self._lock:
+            if self._refreshing:
+                return False
+            self._refreshing = True
+            return True
+
+    async def refresh_open_cases(self, db: AsyncSession) -> int:
+        """
+        Batch-compute ADV for every OPEN case ticker not already cached.
+        """
+        try:
+            cases = (await db.execute(OPEN_CASES_SQL)).all()
+            with self._lock:
+                self._case_ticker = {c.id: c.ticker.upper() for c in cases}
+                missing = sorted({t for t in self._case_ticker.values() if t not in self._facts})
+            facts = await compute_adv(db, missing, date.today())
+            with self._lock:
+                self._facts.update(facts)
+            return len(facts)
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+
+adv_cache = AdvCache()
+price_cache.on_invalidate.append(adv_cache.invalidate)
+price_cache.on_clear.append(adv_cache.clear)
+
+
+async def refresh_open_case_adv() -> None:
+    """
+    Background entry point (startup / after a cache miss); own session, never raises.
+    """
+    from app.db.session import AsyncSessionLocal
+
+    if not adv_cache.claim_refresh():
+        return
+    try:
+        async with AsyncSessionLocal() as db:
+            await adv_cache.refresh_open_cases(db)
+    except Exception as e:
+        log.warning("ADV refresh failed: %s", e)
@@ -0,0 +1,314 @@
+# app/services/archive.py
+"""
+Cold tier for closed cases.
+
+FINAL events of cases closed more than ARCHIVE_AFTER_DAYS ago are moved out
+of decision_events into one gzip JSONL segment per case under ARCHIVE_ROOT
+({closed year}/{case_id}.jsonl.gz, one event per line in fold order).
+TICKER_RULE events stay hot (HOT_EVENT_TYPES): rules are ticker-scoped and
+often linked to a closed case's post-mortem, and the ticker routes read
+decision_events only. The
+segment is written to a temp file, fsynced and renamed before the
+archived_cases row is inserted and the hot rows deleted, all in one
+transaction, so a crash leaves either the hot rows or a complete segment.
+The case's fold checkpoints are dropped with them (they would point into
+rows that no longer exist); archived reads fold from the segment.
+
+Read-through (segment merged with the case's remaining hot rows in
+(event_ts, id) order): get_events, replay, replay:batch, compile_thesis.
+Each costs one archived_cases primary-key probe (get_events and replay
+always; replay:batch and compile_thesis only when no checkpoint applies).
+Decoded segments are cached per worker (LRU, ARCHIVE_CACHE_SEGMENTS) and
+their sha256 is checked on load. Checkpoints are never written for
+archived cases.
+
+Not read through; archived events are invisible to:
+- /books/{book}/exposure as of a date before the case closed, and
+  /books/{book}/exposure/series over such dates
+- /books/{book}/patterns (INITIATE / POST_MORTEM of archived cases)
+- event_market_facts refreshes (rows already computed are kept, not updated)
+- /llm/event_summaries and /llm/event_summary by event id
+Restore the case first if these need it.
+
+Archived cases are meant to stay read-only; events written to one later
+stay hot and are merged into reads like the kept TICKER_RULE rows.
+
+    python -m app.services.archive run --older-than-days 180 --limit 500
+    python -m app.services.archive restore <case_id>
+"""
+from __future__ import annotations
+
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import delete, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.archived_cases import ArchivedCase
+from app.models.decision_events import DecisionEvent
+from app.models.thesis_snapshots import ThesisSnapshot
+from app.services.partitions import ensure_partitions
+from app.services.thesis_state import CHECKPOINT_MODEL
+from app.settings import settings
+
+CANDIDATES_SQL = text(
+    """
+    SELECT c.id, c.closed_at
+    FROM trade_cases c
+    LEFT JOIN archived_cases a ON a.case_id = c.id
+    WHERE c.status = 'CLOSED'
+      AND c.closed_at < :cutoff
+      AND a.case_id IS NULL
+    ORDER BY c.closed_at
+    LIMIT :limit
+    """
+)
+
+# Event types never moved to a segment.
+HOT_EVENT_TYPES = ("TICKER_RULE",)
+
+# decision_events columns kept in a segment (generated columns are rebuilt on restore)
+EVENT_FIELDS = ("id", "case_id", "event_ts", "event_type", "payload", "status", "version", "updated_at", "created_at")
+
+
+def _iso(v: Any) -> Any:
+    return v.isoformat() if isinstance(v, datetime) else str(v) if isinstance(v, UUID) else v
+
+
+def encode_event(de: DecisionEvent) -> Dict[str, Any]:
+    return {f: _iso(getattr(de, f)) for f in EVENT_FIELDS}
+
+
+def decode_event(e: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Segment line back to the shape of sa_to_dict(DecisionEvent).
+    """
+    out = dict(e)
+    for f in ("id", "case_id"):
+        out[f] = UUID(e[f])
+    for f in ("event_ts", "updated_at", "created_at"):
+        out[f] = datetime.fromisoformat(e[f]) if e.get(f) else None
+    return out
+
+
+def segment_name(case_id: UUID, closed_at: datetime) -> str:
+    return f"{closed_at.astimezone(timezone.utc):%Y}/{case_id}.jsonl.gz"
+
+
+def write_segment(root: str, rel: str, lines: Sequence[Dict[str, Any]]) -> str:
+    """
+    Write a segment atomically (temp file, fsync, rename); returns its sha256.
+    """
+    path = os.path.join(root, rel)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{time.time_ns():x}.tmp"
+    with open(tmp, "wb") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as gz:
+            for line in lines:
+                gz.write(json.dumps(line, separators=(",", ":"), sort_keys=True).encode("utf-8") + b"\n")
+        raw.flush()
+        os.fsync(raw.fileno())
+    os.replace(tmp, path)
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+@lru_cache(maxsize=settings.ARCHIVE_CACHE_SEGMENTS)
+def read_segment(root: str, rel: str, sha256: str) -> Tuple[Dict[str, Any], ...]:
+    """
+    Decoded segment lines (JSON values; timestamps as ISO strings). Cached per worker;
+    callers must not mutate the returned dicts.
+    """
+    with open(os.path.join(root, rel), "rb") as f:
+        raw = f.read()
+    if hashlib.sha256(raw).hexdigest() != sha256:
+        raise RuntimeError(f"archive segment {rel} does not match its sha256")
+    return tuple(json.loads(line) for line in gzip.decompress(raw).splitlines() if line)
+
+
+async def archived_events(db: AsyncSession, case_id: UUID) -> Optional[Tuple[Dict[str, Any], ...]]:
+    """
+    Segment lines for an archived case, or None if the case is not archived.
+    """
+    row = (
+        await db.execute(
+            select(ArchivedCase.segment, ArchivedCase.sha256).where(ArchivedCase.case_id == case_id)
+        )
+    ).first()
+    if row is None:
+        return None
+    return await asyncio.to_thread(read_segment, settings.ARCHIVE_ROOT, row.segment, row.sha256)
+
+
+def fold_event(e: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Segment line as a fold input (id, event_ts datetime, event_type, payload).
+    """
+    return {
+        "id": e["id"],
+        "event_ts": datetime.fromisoformat(e["event_ts"]),
+        "event_type": e["event_type"],
+        "payload": e.get("payload") or {},
+    }
+
+
+def event_key(e: Dict[str, Any]) -> Tuple[datetime, UUID]:
+    """
+    (event_ts, id) fold order for hot dicts, decoded and raw segment lines alike.
+    """
+    ts, event_id = e["event_ts"], e["id"]
+    return (
+        ts if isinstance(ts, datetime) else datetime.fromisoformat(ts),
+        event_id if isinstance(event_id, UUID) else UUID(str(event_id)),
+    )
+
+
+def merge_events(*streams: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Segment events and the case's hot rows as one list in fold order.
+    """
+    return sorted(chain(*streams), key=event_key)
+
+
+def as_utc(dt: datetime) -> datetime:
+    """
+    Naive datetimes are taken as UTC (segment timestamps are always aware).
+    """
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def lines_asof(lines: Iterable[Dict[str, Any]], asof: datetime) -> List[Dict[str, Any]]:
+    """
+    Segment lines with event_ts <= asof.
+    """
+    asof = as_utc(asof)
+    return [e for e in lines if datetime.fromisoformat(e["event_ts"]) <= asof]
+
+
+async def archived_fold_events(db: AsyncSession, case_id: UUID, asof: datetime) -> Optional[List[Dict[str, Any]]]:
+    """
+    Fold inputs of an archived case up to `asof`, or None if the case is not archived.
+    """
+    lines = await archived_events(db, case_id)
+    if lines is None:
+        return None
+    return [fold_event(e) for e in lines_asof(lines, asof)]
+
+
+# ---------------------------------------------------------------------
+# Job
+# ---------------------------------------------------------------------
+
+
+def archive_case(db: Session, root: str, case_id: UUID, closed_at: datetime) -> Dict[str, Any]:
+    events = (
+        db.execute(
+            select(DecisionEvent)
+            .where(
+                DecisionEvent.case_id == case_id,
+                DecisionEvent.status == "FINAL",
+                DecisionEvent.event_type.not_in(HOT_EVENT_TYPES),
+            )
+            .order_by(DecisionEvent.event_ts.asc(), DecisionEvent.id.asc())
+        )
+        .scalars()
+        .all()
+    )
+    lines = [encode_event(e) for e in events]
+    rel = segment_name(case_id, closed_at)
+    sha256 = write_segment(root, rel, lines)
+    if len(read_segment(root, rel, sha256)) != len(lines):
+        raise RuntimeError(f"archive segment {rel} is incomplete")
+
+    db.add(
+        ArchivedCase(
+            case_id=case_id,
+            segment=rel,
+            sha256=sha256,
+            event_count=len(lines),
+            first_event_ts=events[0].event_ts if events else None,
+            last_event_ts=events[-1].event_ts if events else None,
+        )
+    )
+    db.execute(
+        delete(ThesisSnapshot).where(ThesisSnapshot.case_id == case_id, ThesisSnapshot.model == CHECKPOINT_MODEL)
+    )
+    # Only the rows written to the segment: HOT_EVENT_TYPES and a concurrent late insert stay hot.
+    ids = [e.id for e in events]
+    if ids:
+        db.execute(
+            delete(DecisionEvent)
+            .where(DecisionEvent.case_id == case_id, DecisionEvent.id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+    db.commit()
+    return {"case_id": str(case_id), "segment": rel, "events": len(lines)}
+
+
+def archive_closed_cases(db: Session, *, root: str, older_than_days: int, limit: int) -> Dict[str, Any]:
+    """
+    Archive up to `limit` cases closed more than `older_than_days` ago, oldest first.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+    cases = db.execute(CANDIDATES_SQL, {"cutoff": cutoff, "limit": limit}).all()
+    db.rollback()
+    archived: List[Dict[str, Any]] = []
+    for c in cases:
+        archived.append(archive_case(db, root, c.id, c.closed_at))
+    return {"cases": len(archived), "events": sum(a["events"] for a in archived), "archived": archived}
+
+
+def restore_case(db: Session, root: str, case_id: UUID) -> Dict[str, Any]:
+    """
+    Move an archived case's events back into decision_events (the segment file is kept).
+    """
+    ac = db.get(ArchivedCase, case_id)
+    if ac is None:
+        raise ValueError(f"case {case_id} is not archived")
+    rows = [decode_event(e) for e in read_segment(root, ac.segment, ac.sha256)]
+    ensure_partitions([r["event_ts"] for r in rows])
+    if rows:
+        db.execute(DecisionEvent.__table__.insert(), rows)
+    db.delete(ac)
+    db.commit()
+    return {"case_id": str(case_id), "events": len(rows)}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    import argparse
+
+    from app.db.session import SessionLocal
+
+    ap = argparse.ArgumentParser(description="Move FINAL events of long-closed cases to gzip JSONL segments")
+    sub = ap.add_subparsers(dest="command", required=True)
+    run = sub.add_parser("run")
+    run.add_argument("--older-than-days", type=int, default=settings.ARCHIVE_AFTER_DAYS)
+    run.add_argument("--limit", type=int, default=500)
+    restore = sub.add_parser("restore")
+    restore.add_argument("case_id", type=UUID)
+    ap.add_argument("--root", default=settings.ARCHIVE_ROOT)
+    args = ap.parse_args(argv)
+
+    db: Session = SessionLocal()
+    try:
+        if args.command == "run":
+            out = archive_closed_cases(db, root=args.root, older_than_days=args.older_than_days, limit=args.limit)
+        else:
+            out = restore_case(db, args.root, args.case_id)
+    finally:
+        db.close()
+    print(json.dumps(out, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+# app/services/book_risk.py
+"""
+Deterministic risk facts for a book's open cases (facts, not forecasts).
+
+Inputs: signed weights from the exposure fold (app/services/exposure.py) and
+the ret_1d matrix of those tickers over the last `lookback` trading days,
+pulled from market_prices_daily in one query. Everything else is NumPy:
+
+- covariance / correlation: centred X^T X on the T x N return matrix
+- realized vol of the weighted book: sqrt(w' S w), daily and annualized (x sqrt(252))
+- variance contributions: w_i (S w)_i / (w' S w), top contributors by |share|
+- Herfindahl concentration on |w| / sum|w|, effective N = 1 / HHI
+
+Missing returns inside the window are filled with the ticker's window mean;
+tickers with fewer than MIN_OBS_FRACTION of the window are reported as
+`insufficient_history` and left out of the matrix (but kept in HHI).
+
+Results are cached per worker by (book, asof day, lookback), validated
+against the current weights, and dropped when the price cache invalidates.
+"""
+from __future__ import annotations
+
+import copy
+import hashlib
+import math
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.price_cache import price_cache
+
+TRADING_DAYS = 252
+MIN_OBS_FRACTION = 0.5
+CACHE_MAX_ITEMS = 256
+
+RETURNS_SQL = text(
+    """
+    WITH window_days AS (
+        SELECT DISTINCT date
+        FROM market_prices_daily
+        WHERE ticker = ANY(CAST(:tickers AS text[])) AND date <= :asof
+        ORDER BY date DESC
+        LIMIT :lookback
+    )
+    SELECT m.ticker, m.date, m.ret_1d::float8 AS ret_1d
+    FROM market_prices_daily m
+    JOIN window_days d ON d.date = m.date
+    WHERE m.ticker = ANY(CAST(:tickers AS text[]))
+    """
+)
+
+
+class RiskCache:
+    """
+    Small thread-safe LRU of (book, asof, lookback) -> (weights hash, result).
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Tuple[str, date, int], Tuple[str, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, date, int], fingerprint: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            hit = self._data.get(key)
+            if hit is None or hit[0] != fingerprint:
+                return None
+            self._data.move_to_end(key)
+            return copy.deepcopy(hit[1])
+
+    def put(self, key: Tuple[str, date, int], fingerprint: str, value: Dict[str, Any]) -> None:
+        with self._lock:
+            self._data[key] = (fingerprint, copy.deepcopy(value))
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+risk_cache = RiskCache(CACHE_MAX_ITEMS)
+price_cache.on_invalidate.append(lambda _tickers: risk_cache.clear())
+price_cache.on_clear.append(risk_cache.clear)
+
+
+def weights_fingerprint(weights: Dict[str, float]) -> str:
+    raw = ";".join(f"{t}={w:.10g}" for t, w in sorted(weights.items()))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def return_matrix(rows: Sequence[Any], tickers: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    T x N ret_1d matrix (NaN where missing) and the sorted window dates.
+    """
+    days = np.unique(np.asarray([r.date for r in rows], dtype="datetime64[D]"))
+    col = {t: j for j, t in enumerate(tickers)}
+    X = np.full((days.shape[0], len(tickers)), np.nan)
+    if not rows:
+        return X, days
+    ri = np.searchsorted(days, np.asarray([r.date for r in rows], dtype="datetime64[D]"))
+    ci = np.asarray([col[r.ticker] for r in rows])
+    v = np.asarray([r.ret_1d if r.ret_1d is not None else np.nan for r in rows], dtype=np.float64)
+    X[ri, ci] = v
+    return X, days
+
+
+def _round(x: float, nd: int = 10) -> Optional[float]:
+    return None if x is None or not math.isfinite(x) else round(float(x), nd)
+
+
+def risk_facts(
+    weights: Dict[str, float],
+    X: np.ndarray,
+    tickers: List[str],
+    *,
+    top: int = 10,
+    include_corr: bool = False,
+) -> Dict[str, Any]:
+    """
+    Pure computation from weights (fraction of NAV, signed) and the T x N return matrix.
+    """
+    w_all = np.asarray([weights[t] for t in tickers], dtype=np.float64)
+    T = X.shape[0]
+
+    abs_w = np.abs(w_all)
+    total = abs_w.sum()
+    hhi = float(((abs_w / total) ** 2).sum()) if total > 0 else None
+
+    obs = (~np.isnan(X)).sum(axis=0) if T else np.zeros(len(tickers), dtype=int)
+    keep = obs >= max(2, math.ceil(MIN_OBS_FRACTION * T))
+    names = [t for t, k in zip(tickers, keep) if k]
+    insufficient = [t for t, k in zip(tickers, keep) if not k]
+
+    out: Dict[str, Any] = {
+        "names": len(tickers),
+        "window_days": int(T),
+        "herfindahl": _round(hhi) if hhi is not None else None,
+        "effective_n": _round(1.0 / hhi) if hhi else None,
+        "realized_vol_daily": None,
+        "realized_vol_annual": None,
+        "avg_pairwise_corr": None,
+        "top_contributors": [],
+        "insufficient_history": insufficient,
+    }
+    if not names or T < 2:
+        return out
+
+    Xk = X[:, keep]
+    w = w_all[keep]
+    mean = np.nanmean(Xk, axis=0)
+    Xk = np.where(np.isnan(Xk), mean, Xk)
+    D = Xk - Xk.mean(axis=0)
+    cov = (D.T @ D) / (T - 1)
+
+    sw = cov @ w
+    var = float(w @ sw)
+    vol = math.sqrt(var) if var > 0 else 0.0
+    out["realized_vol_daily"] = _round(vol)
+    out["realized_vol_annual"] = _round(vol * math.sqrt(TRADING_DAYS))
+
+    if var > 0:
+        share = w * sw / var
+        order = np.argsort(-np.abs(share))[:top]
+        out["top_contributors"] = [
+            {"ticker": names[i], "weight": _round(w[i]), "variance_share": _round(share[i])} for i in order
+        ]
+
+    sd = np.sqrt(np.diag(cov))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = cov / np.outer(sd, sd)
+    corr[~np.isfinite(corr)] = np.nan
+    n = len(names)
+    if n > 1:
+        iu = np.triu_indices(n, k=1)
+        out["avg_pairwise_corr"] = _round(float(np.nanmean(corr[iu])))
+    if include_corr:
+        out["corr"] = {
+            "tickers": names,
+            "matrix": [[_round(x, 6) for x in row] for row in corr.tolist()],
+        }
+    return out
+
+
+async def book_risk(
+    db: AsyncSession,
+    book: str,
+    asof: date,
+    positions: Dict[str, float],
+    *,
+    lookback: int,
+    top: int = 10,
+    include_corr: bool = False,
+) -> Dict[str, Any]:
+    """
+    Risk facts for signed weights `positions` (percent of NAV, per ticker) as of `asof`.
+    """
+    weights = {t: pct / 100.0 for t, pct in positions.items() if pct}
+    key = (book, asof, lookback)
+    fingerprint = weights_fingerprint(weights) + f":{top}:{int(include_corr)}"
+    hit = risk_cache.get(key, fingerprint)
+    if hit is not None:
+        return hit
+
+    tickers = sorted(weights)
+    rows = []
+    if tickers:
+        rows = (await db.execute(RETURNS_SQL, {"tickers": tickers, "asof": asof, "lookback": lookback})).all()
+    X, days = return_matrix(rows, tickers)
+    out = risk_facts(weights, X, tickers, top=top, include_corr=include_corr)
+    out["window_start"] = str(days[0]) if days.size else None
+    out["window_end"] = str(days[-1]) if days.size else None
+
+    risk_cache.put(key, fingerprint, out)
+    return out
@@ -0,0 +1,223 @@
+# app/services/event_facts.py
+"""
+event_market_facts: forward returns after every FINAL decision event.
+
+For each ticker, all candidate events are merged as-of against the daily
+price series in one np.searchsorted call (base = last bar on or before the
+event date), and ret_{h}d = px[base + h] / px[base] - 1 for h in HORIZONS,
+signed by the direction of the case's INITIATE as of the event.
+
+Incremental:
+- new FINAL events have no row yet -> computed on finalize/insert
+- rows whose horizons are not all filled yet (`complete = false`) are
+  recomputed when ingestion lands new bars for the ticker
+- recompute=True rewrites every row in scope (full reloads, restatements,
+  a new INITIATE that changes the direction of a case)
+"""
+from __future__ import annotations
+
+import math
+from collections import defaultdict
+from datetime import timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.models.event_market_facts import EventMarketFact
+from app.services.price_cache import day_number
+from app.services.price_store import get_price_store
+
+HORIZONS = (1, 5, 20, 60)
+UPSERT_CHUNK = 1000
+
+SIGNS = {"LONG": 1, "SHORT": -1}
+
+CANDIDATES_SQL = text(
+    """
+    SELECT e.id, e.case_id, c.ticker, e.event_type, e.event_ts, ini.direction
+    FROM decision_events e
+    JOIN trade_cases c ON c.id = e.case_id
+    LEFT JOIN event_market_facts f ON f.event_id = e.id
+    LEFT JOIN LATERAL (
+        SELECT i.direction
+        FROM decision_events i
+        WHERE i.case_id = e.case_id
+          AND i.status = 'FINAL'
+          AND i.event_type = 'INITIATE'
+          AND i.event_ts <= e.event_ts
+        ORDER BY i.event_ts DESC, i.id DESC
+        LIMIT 1
+    ) ini ON true
+    WHERE e.status = 'FINAL'
+      AND (:recompute OR f.event_id IS NULL OR NOT f.complete)
+      AND (CAST(:tickers AS text[]) IS NULL OR c.ticker = ANY(CAST(:tickers AS text[])))
+      AND (CAST(:event_ids AS uuid[]) IS NULL OR e.id = ANY(CAST(:event_ids AS uuid[])))
+      AND (CAST(:case_ids AS uuid[]) IS NULL OR e.case_id = ANY(CAST(:case_ids AS uuid[])))
+    """
+)
+
+PRICES_SQL = text(
+    """
+    SELECT ticker, date, COALESCE(adj_close, close) AS px
+    FROM market_prices_daily
+    WHERE ticker = ANY(CAST(:tickers AS text[]))
+      AND COALESCE(adj_close, close) IS NOT NULL
+    ORDER BY ticker, date
+    """
+)
+
+
+def forward_returns(
+    px_days: np.ndarray,
+    px: np.ndarray,
+    ev_days: np.ndarray,
+    horizons: Sequence[int] = HORIZONS,
+) -> Tuple[np.ndarray, Dict[int, np.ndarray]]:
+    """
+    Vectorized merge-as-of: base index per event (-1 if the event predates the
+    series) and forward simple returns per horizon (NaN where not yet available).
+    """
+    base = np.searchsorted(px_days, ev_days, side="right") - 1
+    n = px.shape[0]
+    out: Dict[int, np.ndarray] = {}
+    for h in horizons:
+        fwd = base + h
+        ok = (base >= 0) & (fwd < n)
+        r = np.full(base.shape, np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r[ok] = px[fwd[ok]] / px[base[ok]] - 1.0
+        r[~np.isfinite(r)] = np.nan
+        out[h] = r
+    return base, out
+
+
+def load_prices(db: Session, tickers: List[str]) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """
+    (datetime64[D] dates, adjusted-or-raw close) per ticker, NULL closes dropped.
+    Read from the memory-mapped price store where exported, Postgres otherwise.
+    """
+    out: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+    store = get_price_store()
+    if store is not None:
+        for t in tickers:
+            cols = store.columns(t)
+            if cols is None:
+                continue
+            px = np.where(np.isnan(cols["adj_close"]), cols["close"], cols["adj_close"])
+            ok = ~np.isnan(px)
+            out[t] = (cols["days"][ok].astype("datetime64[D]"), px[ok])
+
+    missing = [t for t in tickers if t not in out]
+    if missing:
+        series: Dict[str, Tuple[List[int], List[float]]] = defaultdict(lambda: ([], []))
+        for t, d, px in db.execute(PRICES_SQL, {"tickers": missing}):
+            ds, ps = series[t]
+            ds.append(day_number(d))
+            ps.append(float(px))
+        for t in missing:
+            ds, ps = series.get(t, ([], []))
+            out[t] = (np.asarray(ds, dtype=np.int32).astype("datetime64[D]"), np.asarray(ps, dtype=np.float64))
+    return out
+
+
+def _num(x: float) -> Optional[float]:
+    return None if math.isnan(x) else float(x)
+
+
+def _ids(values: Optional[Sequence[Any]]) -> Optional[List[str]]:
+    return [str(v) for v in values] if values is not None else None
+
+
+def fact_rows(events: List[Any], px_days: np.ndarray, px: np.ndarray) -> List[Dict[str, Any]]:
+    """
+    event_market_facts rows for one ticker's candidate events.
+    """
+    ev_days = np.asarray(
+        [e.event_ts.astimezone(timezone.utc).date() for e in events], dtype="datetime64[D]"
+    )
+    base, rets = forward_returns(px_days, px, ev_days)
+
+    rows: List[Dict[str, Any]] = []
+    for k, e in enumerate(events):
+        b = int(base[k])
+        sign = SIGNS.get(str(e.direction or "").upper())
+        row: Dict[str, Any] = {
+            "event_id": e.id,
+            "case_id": e.case_id,
+            "ticker": e.ticker,
+            "event_type": e.event_type,
+            "event_ts": e.event_ts,
+            "direction": e.direction,
+            "sign": sign,
+            "base_date": px_days[b].item() if b >= 0 else None,
+            "base_close": float(px[b]) if b >= 0 else None,
+        }
+        complete = True
+        for h in HORIZONS:
+            r = _num(rets[h][k])
+            complete = complete and r is not None
+            row[f"ret_{h}d"] = r
+            row[f"signed_ret_{h}d"] = r * sign if r is not None and sign is not None else None
+        row["complete"] = complete
+        rows.append(row)
+    return rows
+
+
+def upsert_facts(db: Session, rows: List[Dict[str, Any]]) -> None:
+    stmt = pg_insert(EventMarketFact)
+    cols = [c.name for c in EventMarketFact.__table__.columns if c.name not in ("event_id", "computed_at")]
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[EventMarketFact.event_id],
+        set_={**{c: stmt.excluded[c] for c in cols}, "computed_at": text("now()")},
+    )
+    for start in range(0, len(rows), UPSERT_CHUNK):
+        db.execute(stmt, rows[start : start + UPSERT_CHUNK])
+
+
+def refresh_event_market_facts(
+    *,
+    event_ids: Optional[Sequence[UUID]] = None,
+    case_ids: Optional[Sequence[UUID]] = None,
+    tickers: Optional[Sequence[str]] = None,
+    recompute: bool = False,
+) -> Dict[str, int]:
+    """
+    Compute facts for FINAL events in scope that have no row yet or are incomplete
+    (every row in scope with recompute=True). Runs on its own session so it can be
+    scheduled as a BackgroundTask or called from ingestion.
+    """
+    db: Session = SessionLocal()
+    try:
+        events = db.execute(
+            CANDIDATES_SQL,
+            {
+                "recompute": recompute,
+                "tickers": [t.upper() for t in tickers] if tickers is not None else None,
+                "event_ids": _ids(event_ids),
+                "case_ids": _ids(case_ids),
+            },
+        ).all()
+        if not events:
+            return {"events": 0, "complete": 0}
+
+        by_ticker: Dict[str, List[Any]] = defaultdict(list)
+        for e in events:
+            by_ticker[e.ticker].append(e)
+
+        prices = load_prices(db, list(by_ticker))
+
+        rows: List[Dict[str, Any]] = []
+        for t, evs in by_ticker.items():
+            px_days, px = prices[t]
+            rows.extend(fact_rows(evs, px_days, px))
+
+        upsert_facts(db, rows)
+        db.commit()
+        return {"events": len(rows), "complete": sum(1 for r in rows if r["complete"])}
+    finally:
+        db.close()
@@ -0,0 +1,208 @@
+# app/services/exposure.py
+"""
+Book exposure from the decision journal (no fills/positions table).
+
+A case's position as of T is the `to_pct` of its latest FINAL RESIZE at or
+before T, or its INITIATE `position_intent_pct` if the INITIATE is newer
+(or there is no RESIZE). Direction comes from the latest FINAL INITIATE.
+A case counts while open at T: opened_at <= T and (closed_at is null or > T).
+Payload fields are read from decision_events' generated columns (0009).
+
+Totals (percent of NAV): long, short (positive number), gross = long + short,
+net = long - short. Positions without an INITIATE direction are reported as
+`unsigned` and left out of the totals.
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import text
+
+SIGNS = {"LONG": 1, "SHORT": -1}
+
+# Latest INITIATE / RESIZE per open case via DISTINCT ON (case_id).
+EXPOSURE_SQL = text(
+    """
+    WITH open_cases AS (
+        SELECT id, ticker
+        FROM trade_cases
+        WHERE book = :book
+          AND opened_at <= :asof
+          AND (closed_at IS NULL OR closed_at > :asof)
+    ),
+    last_resize AS (
+        SELECT DISTINCT ON (e.case_id)
+               e.case_id, e.event_ts, e.to_pct AS pct
+        FROM decision_events e
+        JOIN open_cases c ON c.id = e.case_id
+        WHERE e.status = 'FINAL' AND e.event_type = 'RESIZE' AND e.event_ts <= :asof
+        ORDER BY e.case_id, e.event_ts DESC, e.id DESC
+    ),
+    last_initiate AS (
+        SELECT DISTINCT ON (e.case_id)
+               e.case_id, e.event_ts, e.direction, e.position_intent_pct AS pct
+        FROM decision_events e
+        JOIN open_cases c ON c.id = e.case_id
+        WHERE e.status = 'FINAL' AND e.event_type = 'INITIATE' AND e.event_ts <= :asof
+        ORDER BY e.case_id, e.event_ts DESC, e.id DESC
+    )
+    SELECT c.id AS case_id, c.ticker, i.direction,
+           CASE
+               WHEN r.case_id IS NOT NULL AND (i.case_id IS NULL OR r.event_ts >= i.event_ts) THEN r.pct
+               ELSE i.pct
+           END AS pct
+    FROM open_cases c
+    LEFT JOIN last_resize r ON r.case_id = c.id
+    LEFT JOIN last_initiate i ON i.case_id = c.id
+    ORDER BY c.ticker, c.id
+    """
+)
+
+# Everything the daily sweep needs, in two result sets.
+SERIES_CASES_SQL = text(
+    """
+    SELECT id, ticker, opened_at, closed_at
+    FROM trade_cases
+    WHERE book = :book
+      AND opened_at < :until
+      AND (closed_at IS NULL OR closed_at > :since)
+    """
+)
+
+SERIES_EVENTS_SQL = text(
+    """
+    SELECT e.case_id, e.event_ts, e.event_type, e.direction,
+           COALESCE(e.to_pct, e.position_intent_pct) AS pct
+    FROM decision_events e
+    JOIN trade_cases c ON c.id = e.case_id
+    WHERE c.book = :book
+      AND c.opened_at < :until
+      AND (c.closed_at IS NULL OR c.closed_at > :since)
+      AND e.status = 'FINAL'
+      AND e.event_type IN ('INITIATE', 'RESIZE')
+      AND e.event_ts < :until
+    ORDER BY e.event_ts, e.id
+    """
+)
+
+
+def empty_totals() -> Dict[str, float]:
+    return {"gross": 0.0, "net": 0.0, "long": 0.0, "short": 0.0}
+
+
+def exposure_from_positions(rows: Sequence[Any]) -> Dict[str, Any]:
+    """
+    Totals and per-ticker signed weights from (case_id, ticker, direction, pct) rows.
+    """
+    totals = empty_totals()
+    weights: Dict[str, float] = {}
+    positions: List[Dict[str, Any]] = []
+    unsigned: List[Dict[str, Any]] = []
+
+    for r in rows:
+        pct = float(r.pct) if r.pct is not None else 0.0
+        sign = SIGNS.get(str(r.direction or "").upper())
+        pos = {"case_id": r.case_id, "ticker": r.ticker, "direction": r.direction, "pct": pct}
+        if sign is None:
+            unsigned.append(pos)
+            continue
+        positions.append(pos)
+        if sign > 0:
+            totals["long"] += pct
+        else:
+            totals["short"] += pct
+        weights[r.ticker] = weights.get(r.ticker, 0.0) + sign * pct
+
+    totals["gross"] = totals["long"] + totals["short"]
+    totals["net"] = totals["long"] - totals["short"]
+    return {
+        **totals,
+        "weights": [{"ticker": t, "weight": w} for t, w in sorted(weights.items())],
+        "positions": positions,
+        "unsigned": unsigned,
+    }
+
+
+def day_end(d: date) -> datetime:
+    """
+    Exclusive upper bound for day `d` (UTC): events strictly before the next midnight count.
+    """
+    return datetime.combine(d + timedelta(days=1), time.min, tzinfo=timezone.utc)
+
+
+def exposure_series(
+    cases: Sequence[Any],
+    events: Sequence[Any],
+    start: date,
+    end: date,
+) -> List[Dict[str, Any]]:
+    """
+    Daily totals for start..end (inclusive) in one forward sweep.
+
+    Case opens/closes and INITIATE/RESIZE events are merged into one ordered
+    stream; long/short sums are updated by each case's change in contribution,
+    so each day costs only the events that land on it.
+    """
+    # (ts, order, kind, case_id, direction, pct); closes before events before opens at equal ts.
+    stream: List[Tuple[datetime, int, str, UUID, Optional[str], Optional[float]]] = []
+    for c in cases:
+        stream.append((c.opened_at, 2, "open", c.id, None, None))
+        if c.closed_at is not None:
+            stream.append((c.closed_at, 0, "close", c.id, None, None))
+    for e in events:
+        stream.append((e.event_ts, 1, e.event_type, e.case_id, e.direction, e.pct))
+    stream.sort(key=lambda x: (x[0], x[1]))
+
+    is_open: Dict[UUID, bool] = {}
+    direction: Dict[UUID, Optional[str]] = {}
+    pct: Dict[UUID, float] = {}
+    sums = {"long": 0.0, "short": 0.0}
+    n_positions = 0
+
+    def contribution(cid: UUID) -> Tuple[Optional[str], float]:
+        sign = SIGNS.get(str(direction.get(cid) or "").upper())
+        if not is_open.get(cid) or sign is None:
+            return None, 0.0
+        return ("long" if sign > 0 else "short"), pct.get(cid, 0.0)
+
+    out: List[Dict[str, Any]] = []
+    i = 0
+    d = start
+    while d <= end:
+        bound = day_end(d)
+        while i < len(stream) and stream[i][0] < bound:
+            ts, _, kind, cid, dirn, value = stream[i]
+            i += 1
+            old_side, old_pct = contribution(cid)
+            if kind == "open":
+                is_open[cid] = True
+            elif kind == "close":
+                is_open[cid] = False
+            elif kind == "INITIATE":
+                direction[cid] = dirn
+                pct[cid] = float(value) if value is not None else 0.0
+            else:  # RESIZE
+                pct[cid] = float(value) if value is not None else 0.0
+            new_side, new_pct = contribution(cid)
+            if old_side:
+                sums[old_side] -= old_pct
+                n_positions -= 1
+            if new_side:
+                sums[new_side] += new_pct
+                n_positions += 1
+
+        long_, short = sums["long"], sums["short"]
+        out.append(
+            {
+                "date": d.isoformat(),
+                "gross": long_ + short,
+                "net": long_ - short,
+                "long": long_,
+                "short": short,
+                "positions": n_positions,
+            }
+        )
+        d += timedelta(days=1)
+    return out
@@ -0,0 +1,714 @@
+# app/services/market_data.py
+"""
+Daily price ingestion into market_prices_daily.
+
+    source.fetch(ticker)  ->  Bars (NumPy arrays, one per column)
+    rolling_stats(Bars)   ->  ret_1d, vol_20d over whole arrays
+    copy_upsert(csv)      ->  COPY into a temp staging table, then
+                              INSERT ... ON CONFLICT (ticker, date) DO UPDATE
+
+Sources are pluggable: YahooSource (yfinance, optional) for production and
+FileSource (one CSV/Parquet per ticker) for offline fixtures. Downloads run
+in a thread pool; upserts are flushed every `flush_tickers` tickers so memory
+stays bounded for 5,000 tickers x 20 years.
+
+A full load with `start` also fetches WARMUP_DAYS before it, so the first
+written bars get their ret_1d / vol_20d instead of NULLs that would
+overwrite the stored stats; the warm-up bars themselves are not written.
+
+Incremental mode (daily runs) loads only the trailing VOL_WINDOW + 1 stored
+bars per ticker, fetches from the first of them, and rolls ret_1d / vol_20d
+forward with running sums, writing only the new rows. If the overlapping bars
+disagree with what is stored (vendor restatement, missing/extra days), the
+ticker gets a bounded recompute over the last RESTATE_LOOKBACK_DAYS instead.
+
+CLI:
+    python -m app.services.market_data AAPL MSFT --start 2005-01-01
+    python -m app.services.market_data --tickers-file universe.txt --incremental
+    python -m app.services.market_data --tickers-file universe.txt --source file --root data/prices
+"""
+from __future__ import annotations
+
+import csv
+import io
+import logging
+import math
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Protocol, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import text
+
+from app.db.session import SessionLocal, engine
+from app.services.event_facts import refresh_event_market_facts
+from app.services.price_cache import NOTIFY_CHANNEL, price_cache
+from app.services.price_store import get_price_store
+
+log = logging.getLogger(__name__)
+
+VOL_WINDOW = 20
+FLUSH_TICKERS = 200
+DEFAULT_WORKERS = 16
+RESTATE_LOOKBACK_DAYS = 400  # calendar days refetched when stored history was restated
+WARMUP_DAYS = 60             # calendar days fetched before `start` (> VOL_WINDOW + 1 bars), not written
+COPY_CHUNK = 1 << 20         # characters per COPY write under psycopg 3
+
+STAGE_TABLE = "market_prices_stage"
+COLUMNS = ("ticker", "date", "close", "adj_close", "volume", "ret_1d", "vol_20d", "source")
+
+
+@dataclass(frozen=True)
+class Bars:
+    """
+    Daily bars for one ticker, sorted by date, one NumPy array per column.
+    Missing values are NaN.
+    """
+
+    ticker: str
+    dates: np.ndarray      # datetime64[D]
+    close: np.ndarray      # float64
+    adj_close: np.ndarray  # float64
+    volume: np.ndarray     # float64 (NaN-able)
+
+    def __len__(self) -> int:
+        return int(self.dates.shape[0])
+
+
+def make_bars(ticker: str, dates: Sequence[Any], close: Sequence[Any], adj_close: Optional[Sequence[Any]], volume: Optional[Sequence[Any]]) -> Bars:
+    """
+    Normalize raw columns: datetime64[D], float64, sorted by date, duplicate dates dropped (last wins).
+    """
+    d = np.asarray(dates, dtype="datetime64[D]")
+    c = np.asarray(close, dtype=np.float64)
+    a = np.asarray(adj_close, dtype=np.float64) if adj_close is not None else c.copy()
+    v = np.asarray(volume, dtype=np.float64) if volume is not None else np.full(c.shape, np.nan)
+
+    order = np.argsort(d, kind="stable")
+    d, c, a, v = d[order], c[order], a[order], v[order]
+    if d.size:
+        keep = np.ones(d.shape, dtype=bool)
+        keep[:-1] = d[1:] != d[:-1]
+        d, c, a, v = d[keep], c[keep], a[keep], v[keep]
+    return Bars(ticker=ticker.upper(), dates=d, close=c, adj_close=a, volume=v)
+
+
+# ---------------------------------------------------------------------
+# Sources
+# ---------------------------------------------------------------------
+
+
+class PriceSource(Protocol):
+    name: str
+
+    def fetch(self, ticker: str, start: Optional[date], end: Optional[date]) -> Optional[Bars]:
+        ...
+
+
+class YahooSource:
+    """
+    yfinance download (optional dependency, imported lazily).
+    """
+
+    name = "yahoo"
+
+    def fetch(self, ticker: str, start: Optional[date], end: Optional[date]) -> Optional[Bars]:
+        try:
+            import yfinance as yf
+        except ImportError as e:
+            raise RuntimeError("yfinance is not installed (pip install yfinance) or use --source file") from e
+
+        df = yf.download(
+            ticker,
+            start=start.isoformat() if start else None,
+            end=end.isoformat() if end else None,
+            auto_adjust=False,
+            progress=False,
+            threads=False,
+        )
+        if df is None or df.empty:
+            return None
+        if getattr(df.columns, "nlevels", 1) > 1:
+            df.columns = df.columns.get_level_values(0)
+        return make_bars(
+            ticker,
+            df.index.values,
+            df["Close"].to_numpy(),
+            df["Adj Close"].to_numpy() if "Adj Close" in df.columns else None,
+            df["Volume"].to_numpy() if "Volume" in df.columns else None,
+        )
+
+
+# Header aliases for file fixtures (lower-cased, spaces -> underscores).
+_FILE_COLUMNS = {
+    "date": "date",
+    "close": "close",
+    "adj_close": "adj_close",
+    "adjclose": "adj_close",
+    "volume": "volume",
+}
+
+
+class FileSource:
+    """
+    Offline source: `{root}/{TICKER}.parquet` or `{root}/{TICKER}.csv` with
+    columns date, close[, adj_close][, volume]. Parquet needs pandas + pyarrow.
+    """
+
+    name = "file"
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+
+    def fetch(self, ticker: str, start: Optional[date], end: Optional[date]) -> Optional[Bars]:
+        t = ticker.upper()
+        parquet = os.path.join(self.root, f"{t}.parquet")
+        path = os.path.join(self.root, f"{t}.csv")
+        if os.path.exists(parquet):
+            cols = self._read_parquet(parquet)
+        elif os.path.exists(path):
+            cols = self._read_csv(path)
+        else:
+            return None
+
+        if "date" not in cols or "close" not in cols:
+            raise ValueError(f"{t}: file must have date and close columns")
+        bars = make_bars(t, cols["date"], cols["close"], cols.get("adj_close"), cols.get("volume"))
+        return clip_bars(bars, start, end)
+
+    @staticmethod
+    def _read_csv(path: str) -> Dict[str, List[Any]]:
+        with open(path, newline="") as f:
+            reader = csv.reader(f)
+            header = [_FILE_COLUMNS.get(h.strip().lower().replace(" ", "_")) for h in next(reader, [])]
+            cols: Dict[str, List[Any]] = {h: [] for h in header if h}
+            for row in reader:
+                for h, v in zip(header, row):
+                    if h:
+                        cols[h].append(v[:10] if h == "date" else (v or "nan"))
+        return cols
+
+    @staticmethod
+    def _read_parquet(path: str) -> Dict[str, Any]:
+        try:
+            import pandas as pd
+        except ImportError as e:
+            raise RuntimeError("Parquet fixtures need pandas + pyarrow") from e
+        df = pd.read_parquet(path)
+        out: Dict[str, Any] = {}
+        for c in df.columns:
+            h = _FILE_COLUMNS.get(str(c).strip().lower().replace(" ", "_"))
+            if h:
+                out[h] = df[c].to_numpy()
+        return out
+
+
+def clip_bars(bars: Bars, start: Optional[date], end: Optional[date]) -> Bars:
+    """
+    Bars with start <= date < end (yfinance end semantics).
+    """
+    keep = np.ones(bars.dates.shape, dtype=bool)
+    if start is not None:
+        keep &= bars.dates >= np.datetime64(start, "D")
+    if end is not None:
+        keep &= bars.dates < np.datetime64(end, "D")
+    if keep.all():
+        return bars
+    return Bars(bars.ticker, bars.dates[keep], bars.close[keep], bars.adj_close[keep], bars.volume[keep])
+
+
+def get_source(name: str, *, root: Optional[str] = None) -> PriceSource:
+    if name == YahooSource.name:
+        return YahooSource()
+    if name == FileSource.name:
+        if not root:
+            raise ValueError("file source needs a root directory")
+        return FileSource(root)
+    raise ValueError(f"Unknown price source: {name}")
+
+
+# ---------------------------------------------------------------------
+# Rolling statistics (whole-array, no per-row Python)
+# ---------------------------------------------------------------------
+
+
+def rolling_stats(prices: np.ndarray, window: int = VOL_WINDOW) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    ret_1d: simple daily return; NaN on the first bar.
+    vol_20d: sample stdev (ddof=1) of the last `window` returns, daily (not annualized);
+             NaN until `window` returns exist or if any return in the window is NaN.
+    """
+    n = prices.shape[0]
+    ret = np.full(n, np.nan)
+    vol = np.full(n, np.nan)
+    if n < 2:
+        return ret, vol
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ret[1:] = prices[1:] / prices[:-1] - 1.0
+    ret[~np.isfinite(ret)] = np.nan
+
+    if n - 1 < window:
+        return ret, vol
+
+    r = ret[1:]
+    bad = np.isnan(r)
+    rz = np.where(bad, 0.0, r)
+    # Running sums over prefixes; window sums are differences.
+    s1 = np.concatenate(([0.0], np.cumsum(rz)))
+    s2 = np.concatenate(([0.0], np.cumsum(rz * rz)))
+    nb = np.concatenate(([0], np.cumsum(bad)))
+    w1 = s1[window:] - s1[:-window]
+    w2 = s2[window:] - s2[:-window]
+    wbad = nb[window:] - nb[:-window]
+
+    var = (w2 - w1 * w1 / window) / (window - 1)
+    v = np.sqrt(np.maximum(var, 0.0))
+    v[wbad > 0] = np.nan
+    # Window ending at return index k (k >= window-1) belongs to bar k+1.
+    vol[window:] = v
+    return ret, vol
+
+
+class RollingWindow:
+    """
+    Running sum / sum of squares over the last `size` returns (NaN-aware).
+    std() matches rolling_stats' vol_20d for the same window.
+    """
+
+    def __init__(self, size: int, seed: Iterable[float] = ()) -> None:
+        self.size = size
+        self._buf: "deque[Tuple[float, bool]]" = deque()
+        self.s1 = 0.0
+        self.s2 = 0.0
+        self.nbad = 0
+        for r in seed:
+            self.push(r)
+
+    def push(self, r: float) -> None:
+        bad = math.isnan(r)
+        x = 0.0 if bad else r
+        self._buf.append((x, bad))
+        self.s1 += x
+        self.s2 += x * x
+        self.nbad += bad
+        if len(self._buf) > self.size:
+            ox, obad = self._buf.popleft()
+            self.s1 -= ox
+            self.s2 -= ox * ox
+            self.nbad -= obad
+
+    def std(self) -> float:
+        if len(self._buf) < self.size or self.nbad:
+            return math.nan
+        var = (self.s2 - self.s1 * self.s1 / self.size) / (self.size - 1)
+        return math.sqrt(max(var, 0.0))
+
+
+def _ret(p: float, prev: float) -> float:
+    r = p / prev - 1.0 if prev else math.nan
+    return r if math.isfinite(r) else math.nan
+
+
+def roll_forward(tail_prices: np.ndarray, new_prices: np.ndarray, window: int = VOL_WINDOW) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    ret_1d / vol_20d for `new_prices`, continuing from the stored `tail_prices`
+    (the last window + 1 bars). O(new bars), independent of history length.
+    """
+    tail = tail_prices.tolist()
+    seed = [_ret(p, prev) for prev, p in zip(tail[:-1], tail[1:])]
+    w = RollingWindow(window, seed[-window:])
+
+    ret = np.full(new_prices.shape[0], np.nan)
+    vol = np.full(new_prices.shape[0], np.nan)
+    prev = tail[-1]
+    for i, p in enumerate(new_prices.tolist()):
+        r = _ret(p, prev)
+        w.push(r)
+        ret[i] = r
+        vol[i] = w.std()
+        prev = p
+    return ret, vol
+
+
+# ---------------------------------------------------------------------
+# Incremental mode
+# ---------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class Tail:
+    """
+    Last stored bars for one ticker (oldest first).
+    """
+
+    dates: np.ndarray      # datetime64[D]
+    adj_close: np.ndarray  # float64
+
+
+TAIL_SQL = text(
+    """
+    SELECT t.ticker, p.date, p.adj_close
+    FROM unnest(CAST(:tickers AS text[])) AS t(ticker)
+    CROSS JOIN LATERAL (
+        SELECT m.date, m.adj_close
+        FROM market_prices_daily m
+        WHERE m.ticker = t.ticker
+        ORDER BY m.date DESC
+        LIMIT :n
+    ) p
+    ORDER BY t.ticker, p.date
+    """
+)
+
+
+def load_tails(tickers: List[str], n: int = VOL_WINDOW + 1) -> Dict[str, Tail]:
+    """
+    Trailing `n` stored bars per ticker, one index-backed LATERAL query.
+    """
+    rows: Dict[str, Tuple[List[date], List[float]]] = {}
+    with engine.connect() as conn:
+        for ticker, d, adj in conn.execute(TAIL_SQL, {"tickers": tickers, "n": n}):
+            ds, ps = rows.setdefault(ticker, ([], []))
+            ds.append(d)
+            ps.append(float(adj) if adj is not None else math.nan)
+    return {
+        t: Tail(np.asarray(ds, dtype="datetime64[D]"), np.asarray(ps, dtype=np.float64))
+        for t, (ds, ps) in rows.items()
+    }
+
+
+def is_restated(bars: Bars, tail: Tail) -> bool:
+    """
+    True if the fetched bars over the stored tail's date range differ from it
+    (missing/extra days or changed adj_close beyond NUMERIC(18,6) rounding).
+    """
+    ov = bars.dates <= tail.dates[-1]
+    if not np.array_equal(bars.dates[ov], tail.dates):
+        return True
+    return not np.allclose(bars.adj_close[ov], tail.adj_close, rtol=1e-8, atol=1e-6, equal_nan=True)
+
+
+def incremental_rows(
+    source: "PriceSource",
+    ticker: str,
+    tail: Optional[Tail],
+    end: Optional[date],
+) -> Tuple[Optional[Bars], np.ndarray, np.ndarray, str]:
+    """
+    Rows to write for one ticker in incremental mode: (bars, ret_1d, vol_20d, mode).
+    mode is "full" (nothing usable stored), "append" or "restated".
+    """
+    if tail is None or len(tail.dates) < VOL_WINDOW + 1:
+        bars = source.fetch(ticker, None, end)
+        if bars is None or not len(bars):
+            return None, np.empty(0), np.empty(0), "full"
+        ret, vol = rolling_stats(bars.adj_close)
+        return bars, ret, vol, "full"
+
+    bars = source.fetch(ticker, tail.dates[0].item(), end)
+    if bars is None or not len(bars):
+        return None, np.empty(0), np.empty(0), "append"
+
+    if is_restated(bars, tail):
+        # Bounded recompute: refetch a fixed lookback and rewrite only rows whose
+        # stats are fully determined inside it (older restatements need a full load).
+        start = tail.dates[-1].item() - timedelta(days=RESTATE_LOOKBACK_DAYS)
+        bars = source.fetch(ticker, start, end)
+        if bars is None or len(bars) <= VOL_WINDOW:
+            return None, np.empty(0), np.empty(0), "restated"
+        ret, vol = rolling_stats(bars.adj_close)
+        return clip_rows(bars, ret, vol, VOL_WINDOW) + ("restated",)
+
+    new = bars.dates > tail.dates[-1]
+    if not new.any():
+        return None, np.empty(0), np.empty(0), "append"
+    new_bars = Bars(bars.ticker, bars.dates[new], bars.close[new], bars.adj_close[new], bars.volume[new])
+    ret, vol = roll_forward(tail.adj_close, new_bars.adj_close)
+    return new_bars, ret, vol, "append"
+
+
+def full_rows(
+    source: "PriceSource",
+    ticker: str,
+    start: Optional[date],
+    end: Optional[date],
+) -> Tuple[Optional[Bars], np.ndarray, np.ndarray, str]:
+    """
+    Rows to write for one ticker in full mode. With `start`, WARMUP_DAYS before
+    it are fetched for the rolling stats and dropped before writing.
+    """
+    bars = source.fetch(ticker, start - timedelta(days=WARMUP_DAYS) if start else None, end)
+    if bars is None or not len(bars):
+        return None, np.empty(0), np.empty(0), "full"
+    ret, vol = rolling_stats(bars.adj_close)
+    if start is not None:
+        bars, ret, vol = clip_rows(bars, ret, vol, int(np.searchsorted(bars.dates, np.datetime64(start, "D"))))
+        if not len(bars):
+            return None, np.empty(0), np.empty(0), "full"
+    return bars, ret, vol, "full"
+
+
+def clip_rows(bars: Bars, ret: np.ndarray, vol: np.ndarray, since: int) -> Tuple[Bars, np.ndarray, np.ndarray]:
+    sl = slice(since, None)
+    return (
+        Bars(bars.ticker, bars.dates[sl], bars.close[sl], bars.adj_close[sl], bars.volume[sl]),
+        ret[sl],
+        vol[sl],
+    )
+
+
+# ---------------------------------------------------------------------
+# COPY + upsert
+# ---------------------------------------------------------------------
+
+
+def _fmt(arr: np.ndarray, spec: str) -> np.ndarray:
+    """
+    Vectorized number -> CSV text; NaN -> '' (NULL under COPY csv).
+    """
+    out = np.char.mod(spec, np.nan_to_num(arr)).astype(object)
+    out[np.isnan(arr)] = ""
+    return out
+
+
+def bars_csv(bars: Bars, ret: np.ndarray, vol: np.ndarray, source: str, buf: io.StringIO, *, since: Optional[int] = None) -> int:
+    """
+    Append rows (optionally only rows[since:]) to `buf` in COPY csv format; returns row count.
+    """
+    sl = slice(since, None)
+    dates = np.datetime_as_string(bars.dates[sl], unit="D")
+    n = dates.shape[0]
+    if n == 0:
+        return 0
+    cols = (
+        [bars.ticker] * n,
+        dates,
+        _fmt(bars.close[sl], "%.6f"),
+        _fmt(bars.adj_close[sl], "%.6f"),
+        _fmt(bars.volume[sl], "%.0f"),
+        _fmt(ret[sl], "%.8f"),
+        _fmt(vol[sl], "%.8f"),
+        [source] * n,
+    )
+    buf.write("\n".join(",".join(row) for row in zip(*cols)))
+    buf.write("\n")
+    return n
+
+
+UPSERT_SQL = f"""
+INSERT INTO market_prices_daily ({", ".join(COLUMNS)})
+SELECT {", ".join(COLUMNS)} FROM {STAGE_TABLE}
+ON CONFLICT (ticker, date) DO UPDATE SET
+    close = EXCLUDED.close,
+    adj_close = EXCLUDED.adj_close,
+    volume = EXCLUDED.volume,
+    ret_1d = EXCLUDED.ret_1d,
+    vol_20d = EXCLUDED.vol_20d,
+    source = EXCLUDED.source,
+    loaded_at = now()
+WHERE (market_prices_daily.close, market_prices_daily.adj_close, market_prices_daily.volume,
+       market_prices_daily.ret_1d, market_prices_daily.vol_20d)
+      IS DISTINCT FROM
+      (EXCLUDED.close, EXCLUDED.adj_close, EXCLUDED.volume, EXCLUDED.ret_1d, EXCLUDED.vol_20d)
+"""
+
+
+def copy_from(cur: Any, sql: str, buf: io.StringIO) -> None:
+    """
+    COPY ... FROM STDIN on a raw DBAPI cursor: psycopg2 (copy_expert) or psycopg 3 (cursor.copy).
+    """
+    if hasattr(cur, "copy_expert"):
+        cur.copy_expert(sql, buf)
+        return
+    with cur.copy(sql) as copy:
+        while chunk := buf.read(COPY_CHUNK):
+            copy.write(chunk)
+
+
+def copy_upsert(buf: io.StringIO, tickers: Sequence[str]) -> int:
+    """
+    COPY the CSV buffer into a temp staging table and upsert it in one transaction.
+    Unchanged rows are not rewritten. Returns rows inserted or updated.
+
+    `tickers` (those in the buffer) are evicted from the price cache here and,
+    via pg_notify on commit, in every listening worker.
+    """
+    buf.seek(0)
+    raw = engine.raw_connection()
+    try:
+        cur = raw.cursor()
+        cur.execute(
+            f"CREATE TEMP TABLE IF NOT EXISTS {STAGE_TABLE} "
+            f"(LIKE market_prices_daily INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+        )
+        copy_from(cur, f"COPY {STAGE_TABLE} ({', '.join(COLUMNS)}) FROM STDIN WITH (FORMAT csv)", buf)
+        cur.execute(UPSERT_SQL)
+        n = cur.rowcount
+        cur.execute(NOTIFY_SQL, (NOTIFY_CHANNEL, list(tickers)))
+        raw.commit()
+        price_cache.invalidate(tickers)
+        return n
+    except Exception:
+        raw.rollback()
+        raise
+    finally:
+        raw.close()
+
+
+NOTIFY_SQL = "SELECT pg_notify(%s, t) FROM unnest(%s::text[]) AS t"
+
+
+def notify_price_change(tickers: Sequence[str]) -> None:
+    """
+    Evict `tickers` from every worker's price cache (standalone transaction).
+    """
+    raw = engine.raw_connection()
+    try:
+        raw.cursor().execute(NOTIFY_SQL, (NOTIFY_CHANNEL, list(tickers)))
+        raw.commit()
+    finally:
+        raw.close()
+    price_cache.invalidate(tickers)
+
+
+def export_to_store(tickers: Sequence[str]) -> None:
+    """
+    Refresh the memory-mapped price store (if configured) for `tickers`, then
+    evict them again: a worker may have reloaded from the old store version
+    between the upsert's notify and the export.
+    """
+    store = get_price_store()
+    if store is None:
+        return
+    db = SessionLocal()
+    try:
+        store.export(db, tickers)
+    finally:
+        db.close()
+    notify_price_change(tickers)
+
+
+# ---------------------------------------------------------------------
+# Pipeline
+# ---------------------------------------------------------------------
+
+
+def ingest(
+    tickers: Iterable[str],
+    *,
+    source: PriceSource,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    workers: int = DEFAULT_WORKERS,
+    flush_tickers: int = FLUSH_TICKERS,
+    incremental: bool = False,
+) -> Dict[str, Any]:
+    """
+    Download `tickers` concurrently and upsert full history with rolling stats,
+    or (incremental=True) only the bars after what is stored. Afterwards,
+    event_market_facts are brought up to date for the tickers written.
+
+    Returns { tickers, rows, upserted, empty: [...], failed: {ticker: error}, restated: [...], facts }.
+    """
+    uniq = list(dict.fromkeys(t.strip().upper() for t in tickers if t and t.strip()))
+    result: Dict[str, Any] = {
+        "tickers": len(uniq),
+        "rows": 0,
+        "upserted": 0,
+        "empty": [],
+        "failed": {},
+        "restated": [],
+    }
+    tails = load_tails(uniq) if incremental and uniq else {}
+
+    def work(t: str) -> Tuple[Optional[Bars], np.ndarray, np.ndarray, str]:
+        if incremental:
+            return incremental_rows(source, t, tails.get(t), end)
+        return full_rows(source, t, start, end)
+
+    buf = io.StringIO()
+    pending: List[str] = []
+    rewritten: List[str] = []  # history (re)written: every event fact may change
+    appended: List[str] = []   # only new bars: incomplete facts may fill in
+
+    def flush() -> None:
+        nonlocal buf, pending
+        if pending:
+            result["upserted"] += copy_upsert(buf, pending)
+            export_to_store(pending)
+        buf, pending = io.StringIO(), []
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(work, t): t for t in uniq}
+        for fut in as_completed(futures):
+            t = futures[fut]
+            try:
+                bars, ret, vol, mode = fut.result()
+            except Exception as e:  # one bad ticker must not sink the batch
+                log.warning("market ingest %s failed: %s", t, e)
+                result["failed"][t] = str(e)
+                continue
+            if mode == "restated":
+                result["restated"].append(t)
+            if bars is None or not len(bars):
+                result["empty"].append(t)
+                continue
+
+            result["rows"] += bars_csv(bars, ret, vol, source.name, buf)
+            (appended if mode == "append" else rewritten).append(t)
+            pending.append(t)
+            if len(pending) >= flush_tickers:
+                flush()
+    flush()
+
+    facts = {"events": 0, "complete": 0}
+    for scope, recompute in ((rewritten, True), (appended, False)):
+        if scope:
+            out = refresh_event_market_facts(tickers=scope, recompute=recompute)
+            facts = {k: facts[k] + out[k] for k in facts}
+    result["facts"] = facts
+    return result
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    import argparse
+    import json
+
+    from app.settings import settings
+
+    ap = argparse.ArgumentParser(description="Load daily prices into market_prices_daily")
+    ap.add_argument("tickers", nargs="*")
+    ap.add_argument("--tickers-file", help="one ticker per line")
+    ap.add_argument("--source", default=settings.MARKET_SOURCE, choices=[YahooSource.name, FileSource.name])
+    ap.add_argument("--root", default=settings.MARKET_FILE_ROOT, help="directory for --source file")
+    ap.add_argument("--start", type=date.fromisoformat)
+    ap.add_argument("--end", type=date.fromisoformat)
+    ap.add_argument("--workers", type=int, default=settings.MARKET_INGEST_WORKERS)
+    ap.add_argument("--incremental", action="store_true", help="append new bars after the stored tail")
+    args = ap.parse_args(argv)
+
+    tickers = list(args.tickers)
+    if args.tickers_file:
+        with open(args.tickers_file) as f:
+            tickers += [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    if not tickers:
+        ap.error("no tickers given")
+
+    logging.basicConfig(level=logging.INFO)
+    out = ingest(
+        tickers,
+        source=get_source(args.source, root=args.root),
+        start=args.start,
+        end=args.end,
+        workers=args.workers,
+        incremental=args.incremental,
+    )
+    print(json.dumps(out, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# app/services/partitions.py
+"""
+Monthly partitions of decision_events (migration 0011).
+
+Partitions are created by the SQL function ensure_decision_events_partitions
+(idempotent, one per UTC month). The app calls it:
+- at startup, for the current month through PARTITION_MONTHS_AHEAD ahead
+- before writing events into a month this worker has not ensured yet
+  (backfills, old event_ts on drafts), so rows land in their own partition
+  instead of the DEFAULT one
+
+Months already ensured are remembered per worker, so the write path costs a
+round trip only the first time a month is seen.
+
+The function runs in its own short transaction on a separate connection,
+committed before the caller's insert: CREATE TABLE ... PARTITION OF takes an
+ACCESS EXCLUSIVE lock on decision_events, which must not be held for the
+rest of a request, and a later rollback of the request must not undo a
+partition this worker already marked as known. Callers must not hold locks
+on decision_events when they call it (it would wait on them). The lock wait
+is capped by ENSURE_LOCK_TIMEOUT; on timeout the error reaches the caller
+and the month is retried next time.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import text
+
+from app.db.session import async_engine, engine
+from app.settings import settings
+
+log = logging.getLogger(__name__)
+
+ENSURE_SQL = text("SELECT ensure_decision_events_partitions(:lo, :hi)")
+ENSURE_LOCK_TIMEOUT = "5s"
+LOCK_TIMEOUT_SQL = text(f"SET LOCAL lock_timeout = '{ENSURE_LOCK_TIMEOUT}'")
+
+_known: Set[date] = set()
+_lock = threading.Lock()
+
+
+def month_start(ts: datetime) -> date:
+    d = ts.astimezone(timezone.utc).date() if ts.tzinfo else ts.date()
+    return d.replace(day=1)
+
+
+def missing_range(timestamps: Iterable[datetime]) -> Optional[Tuple[datetime, datetime]]:
+    """
+    (lo, hi) spanning the months of `timestamps` not yet ensured by this worker.
+    """
+    with _lock:
+        months = sorted({month_start(ts) for ts in timestamps} - _known)
+    if not months:
+        return None
+    lo = datetime.combine(months[0], datetime.min.time(), tzinfo=timezone.utc)
+    hi = datetime.combine(months[-1], datetime.min.time(), tzinfo=timezone.utc)
+    return lo, hi
+
+
+def mark_known(lo: datetime, hi: datetime) -> None:
+    m, last = month_start(lo), month_start(hi)
+    months: List[date] = []
+    while m <= last:
+        months.append(m)
+        m = (m + timedelta(days=32)).replace(day=1)
+    with _lock:
+        _known.update(months)
+
+
+def ensure_partitions(timestamps: Iterable[datetime]) -> None:
+    """
+    Sync write paths: make sure partitions exist for the months of `timestamps`
+    (own committed transaction; call before touching decision_events).
+    """
+    rng = missing_range(timestamps)
+    if rng is None:
+        return
+    with engine.begin() as conn:
+        conn.execute(LOCK_TIMEOUT_SQL)
+        conn.execute(ENSURE_SQL, {"lo": rng[0], "hi": rng[1]})
+    mark_known(*rng)
+
+
+async def ensure_partitions_async(timestamps: Iterable[datetime]) -> None:
+    rng = missing_range(timestamps)
+    if rng is None:
+        return
+    async with async_engine.begin() as conn:
+        await conn.execute(LOCK_TIMEOUT_SQL)
+        await conn.execute(ENSURE_SQL, {"lo": rng[0], "hi": rng[1]})
+    mark_known(*rng)
+
+
+async def ensure_future_partitions() -> None:
+    """
+    Startup: current month through PARTITION_MONTHS_AHEAD; never raises.
+    """
+    now = datetime.now(timezone.utc)
+    hi = now + timedelta(days=31 * settings.PARTITION_MONTHS_AHEAD)
+    try:
+        async with async_engine.begin() as conn:
+            await conn.execute(ENSURE_SQL, {"lo": now, "hi": hi})
+        mark_known(now, hi)
+    except Exception as e:
+        log.warning("decision_events partitions not ensured: %s", e)
@@ -0,0 +1,273 @@
+# app/services/price_cache.py
+"""
+Per-worker cache of daily close series for as-of lookups.
+
+Each ticker is held as two compact arrays (int32 day numbers since
+1970-01-01, float64 closes) and looked up with np.searchsorted, so
+compile_thesis / replay / replay:batch do not hit market_prices_daily
+per request, and many as-of points resolve in one vectorized call.
+
+Misses are filled from the memory-mapped PriceStore when PRICE_STORE_ROOT is
+set (arrays are then views of shared pages), otherwise from Postgres.
+
+Eviction is LRU by bytes (PRICE_CACHE_MAX_BYTES). Invalidation:
+- in-process: market_data.copy_upsert calls price_cache.invalidate(tickers)
+- cross-process: copy_upsert also sends pg_notify(NOTIFY_CHANNEL, ticker) in
+  the upsert transaction; each worker LISTENs (start_listener on startup),
+  so CLI loads and other workers' ingests evict stale series on commit.
+  The listener pings its connection every LISTEN_PING_S and reconnects with
+  backoff when it drops; notifications sent while it was down are lost, so
+  every (re)connect clears the cache and the caches chained on it.
+- a miss that loaded a series before an invalidation does not put it back:
+  put() only stores if the ticker's generation is unchanged since the load
+  started.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.market_prices import MarketPriceDaily
+from app.settings import settings
+
+log = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "market_prices_daily"
+LISTEN_PING_S = 30.0
+LISTEN_RETRY_MIN_S = 1.0
+LISTEN_RETRY_MAX_S = 60.0
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_ENTRY_OVERHEAD = 256  # bytes per entry beyond the arrays (object headers, key)
+
+
+def day_number(d: date) -> int:
+    return d.toordinal() - _EPOCH_ORDINAL
+
+
+def day_date(n: int) -> date:
+    return date.fromordinal(int(n) + _EPOCH_ORDINAL)
+
+
+@dataclass(frozen=True)
+class PriceSeries:
+    """
+    Daily closes for one ticker, sorted by day; empty if nothing is stored.
+    """
+
+    ticker: str
+    days: np.ndarray   # int32 day numbers
+    close: np.ndarray  # float64
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.days.nbytes + self.close.nbytes) + _ENTRY_OVERHEAD
+
+    def index_asof(self, days: np.ndarray) -> np.ndarray:
+        """
+        Index of the last bar on or before each day (-1 where none).
+        """
+        return np.searchsorted(self.days, days, side="right") - 1
+
+    def summary_asof(self, d: date) -> Optional[Dict[str, Any]]:
+        """
+        {date, close} of the last bar on or before `d` (same shape as the old DB lookup).
+        """
+        i = int(self.index_asof(np.asarray([day_number(d)], dtype=np.int32))[0])
+        if i < 0:
+            return None
+        return {"date": str(day_date(self.days[i])), "close": float(self.close[i])}
+
+    def summaries_asof(self, ds: Sequence[date]) -> List[Optional[Dict[str, Any]]]:
+        idx = self.index_asof(np.asarray([day_number(d) for d in ds], dtype=np.int32))
+        return [
+            {"date": str(day_date(self.days[i])), "close": float(self.close[i])} if i >= 0 else None
+            for i in idx.tolist()
+        ]
+
+
+def make_series(ticker: str, rows: Iterable[Any]) -> PriceSeries:
+    days: List[int] = []
+    closes: List[float] = []
+    for d, c in rows:
+        days.append(day_number(d))
+        closes.append(float(c))
+    return PriceSeries(ticker, np.asarray(days, dtype=np.int32), np.asarray(closes, dtype=np.float64))
+
+
+def series_query(ticker: str):
+    return (
+        select(MarketPriceDaily.date, MarketPriceDaily.close)
+        .where(MarketPriceDaily.ticker == ticker, MarketPriceDaily.close.is_not(None))
+        .order_by(MarketPriceDaily.date.asc())
+    )
+
+
+def store_series(ticker: str) -> Optional[PriceSeries]:
+    """
+    Series from the memory-mapped price store when PRICE_STORE_ROOT is set (no DB hit).
+    """
+    from app.services.price_store import get_price_store  # price_store imports this module
+
+    store = get_price_store()
+    return store.series(ticker) if store is not None else None
+
+
+class PriceCache:
+    """
+    Thread-safe LRU of ticker -> PriceSeries with a byte budget.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[str, PriceSeries]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        # Bumped on invalidate (per ticker) and clear (epoch); see generation().
+        self._gen: Dict[str, int] = {}
+        self._epoch = 0
+        self._listener: Any = None
+        self._listen_task: Optional["asyncio.Task[None]"] = None
+        # Derived caches (e.g. book risk) that must drop results when prices change.
+        self.on_invalidate: List[Callable[[List[str]], None]] = []
+        self.on_clear: List[Callable[[], None]] = []
+
+    def get_cached(self, ticker: str) -> Optional[PriceSeries]:
+        with self._lock:
+            s = self._data.get(ticker)
+            if s is not None:
+                self._data.move_to_end(ticker)
+            return s
+
+    def generation(self, ticker: str) -> Tuple[int, int]:
+        """
+        Token taken before loading a miss; put(series, generation=...) is a
+        no-op if the ticker was invalidated (or the cache cleared) since.
+        """
+        with self._lock:
+            return self._epoch, self._gen.get(ticker, 0)
+
+    def put(self, series: PriceSeries, *, generation: Optional[Tuple[int, int]] = None) -> None:
+        with self._lock:
+            if generation is not None and generation != (self._epoch, self._gen.get(series.ticker, 0)):
+                return
+            old = self._data.pop(series.ticker, None)
+            if old is not None:
+                self._bytes -= old.nbytes
+            if series.nbytes > self.max_bytes:
+                return
+            self._data[series.ticker] = series
+            self._bytes += series.nbytes
+            while self._bytes > self.max_bytes:
+                _, evicted = self._data.popitem(last=False)
+                self._bytes -= evicted.nbytes
+
+    def invalidate(self, tickers: Iterable[str]) -> None:
+        ts = [t.upper() for t in tickers]
+        with self._lock:
+            for t in ts:
+                self._gen[t] = self._gen.get(t, 0) + 1
+                old = self._data.pop(t, None)
+                if old is not None:
+                    self._bytes -= old.nbytes
+        for cb in self.on_invalidate:
+            cb(ts)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._epoch += 1
+            self._gen.clear()
+            self._data.clear()
+            self._bytes = 0
+        for cb in self.on_clear:
+            cb()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"tickers": len(self._data), "bytes": self._bytes, "max_bytes": self.max_bytes}
+
+    def get(self, db: Session, ticker: str) -> PriceSeries:
+        t = ticker.upper()
+        s = self.get_cached(t)
+        if s is None:
+            gen = self.generation(t)
+            s = store_series(t) or make_series(t, db.execute(series_query(t)).all())
+            self.put(s, generation=gen)
+        return s
+
+    async def get_async(self, db: AsyncSession, ticker: str) -> PriceSeries:
+        t = ticker.upper()
+        s = self.get_cached(t)
+        if s is None:
+            gen = self.generation(t)
+            s = store_series(t) or make_series(t, (await db.execute(series_query(t))).all())
+            self.put(s, generation=gen)
+        return s
+
+    # -- cross-process invalidation ----------------------------------
+
+    async def start_listener(self, dsn: str) -> None:
+        """
+        LISTEN on NOTIFY_CHANNEL with a dedicated asyncpg connection (not a pool
+        slot), supervised by a background task that reconnects with backoff.
+        Connection failures are logged, not raised.
+        """
+        if self._listen_task is None:
+            self._listen_task = asyncio.get_running_loop().create_task(self._listen(dsn))
+
+    async def _listen(self, dsn: str) -> None:
+        import asyncpg
+
+        delay = LISTEN_RETRY_MIN_S
+        while True:
+            lost = asyncio.Event()
+            try:
+                conn = await asyncpg.connect(dsn)
+            except Exception as e:
+                log.warning("price cache listener not connected (retry in %.0fs): %s", delay, e)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, LISTEN_RETRY_MAX_S)
+                continue
+
+            self._listener = conn
+            try:
+                conn.add_termination_listener(lambda _c: lost.set())
+                await conn.add_listener(NOTIFY_CHANNEL, lambda _c, _pid, _ch, payload: self.invalidate([payload]))
+                # Anything sent while not listening was missed.
+                self.clear()
+                delay = LISTEN_RETRY_MIN_S
+                while not lost.is_set():
+                    try:
+                        await asyncio.wait_for(lost.wait(), timeout=LISTEN_PING_S)
+                    except asyncio.TimeoutError:
+                        await conn.execute("SELECT 1")  # surfaces half-open connections
+            except Exception as e:
+                log.warning("price cache listener lost: %s", e)
+            finally:
+                self._listener = None
+                if not conn.is_closed():
+                    conn.terminate()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, LISTEN_RETRY_MAX_S)
+
+    async def stop_listener(self) -> None:
+        task, self._listen_task = self._listen_task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+
+price_cache = PriceCache(settings.PRICE_CACHE_MAX_BYTES)
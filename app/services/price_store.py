@@ -0,0 +1,286 @@
+# app/services/price_store.py
+"""
+Offline columnar copy of market_prices_daily, memory-mapped read-only.
+
+Layout under PRICE_STORE_ROOT:
+
+    {TICKER}/CURRENT               name of the live version directory
+    {TICKER}/{version}/days.npy    int32 day numbers since 1970-01-01
+    {TICKER}/{version}/close.npy   float64 (NaN = NULL), same for adj_close,
+                                   volume, ret_1d, vol_20d
+    manifest.json                  {ticker: {rows, last_date, loaded_at}}
+    .manifest.lock                 flock held while the manifest is updated
+
+Writers build a new version directory and swap CURRENT with os.replace, so
+readers never see a half-written ticker. The manifest is read, updated and
+replaced under an exclusive flock, so concurrent syncs of different tickers
+keep each other's entries. Readers np.load(mmap_mode="r"),
+so every uvicorn worker (and research notebooks) shares the same pages
+through the OS page cache instead of holding private copies. A reader
+re-opens a ticker only when CURRENT changed (stat: inode + mtime).
+
+PriceStore.series() returns the same PriceSeries as the DB path in
+price_cache, which consults the store first when PRICE_STORE_ROOT is set.
+
+CLI:
+    python -m app.services.price_store sync [TICKER ...]   (default: tickers changed since last sync)
+"""
+from __future__ import annotations
+
+import fcntl
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.services.price_cache import PriceSeries, day_number
+
+COLUMNS = ("days", "close", "adj_close", "volume", "ret_1d", "vol_20d")
+KEEP_VERSIONS = 2
+EXPORT_CHUNK = 200
+
+# Tickers become directory names: letters, digits and . - ^ = only (BRK-B, ^GSPC, EURUSD=X).
+_TICKER_RE = re.compile(r"^[A-Z0-9.\-^=]{1,32}$")
+
+EXPORT_SQL = text(
+    """
+    SELECT ticker, date, close, adj_close, volume, ret_1d, vol_20d
+    FROM market_prices_daily
+    WHERE ticker = ANY(CAST(:tickers AS text[]))
+    ORDER BY ticker, date
+    """
+)
+
+CHANGED_SQL = text(
+    """
+    SELECT ticker, max(loaded_at) AS loaded_at
+    FROM market_prices_daily
+    GROUP BY ticker
+    """
+)
+
+
+def safe_ticker(ticker: str) -> str:
+    t = ticker.strip().upper()
+    if not _TICKER_RE.match(t) or t in (".", ".."):
+        raise ValueError(f"Ticker not storable: {ticker!r}")
+    return t
+
+
+def _f64(values: Sequence[Any]) -> np.ndarray:
+    return np.asarray([float(v) if v is not None else np.nan for v in values], dtype=np.float64)
+
+
+class PriceStore:
+    def __init__(self, root: str) -> None:
+        self.root = root
+        self._maps: Dict[str, Tuple[Tuple[int, int], Dict[str, np.ndarray]]] = {}
+        self._lock = threading.Lock()
+
+    # -- read --------------------------------------------------------
+
+    def columns(self, ticker: str) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Read-only memory-mapped columns for `ticker`, or None if not exported.
+        """
+        try:
+            t = safe_ticker(ticker)
+        except ValueError:
+            return None
+        current = os.path.join(self.root, t, "CURRENT")
+        try:
+            st = os.stat(current)
+            with open(current) as f:
+                version = f.read().strip()
+        except FileNotFoundError:
+            return None
+        key = (st.st_ino, st.st_mtime_ns)
+
+        with self._lock:
+            hit = self._maps.get(t)
+            if hit is not None and hit[0] == key:
+                return hit[1]
+
+        vdir = os.path.join(self.root, t, version)
+        try:
+            cols = {c: np.load(os.path.join(vdir, f"{c}.npy"), mmap_mode="r") for c in COLUMNS}
+        except FileNotFoundError:  # pruned between reading CURRENT and opening; next call re-reads
+            return None
+        with self._lock:
+            self._maps[t] = (key, cols)
+        return cols
+
+    def series(self, ticker: str) -> Optional[PriceSeries]:
+        """
+        Close series (rows with a close only) in the price_cache shape.
+        """
+        cols = self.columns(ticker)
+        if cols is None:
+            return None
+        close = cols["close"]
+        ok = ~np.isnan(close)
+        if ok.all():
+            return PriceSeries(safe_ticker(ticker), cols["days"], close)
+        return PriceSeries(safe_ticker(ticker), np.asarray(cols["days"][ok]), np.asarray(close[ok]))
+
+    # -- write -------------------------------------------------------
+
+    def write(self, ticker: str, cols: Dict[str, np.ndarray]) -> str:
+        """
+        Write a new version of `ticker` and make it current atomically.
+        """
+        t = safe_ticker(ticker)
+        tdir = os.path.join(self.root, t)
+        version = f"{time.time_ns():x}"
+        vdir = os.path.join(tdir, version)
+        os.makedirs(vdir)
+        for c in COLUMNS:
+            np.save(os.path.join(vdir, f"{c}.npy"), cols[c])
+
+        tmp = os.path.join(tdir, f".CURRENT.{version}")
+        with open(tmp, "w") as f:
+            f.write(version)
+        os.replace(tmp, os.path.join(tdir, "CURRENT"))
+        self._prune(tdir, version)
+        return version
+
+    @staticmethod
+    def _prune(tdir: str, current: str) -> None:
+        # Open mmaps of pruned versions stay valid (POSIX unlink semantics).
+        versions = sorted(d for d in os.listdir(tdir) if d != current and not d.startswith((".", "CURRENT")))
+        for d in versions[: max(0, len(versions) - (KEEP_VERSIONS - 1))]:
+            shutil.rmtree(os.path.join(tdir, d), ignore_errors=True)
+
+    def read_manifest(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(os.path.join(self.root, "manifest.json")) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def write_manifest(self, manifest: Dict[str, Dict[str, Any]]) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        tmp = os.path.join(self.root, f".manifest.{time.time_ns():x}")
+        with open(tmp, "w") as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+        os.replace(tmp, os.path.join(self.root, "manifest.json"))
+
+    @contextmanager
+    def _manifest_lock(self) -> Iterator[None]:
+        os.makedirs(self.root, exist_ok=True)
+        with open(os.path.join(self.root, ".manifest.lock"), "a") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def update_manifest(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Merge `entries` into the manifest (read-modify-write under the lock).
+        """
+        with self._manifest_lock():
+            manifest = self.read_manifest()
+            manifest.update(entries)
+            self.write_manifest(manifest)
+
+    def export(self, db: Session, tickers: Iterable[str]) -> Dict[str, Any]:
+        """
+        Copy full history for `tickers` from market_prices_daily into the store.
+        """
+        uniq = []
+        skipped = []
+        for t in dict.fromkeys(x.strip().upper() for x in tickers if x and x.strip()):
+            try:
+                uniq.append(safe_ticker(t))
+            except ValueError:
+                skipped.append(t)
+
+        entries: Dict[str, Dict[str, Any]] = {}
+        for start in range(0, len(uniq), EXPORT_CHUNK):
+            chunk = uniq[start : start + EXPORT_CHUNK]
+            rows: Dict[str, List[Any]] = defaultdict(list)
+            for r in db.execute(EXPORT_SQL, {"tickers": chunk}):
+                rows[r.ticker].append(r)
+            for t, rs in rows.items():
+                self.write(
+                    t,
+                    {
+                        "days": np.asarray([day_number(r.date) for r in rs], dtype=np.int32),
+                        "close": _f64([r.close for r in rs]),
+                        "adj_close": _f64([r.adj_close for r in rs]),
+                        "volume": _f64([r.volume for r in rs]),
+                        "ret_1d": _f64([r.ret_1d for r in rs]),
+                        "vol_20d": _f64([r.vol_20d for r in rs]),
+                    },
+                )
+                entries[t] = {"rows": len(rs), "last_date": str(rs[-1].date), "exported_at": time.time()}
+        self.update_manifest(entries)
+        return {"exported": len(entries), "skipped": skipped}
+
+    def sync(self, db: Session) -> Dict[str, Any]:
+        """
+        Export tickers whose rows were loaded after their last export.
+        """
+        manifest = self.read_manifest()
+        stale = [
+            t
+            for t, loaded_at in db.execute(CHANGED_SQL)
+            if t not in manifest or loaded_at.timestamp() > manifest[t].get("exported_at", 0)
+        ]
+        return self.export(db, stale)
+
+
+_store: Optional[PriceStore] = None
+_store_lock = threading.Lock()
+
+
+def get_price_store() -> Optional[PriceStore]:
+    """
+    Process-wide store, or None when PRICE_STORE_ROOT is not set.
+    """
+    global _store
+    from app.settings import settings
+
+    if not settings.PRICE_STORE_ROOT:
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = PriceStore(settings.PRICE_STORE_ROOT)
+        return _store
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    import argparse
+
+    from app.db.session import SessionLocal
+    from app.settings import settings
+
+    ap = argparse.ArgumentParser(description="Export market_prices_daily to the memory-mapped price store")
+    ap.add_argument("command", choices=["sync"])
+    ap.add_argument("tickers", nargs="*", help="export these tickers (default: those changed since last sync)")
+    ap.add_argument("--root", default=settings.PRICE_STORE_ROOT)
+    args = ap.parse_args(argv)
+    if not args.root:
+        ap.error("set PRICE_STORE_ROOT or pass --root")
+
+    store = PriceStore(args.root)
+    db: Session = SessionLocal()
+    try:
+        out = store.export(db, args.tickers) if args.tickers else store.sync(db)
+    finally:
+        db.close()
+    print(json.dumps(out, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+# app/services/thesis_state.py
+from __future__ import annotations
+
+import copy
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import delete, func, or_, select, text, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.decision_events import DecisionEvent
+from app.models.thesis_snapshots import ThesisSnapshot
+
+# thesis_snapshots.model values
+FOLD_MODEL = "fold:v1"                       # compile_thesis output
+CHECKPOINT_MODEL = "checkpoint:" + FOLD_MODEL  # replay checkpoints (not user-facing)
+
+STATUS_FINAL = "FINAL"
+
+CONVICTION_MIN = 0
+CONVICTION_MAX = 100
+
+
+# ---------------------------------------------------------------------
+# Pure fold
+# ---------------------------------------------------------------------
+
+
+def empty_state() -> Dict[str, Any]:
+    """
+    Folded thesis state before any FINAL event.
+    """
+    return {
+        "direction": None,
+        "horizon_days": None,
+        "entry_thesis": None,
+        "drivers": [],
+        "risks": [],
+        "triggers": [],
+        "conviction": None,
+        "position_pct": None,
+        "risk_notes": 0,
+        "event_count": 0,
+        "last_event_ts": None,
+        "last_event_id": None,
+    }
+
+
+def apply_delta(items: List[str], delta: Any) -> List[str]:
+    """
+    {add, remove} delta on an ordered list: removals first, then additions not already present.
+    """
+    if not isinstance(delta, dict):
+        return items
+    remove = set(delta.get("remove") or [])
+    out = [i for i in items if i not in remove]
+    for i in delta.get("add") or []:
+        if i not in out:
+            out.append(i)
+    return out
+
+
+def apply_event(state: Dict[str, Any], event: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Apply one FINAL event (dict with id, event_ts, event_type, payload) in place.
+
+    INITIATE sets drivers/risks/triggers/conviction/direction and the intended size;
+    THESIS_UPDATE applies the add/remove deltas and conviction_delta (clamped 0..100);
+    RESIZE moves position_pct to to_pct. Other types only advance the cursor.
+    """
+    event_type = event.get("event_type")
+    p = event.get("payload") or {}
+
+    if event_type == "INITIATE":
+        state["direction"] = p.get("direction")
+        state["horizon_days"] = p.get("horizon_days")
+        state["entry_thesis"] = p.get("entry_thesis")
+        state["drivers"] = list(p.get("key_drivers") or [])
+        state["risks"] = list(p.get("key_risks") or [])
+        state["triggers"] = list(p.get("invalidation_triggers") or [])
+        state["conviction"] = p.get("conviction")
+        state["position_pct"] = p.get("position_intent_pct")
+    elif event_type == "THESIS_UPDATE":
+        state["drivers"] = apply_delta(state["drivers"], p.get("drivers_delta"))
+        state["risks"] = apply_delta(state["risks"], p.get("risks_delta"))
+        state["triggers"] = apply_delta(state["triggers"], p.get("triggers_delta"))
+        delta = p.get("conviction_delta")
+        if state["conviction"] is not None and isinstance(delta, (int, float)):
+            state["conviction"] = max(CONVICTION_MIN, min(CONVICTION_MAX, state["conviction"] + delta))
+    elif event_type == "RESIZE":
+        state["position_pct"] = p.get("to_pct")
+    elif event_type == "RISK_NOTE":
+        state["risk_notes"] += 1
+
+    ts = event.get("event_ts")
+    state["event_count"] += 1
+    state["last_event_ts"] = ts.isoformat() if isinstance(ts, datetime) else ts
+    state["last_event_id"] = str(event.get("id"))
+    return state
+
+
+def fold(events: Iterable[Dict[str, Any]], state: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Deterministic fold of FINAL events (ordered by (event_ts, id)) onto state.
+    """
+    out = copy.deepcopy(state) if state is not None else empty_state()
+    for e in events:
+        apply_event(out, e)
+    return out
+
+
+def fold_asofs(
+    events: List[Dict[str, Any]],
+    asofs: List[datetime],
+    state: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    State at each as-of point in one forward pass over `events`.
+
+    `events` are in fold order; results are returned in the order of `asofs`.
+    Each result is an independent copy.
+    """
+    out = copy.deepcopy(state) if state is not None else empty_state()
+    results: List[Optional[Dict[str, Any]]] = [None] * len(asofs)
+    i = 0
+    for idx in sorted(range(len(asofs)), key=lambda k: asofs[k]):
+        while i < len(events) and events[i]["event_ts"] <= asofs[idx]:
+            apply_event(out, events[i])
+            i += 1
+        results[idx] = copy.deepcopy(out)
+    return results  # type: ignore[return-value]
+
+
+def state_cursor(state: Dict[str, Any]) -> Optional[Tuple[datetime, UUID]]:
+    """
+    (event_ts, id) of the last folded event, or None for the empty state.
+    """
+    if not state.get("last_event_id"):
+        return None
+    return datetime.fromisoformat(state["last_event_ts"]), UUID(state["last_event_id"])
+
+
+def event_dict(de: DecisionEvent) -> Dict[str, Any]:
+    return {"id": de.id, "event_ts": de.event_ts, "event_type": de.event_type, "payload": de.payload or {}}
+
+
+# ---------------------------------------------------------------------
+# Checkpoints (thesis_snapshots rows with model = CHECKPOINT_MODEL)
+# ---------------------------------------------------------------------
+
+
+def not_checkpoint():
+    """
+    Filter for user-facing snapshots.
+    """
+    return or_(ThesisSnapshot.model.is_(None), ThesisSnapshot.model != CHECKPOINT_MODEL)
+
+
+def checkpoint_lock_stmt(case_id: UUID):
+    """
+    Per-case transaction advisory lock shared by checkpoint writes and
+    invalidation. Take it in its own statement before the DELETE / INSERT so
+    they run on a snapshot taken after the other side committed.
+    """
+    return select(func.pg_advisory_xact_lock(func.hashtextextended(str(case_id), 0)))
+
+
+def checkpoint_invalidation_stmt(case_id: UUID, since: datetime):
+    """
+    DELETE for checkpoints that a FINAL event at `since` would land before.
+    Needed when events are backfilled or an old draft is finalized; execute
+    checkpoint_lock_stmt(case_id) first.
+    """
+    return delete(ThesisSnapshot).where(
+        ThesisSnapshot.case_id == case_id,
+        ThesisSnapshot.model == CHECKPOINT_MODEL,
+        ThesisSnapshot.asof_ts >= since,
+    )
+
+
+async def latest_checkpoint(db: AsyncSession, case_id: UUID, asof: datetime) -> Optional[ThesisSnapshot]:
+    return (
+        await db.execute(
+            select(ThesisSnapshot)
+            .where(
+                ThesisSnapshot.case_id == case_id,
+                ThesisSnapshot.model == CHECKPOINT_MODEL,
+                ThesisSnapshot.asof_ts <= asof,
+            )
+            .order_by(ThesisSnapshot.asof_ts.desc())
+            .limit(1)
+        )
+    ).scalars().first()
+
+
+def tail_events_query(case_id: UUID, asof: datetime, cursor: Optional[Tuple[datetime, UUID]]):
+    """
+    FINAL events after the checkpoint cursor, up to asof, in fold order.
+    """
+    q = select(DecisionEvent).where(
+        DecisionEvent.case_id == case_id,
+        DecisionEvent.status == STATUS_FINAL,
+        DecisionEvent.event_ts <= asof,
+    )
+    if cursor is not None:
+        ts, event_id = cursor
+        q = q.where(
+            DecisionEvent.event_ts >= ts,
+            tuple_(DecisionEvent.event_ts, DecisionEvent.id) > tuple_(ts, event_id),
+        )
+    return q.order_by(DecisionEvent.event_ts.asc(), DecisionEvent.id.asc())
+
+
+def fold_with_checkpoints(
+    case_id: UUID,
+    state: Dict[str, Any],
+    tail: Iterable[Dict[str, Any]],
+    *,
+    checkpoint_every: int,
+) -> Tuple[Dict[str, Any], List[ThesisSnapshot]]:
+    """
+    Fold the tail and emit a checkpoint row every `checkpoint_every` events.
+    """
+    out = copy.deepcopy(state)
+    checkpoints: List[ThesisSnapshot] = []
+    for e in tail:
+        apply_event(out, e)
+        if checkpoint_every > 0 and out["event_count"] % checkpoint_every == 0:
+            checkpoints.append(
+                ThesisSnapshot(
+                    case_id=case_id,
+                    asof_ts=e["event_ts"],
+                    compiled_json={"state": copy.deepcopy(out)},
+                    narrative=None,
+                    model=CHECKPOINT_MODEL,
+                )
+            )
+    return out, checkpoints
+
+
+async def save_checkpoints(db: AsyncSession, case_id: UUID, checkpoints: List[ThesisSnapshot]) -> None:
+    """
+    Persist checkpoints from fold_with_checkpoints and commit.
+
+    The fold read its tail before this runs, so an event backfilled or
+    finalized in between may be missing from it. Under the case lock, the
+    checkpoints are written only if the FINAL events up to the last one are
+    exactly the ones folded (same count); otherwise they are dropped and a
+    later read rebuilds them. Concurrent readers writing the same checkpoint
+    collide on uq_thesis_snapshots_checkpoint and keep the first.
+    """
+    if not checkpoints:
+        return
+    last = checkpoints[-1].compiled_json["state"]
+    await db.execute(checkpoint_lock_stmt(case_id))
+    folded = (
+        await db.execute(
+            select(func.count())
+            .select_from(DecisionEvent)
+            .where(
+                DecisionEvent.case_id == case_id,
+                DecisionEvent.status == STATUS_FINAL,
+                tuple_(DecisionEvent.event_ts, DecisionEvent.id) <= tuple_(*state_cursor(last)),
+            )
+        )
+    ).scalar_one()
+    if folded == last["event_count"]:
+        await db.execute(
+            insert(ThesisSnapshot)
+            .values(
+                [
+                    {"case_id": c.case_id, "asof_ts": c.asof_ts, "compiled_json": c.compiled_json, "model": c.model}
+                    for c in checkpoints
+                ]
+            )
+            .on_conflict_do_nothing(
+                index_elements=[ThesisSnapshot.case_id, ThesisSnapshot.asof_ts],
+                # Literal predicate: index inference cannot use a bind parameter.
+                index_where=text(f"model = '{CHECKPOINT_MODEL}'"),
+            )
+        )
+    await db.commit()
+
+
+async def folded_state_asof(
+    db: AsyncSession,
+    case_id: UUID,
+    asof: datetime,
+    *,
+    checkpoint_every: int,
+) -> Dict[str, Any]:
+    """
+    Thesis state as of `asof`: nearest checkpoint + the FINAL events after it.
+    New checkpoints crossed on the way are persisted (save_checkpoints), so
+    later calls stay O(K).
+    Archived cases (never checkpointed) fold their segment merged with the
+    remaining hot rows.
+    """
+    cp = await latest_checkpoint(db, case_id, asof)
+    state = cp.compiled_json["state"] if cp else empty_state()
+
+    rows = (await db.execute(tail_events_query(case_id, asof, state_cursor(state)))).scalars().all()
+    if cp is None:
+        from app.services.archive import archived_fold_events, merge_events  # archive imports this module
+
+        archived = await archived_fold_events(db, case_id, asof)
+        if archived is not None:
+            return fold(merge_events(archived, (event_dict(e) for e in rows)))
+    state, checkpoints = fold_with_checkpoints(
+        case_id,
+        state,
+        (event_dict(e) for e in rows),
+        checkpoint_every=checkpoint_every,
+    )
+    await save_checkpoints(db, case_id, checkpoints)
+    return state
@@ -0,0 +1,83 @@
+# app/services/ticker_rules.py
+"""
+Active TICKER_RULE lookup and its per-worker cache.
+
+Rules live in decision_events (event_type='TICKER_RULE', payload.ticker,
+payload.status). The lookup is served by the partial expression index
+ix_decision_events_ticker_rule ON ((payload ->> 'ticker'), event_ts)
+WHERE event_type = 'TICKER_RULE' (migration 0008, rebuilt on the partitioned
+table by 0011/0012); tests/test_ticker_rules_plan.py asserts the planner uses it.
+
+The UI reads rules on every ticker switch, so results are cached per worker:
+- invalidated in-process whenever a TICKER_RULE is written through this worker
+  (tickers routes, finalize, add_event, bulk insert)
+- entries expire after TICKER_RULES_CACHE_TTL_S, which bounds staleness for
+  writes made through other workers
+"""
+from __future__ import annotations
+
+import copy
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from app.models.decision_events import DecisionEvent
+from app.settings import settings
+
+
+def active_rules_stmt(ticker: str):
+    """
+    ACTIVE rules for an (uppercased) ticker, oldest first. The predicate must keep
+    the index expression and partial condition verbatim for the planner to match them.
+    """
+    return (
+        select(DecisionEvent)
+        .where(
+            DecisionEvent.event_type == "TICKER_RULE",
+            DecisionEvent.payload["ticker"].astext == ticker,
+            DecisionEvent.payload["status"].astext == "ACTIVE",
+        )
+        .order_by(DecisionEvent.event_ts.asc())
+    )
+
+
+class TickerRulesCache:
+    """
+    Thread-safe ticker -> (expires_at, rules) map.
+    """
+
+    def __init__(self, ttl_s: float) -> None:
+        self.ttl_s = ttl_s
+        self._data: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, ticker: str) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            hit = self._data.get(ticker)
+            if hit is None:
+                return None
+            if hit[0] < time.monotonic():
+                del self._data[ticker]
+                return None
+            return copy.deepcopy(hit[1])
+
+    def put(self, ticker: str, rules: List[Dict[str, Any]]) -> None:
+        if self.ttl_s <= 0:
+            return
+        with self._lock:
+            self._data[ticker] = (time.monotonic() + self.ttl_s, copy.deepcopy(rules))
+
+    def invalidate(self, tickers: Iterable[Any]) -> None:
+        with self._lock:
+            for t in tickers:
+                if isinstance(t, str):
+                    self._data.pop(t.strip().upper(), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+ticker_rules_cache = TickerRulesCache(settings.TICKER_RULES_CACHE_TTL_S)
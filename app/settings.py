@@ -1,9 +1,69 @@
-from pydantic import BaseSettings
+from pydantic import BaseSettings, root_validator
 from dotenv import load_dotenv
 
 load_dotenv(".env")
 
 class Settings(BaseSettings):
-    DATABASE_URL: str
+    DATABASE_URL: str = ""
+    PG_URL: str = ""  # fallback when DATABASE_URL is unset
+
+    # LLM routes (read through app.config.get_settings)
+    OPENAI_API_KEY: str = ""
+    PMDOS_LLM_MODEL: str = "gpt-4.1"
+    PMDOS_LLM_TEMPERATURE: float = 0.2
+    PMDOS_LLM_PROMPT_VERSION: str = "dev"
+    PMDOS_LLM_TIMEOUT_S: float = 20.0
+    PMDOS_LLM_CONNECT_TIMEOUT_S: float = 5.0
+    PMDOS_LLM_MAX_RETRIES: int = 2
+    PMDOS_LLM_MAX_CONNECTIONS: int = 20
+    PMDOS_LLM_KEEPALIVE_S: float = 60.0
+    PMDOS_LLM_BATCH_MAX_ITEMS: int = 50
+    PMDOS_LLM_BATCH_CONCURRENCY: int = 4
+
+    # Async engine pool (per worker process)
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 20
+
+    # Thesis fold: persist a replay checkpoint every K FINAL events per case
+    THESIS_CHECKPOINT_EVERY: int = 50
+
+    # POST /cases/{case_id}/replay:batch
+    REPLAY_BATCH_MAX_POINTS: int = 2000
+
+    # Market data ingestion (app/services/market_data.py)
+    MARKET_SOURCE: str = "yahoo"           # yahoo | file
+    MARKET_FILE_ROOT: str = "data/prices"  # {TICKER}.csv / .parquet for the file source
+    MARKET_INGEST_WORKERS: int = 16
+    MARKET_INGEST_MAX_TICKERS: int = 50    # per POST /market/ingest; use the CLI for bulk loads
+
+    # Per-worker as-of price cache (app/services/price_cache.py)
+    PRICE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+
+    # Memory-mapped columnar price store (app/services/price_store.py); "" = off
+    PRICE_STORE_ROOT: str = ""
+
+    # GET /books/{book}/exposure/series
+    BOOK_SERIES_MAX_DAYS: int = 3660
+
+    # decision_events monthly partitions ensured ahead at startup (app/services/partitions.py)
+    PARTITION_MONTHS_AHEAD: int = 3
+
+    # Per-worker active TICKER_RULE cache (app/services/ticker_rules.py); 0 = off
+    TICKER_RULES_CACHE_TTL_S: float = 30.0
+
+    # NAV used for ADV facts (app/services/adv.py); 0 = unknown, pass ?nav= instead
+    BOOK_NAV_USD: float = 0.0
+
+    # Cold tier for closed cases (app/services/archive.py)
+    ARCHIVE_ROOT: str = "data/archive"
+    ARCHIVE_AFTER_DAYS: int = 180
+    ARCHIVE_CACHE_SEGMENTS: int = 64  # decoded segments kept per worker
+
+    @root_validator(skip_on_failure=True)
+    def _database_url(cls, values):
+        values["DATABASE_URL"] = values.get("DATABASE_URL") or values.get("PG_URL") or ""
+        if not values["DATABASE_URL"]:
+            raise ValueError("Missing DATABASE_URL (or PG_URL)")
+        return values
 
 settings = Settings()
@@ -59,6 +59,33 @@ async function getEventSummaryCached(event) {
   return await p;
 }
 
+async function prefetchEventSummaries(events) {
+  // One batch request for every event not already cached or in flight.
+  const ids = [];
+  for (const e of events || []) {
+    if (e.id && !eventSummaryCache.has(e.id) && !eventSummaryInflight.has(e.id)) ids.push(e.id);
+  }
+  if (ids.length === 0) return;
+
+  const batch = (async () => {
+    try {
+      const out = await llmEventSummaries(ids);
+      for (const item of out.items || []) {
+        if (item.summary) eventSummaryCache.set(item.event_id, item.summary);
+      }
+    } catch {
+      // per-event fallback below
+    }
+  })();
+
+  for (const id of ids) {
+    const p = batch.then(() => eventSummaryCache.get(id) || null);
+    eventSummaryInflight.set(id, p);
+    p.finally(() => eventSummaryInflight.delete(id));
+  }
+  await batch;
+}
+
 async function apiJson(url, options = {}) {
   const res = await fetch(url, options);
   if (!res.ok) {
@@ -82,8 +109,14 @@ async function ensureCase(ticker, book = "default") {
   });
 }
 
-async function fetchEvents(caseId) {
-  return await apiJson(`/api/cases/${caseId}/events`);
+async function fetchEvents(caseId, params = {}) {
+  // params: { limit, order, before, after, event_type, since, until }
+  const qs = new URLSearchParams();
+  for (const [k, v] of Object.entries(params)) {
+    if (v !== null && v !== undefined) qs.set(k, String(v));
+  }
+  const suffix = qs.toString() ? `?${qs}` : "";
+  return await apiJson(`/api/cases/${caseId}/events${suffix}`);
 }
 
 async function createOrReuseDraft(caseId, eventType, seedPayload = {}) {
@@ -98,11 +131,13 @@ async function createOrReuseDraft(caseId, eventType, seedPayload = {}) {
   });
 }
 
-async function patchDraft(caseId, eventId, payloadPatch) {
+async function patchDraft(caseId, eventId, payloadPatch, expectedVersion = null) {
+  const body = { payload_patch: payloadPatch };
+  if (expectedVersion !== null && expectedVersion !== undefined) body.expected_version = expectedVersion;
   return await apiJson(`/api/cases/${caseId}/events/${eventId}`, {
     method: "PATCH",
     headers: { "Content-Type": "application/json" },
-    body: JSON.stringify({ payload_patch: payloadPatch }),
+    body: JSON.stringify(body),
   });
 }
 
@@ -288,8 +323,9 @@ async function renderMiniTimeline() {
   ul.innerHTML = "";
   if (!state.caseId) return;
 
-  const events = await fetchEvents(state.caseId);
-  const last = events.slice(-10).reverse();
+  // newest first, only what we render
+  const last = await fetchEvents(state.caseId, { order: "desc", limit: 10 });
+  await prefetchEventSummaries(last);
 
   for (const e of last) {
     const li = document.createElement("li");
@@ -429,6 +465,14 @@ async function closeCase(caseId) {
   return await apiJson(`/api/cases/${caseId}/close`, { method: "POST" });
 }
 
+async function llmEventSummaries(eventIds) {
+  return await apiJson("/api/llm/event_summaries", {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ event_ids: eventIds }),
+  });
+}
+
 async function llmEventSummary(eventId) {
   return await apiJson("/api/llm/event_summary", {
     method: "POST",
@@ -490,6 +534,7 @@ async function startEventDraft(eventType, seedPayload = {}) {
   const resp = await createOrReuseDraft(state.caseId, eventType, seedPayload);
   state.draft = resp.event;
   state.draft.missing_fields = resp.missing_fields || [];
+  state.draft.facts = resp.facts || null;
   state.pendingField = null;
   state.pendingClarify = null;
   updateRightState();
@@ -524,10 +569,30 @@ function askNextQuestionIfNeeded() {
   state.pendingField = next;
   updateRightState();
 
+  if (next === "constraints") {
+    const line = advFactsLine(state.draft.facts);
+    if (line) appendMessage("sys", line);
+  }
+
   const prompt = state.missingPrompts[next] || fieldHint(next);
   appendMessage("sys", prompt);
 }
 
+function advFactsLine(facts) {
+  // Deterministic ADV facts for RESIZE drafts; shown next to the constraint flags, never sets them.
+  const a = facts && facts.adv;
+  if (!a || a.adv_20d_usd == null) return null;
+  const usd = (x) => `$${Math.round(x).toLocaleString()}`;
+  const pct = (x) => (x == null ? "n/a" : `${x.toFixed(1)}%`);
+  let line = `ADV (as of ${a.asof_date}): 20d ${usd(a.adv_20d_usd)}`;
+  if (a.adv_60d_usd != null) line += `, 60d ${usd(a.adv_60d_usd)}`;
+  if (a.position_usd != null) {
+    line += `. to_pct implies ${usd(a.position_usd)} = ${pct(a.position_pct_adv_20d)} of 20d ADV (${pct(a.position_pct_adv_60d)} of 60d)`;
+    line += `; trade ${usd(a.trade_usd)} = ${pct(a.trade_pct_adv_20d)} of 20d ADV`;
+  }
+  return line + ".";
+}
+
 async function applyAnswerToPendingField(answerText) {
   if (!state.caseId || !state.draft || !state.pendingField) {
     appendMessage("sys", "No active question. Start with: ticker AAPL, then update:/risk:/size:/rule:/post:");
@@ -553,9 +618,10 @@ async function applyAnswerToPendingField(answerText) {
     patch[f] = answerText;
   }
 
-  const resp = await patchDraft(state.caseId, state.draft.id, patch);
+  const resp = await patchDraft(state.caseId, state.draft.id, patch, state.draft.version);
   state.draft = resp.event;
   state.draft.missing_fields = resp.missing_fields || [];
+  state.draft.facts = resp.facts || null;
   state.pendingField = null;
   updateRightState();
 
@@ -616,13 +682,15 @@ async function showEventsInChat() {
     appendMessage("sys", "No ticker selected.");
     return;
   }
-  const events = await fetchEvents(state.caseId);
-  if (!events || events.length === 0) {
+  const latest = await fetchEvents(state.caseId, { order: "desc", limit: 15 });
+  if (!latest || latest.length === 0) {
     appendMessage("sys", "No FINAL events yet.");
     return;
   }
+  const events = latest.reverse();
+  await prefetchEventSummaries(events);
   const lines = [];
-  for (const e of events.slice(-15)) {
+  for (const e of events) {
     const ts = String(e.event_ts || "").slice(0, 19).replace("T", " ");
     const sum = await getEventSummaryCached(e);
     const text = sum && sum.headline ? sum.headline : summarizeEvent(e);
@@ -0,0 +1,92 @@
+"""
+Requests/sec under N concurrent clients against a running server.
+
+Used to compare the sync (threadpool) route handlers with the async
+AsyncSession handlers: run it once against a server started from the
+baseline commit and once against the current tree, same database.
+
+    uvicorn app.main:app --workers 1 --port 8000
+    python bench/bench_concurrency.py --case-id <uuid> --clients 200 --seconds 20
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+import httpx
+
+
+def scenario_requests(case_id: str) -> Dict[str, Callable[[httpx.AsyncClient], "asyncio.Future"]]:
+    asof = datetime.now(timezone.utc).isoformat()
+    return {
+        "get_events": lambda c: c.get(f"/api/cases/{case_id}/events"),
+        "replay": lambda c: c.get(f"/api/cases/{case_id}/replay", params={"asof": asof}),
+        "drafts": lambda c: c.post(f"/api/cases/{case_id}/drafts", json={"event_type": "RISK_NOTE"}),
+    }
+
+
+async def run_client(
+    client: httpx.AsyncClient,
+    make_request: Callable[[httpx.AsyncClient], "asyncio.Future"],
+    deadline: float,
+    latencies: List[float],
+    errors: List[int],
+) -> None:
+    while time.perf_counter() < deadline:
+        t0 = time.perf_counter()
+        try:
+            resp = await make_request(client)
+            if resp.status_code >= 400:
+                errors.append(resp.status_code)
+                continue
+        except httpx.HTTPError:
+            errors.append(0)
+            continue
+        latencies.append(time.perf_counter() - t0)
+
+
+async def run_scenario(base_url: str, name: str, make_request, clients: int, seconds: float) -> None:
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        latencies: List[float] = []
+        errors: List[int] = []
+        deadline = time.perf_counter() + seconds
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(run_client(client, make_request, deadline, latencies, errors) for _ in range(clients))
+        )
+        elapsed = time.perf_counter() - started
+
+    if latencies:
+        latencies.sort()
+        p50 = statistics.median(latencies) * 1000
+        p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    else:
+        p50 = p99 = float("nan")
+    print(
+        f"{name:12s} clients={clients:4d} ok={len(latencies):7d} err={len(errors):5d} "
+        f"rps={len(latencies) / elapsed:9.1f} p50={p50:8.1f}ms p99={p99:8.1f}ms"
+    )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--base-url", default="http://127.0.0.1:8000")
+    ap.add_argument("--case-id", required=True)
+    ap.add_argument("--clients", type=int, default=200)
+    ap.add_argument("--seconds", type=float, default=20.0)
+    ap.add_argument("--scenario", action="append", help="get_events | replay | drafts (default: all)")
+    args = ap.parse_args()
+
+    scenarios = scenario_requests(args.case_id)
+    names = args.scenario or list(scenarios)
+    for name in names:
+        asyncio.run(run_scenario(args.base_url, name, scenarios[name], args.clients, args.seconds))
+
+
+if __name__ == "__main__":
+    main()
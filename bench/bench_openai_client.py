@@ -0,0 +1,113 @@
+"""
+Per-call overhead of the OpenAI client setup, against a local stub server.
+
+Compares the old path (get_settings() re-read + fresh OpenAI client per call)
+with the pooled path (cached settings + process-wide keep-alive client).
+The stub answers instantly, so the difference is client/connection overhead.
+Plain HTTP understates the win: production calls also skip a TLS handshake.
+
+    python bench/bench_openai_client.py --calls 500
+
+No network or API key needed; env is pointed at the stub for the run.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, List
+
+COMPLETION = {
+    "id": "chatcmpl-stub",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "stub",
+    "choices": [
+        {
+            "index": 0,
+            "finish_reason": "stop",
+            "message": {"role": "assistant", "content": json.dumps({"headline": "stub", "bullets": [], "tags": []})},
+        }
+    ],
+    "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_POST(self) -> None:  # noqa: N802
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        body = json.dumps(COMPLETION).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def timed(fn: Callable[[], None], calls: int) -> List[float]:
+    out: List[float] = []
+    for _ in range(calls):
+        t0 = time.perf_counter()
+        fn()
+        out.append((time.perf_counter() - t0) * 1000)
+    return out
+
+
+def report(name: str, ms: List[float]) -> None:
+    ms = sorted(ms)
+    print(f"{name:28s} mean={statistics.mean(ms):7.3f}ms p50={statistics.median(ms):7.3f}ms p99={ms[int(len(ms) * 0.99) - 1]:7.3f}ms")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--calls", type=int, default=500)
+    args = ap.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+    os.environ.setdefault("DATABASE_URL", "postgresql://stub/stub")
+
+    from openai import OpenAI
+
+    from app.api.utils import openai_client
+    from app.config import get_settings
+    from app.settings import Settings as AppSettings
+
+    kwargs = dict(system="s", user="u", json_schema={"type": "object"})
+
+    def old_path() -> None:
+        AppSettings()  # old path: env re-read + validated per call
+        s = get_settings.__wrapped__()
+        client = OpenAI(api_key=s.openai_api_key)  # fresh pool, new connection
+        resp = client.chat.completions.create(**openai_client._completion_kwargs(s, **kwargs))
+        openai_client._parse_content(resp)
+        client.close()
+
+    def pooled_path() -> None:
+        openai_client.call_structured(**kwargs)
+
+    old_path()
+    pooled_path()  # warm the pool
+
+    report("fresh client per call", timed(old_path, args.calls))
+    report("pooled client + cached env", timed(pooled_path, args.calls))
+    report("settings re-read from env", timed(AppSettings, args.calls))
+    report("get_settings cached", timed(get_settings, args.calls))
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
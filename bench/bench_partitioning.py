@@ -0,0 +1,171 @@
+"""
+decision_events layout: one heap vs monthly RANGE partitions on event_ts.
+
+Loads the same synthetic journal (default 50M rows, spread over --months
+months and --cases cases) into two scratch tables in schema bench_part:
+
+- events_flat: PK (id), indexes (case_id, event_ts) and (event_ts)
+- events_part: PARTITION BY RANGE (event_ts), one partition per month,
+  PK (id, event_ts), same indexes (per partition)
+
+and reports index sizes (total, and largest single index B-tree) plus
+latency of the two replay-shaped reads:
+
+- full:  case_id = :c AND event_ts <= :asof               (replay / compile_thesis)
+- tail:  case_id = :c AND event_ts > :since AND <= :asof  (fold from a checkpoint)
+
+    DATABASE_URL=postgresql+psycopg2://... python bench/bench_partitioning.py --rows 50000000
+
+Loading 50M rows takes a while and ~20GB of disk; use --rows for a smaller
+run and --keep to reuse the tables (--skip-load).
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List, Tuple
+
+from sqlalchemy import text
+
+from app.db.session import engine
+
+SCHEMA = "bench_part"
+START = datetime(2020, 1, 1, tzinfo=timezone.utc)
+BATCH_ROWS = 1_000_000
+
+INSERT_SQL = """
+INSERT INTO {table} (id, case_id, event_ts, event_type, payload)
+SELECT md5(g::text || '{table}')::uuid,
+       md5((g % :cases)::text)::uuid,
+       :start + (g::float8 / :rows) * (:span_s * interval '1 second'),
+       (ARRAY['THESIS_UPDATE','RISK_NOTE','RESIZE','INITIATE'])[1 + g % 4],
+       jsonb_build_object('to_pct', g % 10, 'note', 'synthetic')
+FROM generate_series(:lo, :hi - 1) AS g
+"""
+
+
+def create_tables(conn, months: int) -> None:
+    conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    cols = "id uuid NOT NULL, case_id uuid NOT NULL, event_ts timestamptz NOT NULL, event_type text NOT NULL, payload jsonb NOT NULL"
+    conn.execute(text(f"CREATE TABLE {SCHEMA}.events_flat ({cols}, PRIMARY KEY (id))"))
+    conn.execute(text(f"CREATE TABLE {SCHEMA}.events_part ({cols}, PRIMARY KEY (id, event_ts)) PARTITION BY RANGE (event_ts)"))
+    m = START
+    for _ in range(months):
+        nxt = (m + timedelta(days=32)).replace(day=1)
+        conn.execute(
+            text(
+                f"CREATE TABLE {SCHEMA}.events_part_p{m:%Y%m} PARTITION OF {SCHEMA}.events_part "
+                f"FOR VALUES FROM ('{m.isoformat()}') TO ('{nxt.isoformat()}')"
+            )
+        )
+        m = nxt
+
+
+def load(rows: int, cases: int, months: int) -> None:
+    span_s = (months * 30 - 1) * 86400
+    for table in ("events_flat", "events_part"):
+        t0 = time.perf_counter()
+        for lo in range(0, rows, BATCH_ROWS):
+            with engine.begin() as conn:
+                conn.execute(
+                    text(INSERT_SQL.format(table=f"{SCHEMA}.{table}")),
+                    {"cases": cases, "start": START, "rows": rows, "span_s": span_s, "lo": lo, "hi": min(rows, lo + BATCH_ROWS)},
+                )
+        with engine.begin() as conn:
+            conn.execute(text(f"CREATE INDEX ON {SCHEMA}.{table} (case_id, event_ts)"))
+            conn.execute(text(f"CREATE INDEX ON {SCHEMA}.{table} (event_ts)"))
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text(f"VACUUM ANALYZE {SCHEMA}.{table}"))
+        print(f"loaded {table}: {rows} rows in {time.perf_counter() - t0:.0f}s")
+
+
+def index_sizes(conn, table: str) -> Tuple[int, int]:
+    """
+    (total bytes of all indexes incl. partitions, largest single index).
+    """
+    rows = conn.execute(
+        text(
+            """
+            SELECT pg_relation_size(i.indexrelid) AS size
+            FROM pg_partition_tree(CAST(:t AS regclass)) p
+            JOIN pg_index i ON i.indrelid = p.relid
+            WHERE p.isleaf
+            """
+        ),
+        {"t": f"{SCHEMA}.{table}"},
+    ).scalars().all()
+    return sum(rows), max(rows) if rows else 0
+
+
+def measure(conn, sql: str, params: List[dict]) -> Tuple[float, float]:
+    lat: List[float] = []
+    stmt = text(sql)
+    for p in params:
+        t0 = time.perf_counter()
+        conn.execute(stmt, p).fetchall()
+        lat.append((time.perf_counter() - t0) * 1000)
+    lat.sort()
+    return statistics.median(lat), lat[int(len(lat) * 0.95) - 1]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=50_000_000)
+    ap.add_argument("--cases", type=int, default=50_000)
+    ap.add_argument("--months", type=int, default=60)
+    ap.add_argument("--calls", type=int, default=500)
+    ap.add_argument("--skip-load", action="store_true")
+    ap.add_argument("--keep", action="store_true", help="Keep schema bench_part afterwards")
+    args = ap.parse_args()
+
+    if not args.skip_load:
+        with engine.begin() as conn:
+            create_tables(conn, args.months)
+        load(args.rows, args.cases, args.months)
+
+    rnd = random.Random(0)
+    end = START + timedelta(days=args.months * 30 - 1)
+    params = []
+    for _ in range(args.calls):
+        asof = START + (end - START) * rnd.random()
+        params.append(
+            {
+                "c": hashlib.md5(str(rnd.randrange(args.cases)).encode()).hexdigest(),
+                "asof": asof,
+                "since": asof - timedelta(days=30),
+            }
+        )
+
+    with engine.connect() as conn:
+        for table in ("events_flat", "events_part"):
+            total, largest = index_sizes(conn, table)
+            full = measure(
+                conn,
+                f"SELECT id, event_ts, event_type, payload FROM {SCHEMA}.{table} "
+                "WHERE case_id = CAST(:c AS uuid) AND event_ts <= :asof ORDER BY event_ts, id",
+                params,
+            )
+            tail = measure(
+                conn,
+                f"SELECT id, event_ts, event_type, payload FROM {SCHEMA}.{table} "
+                "WHERE case_id = CAST(:c AS uuid) AND event_ts > :since AND event_ts <= :asof ORDER BY event_ts, id",
+                params,
+            )
+            print(
+                f"{table:>12}: indexes={total / 2**20:.0f}MiB largest={largest / 2**20:.0f}MiB "
+                f"full p50={full[0]:.2f}ms p95={full[1]:.2f}ms "
+                f"tail p50={tail[0]:.2f}ms p95={tail[1]:.2f}ms"
+            )
+
+    if not args.keep:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+
+
+if __name__ == "__main__":
+    main()
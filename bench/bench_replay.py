@@ -0,0 +1,131 @@
+"""
+Replay latency: the old four-query path vs the single-statement REPLAY_SQL.
+
+The old path runs case / events / latest snapshot / market price as separate
+round trips and serializes ORM rows in Python. The new path is one LATERAL
+query whose JSON body is passed through untouched, with the market summary
+from the per-worker price cache. Both fold from the nearest checkpoint, so the
+difference is round trips + serialization.
+
+    DATABASE_URL=postgresql+psycopg2://... python bench/bench_replay.py --case-id <uuid> --calls 200
+
+Run against a case with a realistic number of FINAL events.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, List
+from uuid import UUID
+
+from sqlalchemy import select
+
+from app.api.routes.thesis import REPLAY_SQL, market_summary_asof, sa_to_dict, tail_event
+from app.db.session import AsyncSessionLocal
+from app.models.decision_events import DecisionEvent
+from app.models.market_prices import MarketPriceDaily
+from app.models.thesis_snapshots import ThesisSnapshot
+from app.models.trade_cases import TradeCase
+from app.services.thesis_state import (
+    CHECKPOINT_MODEL,
+    empty_state,
+    fold_with_checkpoints,
+    folded_state_asof,
+    not_checkpoint,
+)
+from app.settings import settings
+
+
+async def four_query(case_id: UUID, asof: datetime) -> bytes:
+    async with AsyncSessionLocal() as db:
+        case = (await db.execute(select(TradeCase).where(TradeCase.id == case_id))).scalars().first()
+        state = await folded_state_asof(db, case_id, asof, checkpoint_every=settings.THESIS_CHECKPOINT_EVERY)
+        events = (
+            await db.execute(
+                select(DecisionEvent)
+                .where(
+                    DecisionEvent.case_id == case_id,
+                    DecisionEvent.status == "FINAL",
+                    DecisionEvent.event_ts <= asof,
+                )
+                .order_by(DecisionEvent.event_ts.asc(), DecisionEvent.id.asc())
+            )
+        ).scalars().all()
+        snapshot = (
+            await db.execute(
+                select(ThesisSnapshot)
+                .where(ThesisSnapshot.case_id == case_id, ThesisSnapshot.asof_ts <= asof, not_checkpoint())
+                .order_by(ThesisSnapshot.asof_ts.desc())
+                .limit(1)
+            )
+        ).scalars().first()
+        mp = (
+            await db.execute(
+                select(MarketPriceDaily)
+                .where(MarketPriceDaily.ticker == case.ticker, MarketPriceDaily.date <= asof.date())
+                .order_by(MarketPriceDaily.date.desc())
+                .limit(1)
+            )
+        ).scalars().first()
+        out = {
+            "case": sa_to_dict(case),
+            "state": state,
+            "events": [sa_to_dict(e) for e in events],
+            "latest_snapshot": sa_to_dict(snapshot) if snapshot else None,
+            "market_summary": {"date": str(mp.date), "close": float(mp.close)} if mp else None,
+        }
+        return json.dumps(out, default=str).encode("utf-8")
+
+
+async def single_statement(case_id: UUID, asof: datetime) -> bytes:
+    async with AsyncSessionLocal() as db:
+        row = (
+            await db.execute(
+                REPLAY_SQL,
+                {"case_id": case_id, "asof": asof, "include_events": True, "checkpoint_model": CHECKPOINT_MODEL},
+            )
+        ).first()
+        base = row.checkpoint["state"] if row.checkpoint else empty_state()
+        state, _ = fold_with_checkpoints(case_id, base, (tail_event(e) for e in row.tail), checkpoint_every=0)
+        market = await market_summary_asof(db, row.ticker, asof)
+        body = (
+            row.body[:-1]
+            + ',"state":' + json.dumps(state, separators=(",", ":"))
+            + ',"market_summary":' + json.dumps(market, separators=(",", ":"))
+            + "}"
+        )
+        return body.encode("utf-8")
+
+
+async def measure(name: str, fn: Callable[[UUID, datetime], Awaitable[bytes]], case_id: UUID, asof: datetime, calls: int) -> None:
+    await fn(case_id, asof)  # warm pool + checkpoints
+    lat: List[float] = []
+    size = 0
+    for _ in range(calls):
+        t0 = time.perf_counter()
+        size = len(await fn(case_id, asof))
+        lat.append((time.perf_counter() - t0) * 1000)
+    lat.sort()
+    print(
+        f"{name:>17}: p50={statistics.median(lat):.2f}ms "
+        f"p95={lat[int(len(lat) * 0.95) - 1]:.2f}ms bytes={size}"
+    )
+
+
+async def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--case-id", type=UUID, required=True)
+    ap.add_argument("--asof", type=datetime.fromisoformat, default=datetime.now(timezone.utc))
+    ap.add_argument("--calls", type=int, default=200)
+    args = ap.parse_args()
+
+    await measure("four-query", four_query, args.case_id, args.asof, args.calls)
+    await measure("single-statement", single_statement, args.case_id, args.asof, args.calls)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
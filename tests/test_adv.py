@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.adv import adv_from_rows, resize_adv_facts
+
+
+def rows(ticker, n, volume=1000.0, close=10.0):
+    last = date(2024, 6, 28)
+    return [SimpleNamespace(ticker=ticker, date=last - timedelta(days=k), volume=volume, close=close) for k in range(n)]
+
+
+@pytest.mark.filterwarnings("error::RuntimeWarning")
+def test_adv_windows_and_min_observations():
+    data = rows("AAPL", 60) + rows("NEW", 15, volume=500.0)
+    out = adv_from_rows(data, ["AAPL", "NEW", "NONE"])
+
+    assert out["AAPL"]["adv_20d_shares"] == 1000.0
+    assert out["AAPL"]["adv_60d_usd"] == 10000.0
+    assert out["AAPL"]["asof_date"] == "2024-06-28"
+    # 15 bars: enough for 20d (>= 10), not for 60d (< 30).
+    assert out["NEW"]["adv_20d_shares"] == 500.0
+    assert out["NEW"]["adv_60d_shares"] is None
+    assert out["NONE"] == {
+        "ticker": "NONE",
+        "asof_date": None,
+        "adv_20d_shares": None,
+        "adv_20d_usd": None,
+        "adv_60d_shares": None,
+        "adv_60d_usd": None,
+    }
+
+
+def test_resize_facts():
+    adv = {"adv_20d_usd": 1_000_000.0, "adv_60d_usd": 2_000_000.0}
+    out = resize_adv_facts(adv, to_pct=-2.0, from_pct=1.0, nav=100_000_000.0)
+    assert out["position_usd"] == pytest.approx(2_000_000.0)
+    assert out["trade_usd"] == pytest.approx(3_000_000.0)
+    assert out["position_pct_adv_20d"] == pytest.approx(200.0)
+    assert out["trade_pct_adv_60d"] == pytest.approx(150.0)
+
+
+def test_resize_facts_without_nav():
+    out = resize_adv_facts({"adv_20d_usd": 1.0}, to_pct=2.0, nav=0.0)
+    assert out["position_usd"] is None
+    assert out["position_pct_adv_20d"] is None
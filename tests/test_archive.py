@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import os
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+import pytest
+
+from app.services import archive
+from app.services.archive import decode_event, fold_event, lines_asof, merge_events, read_segment, write_segment
+
+T0 = datetime(2024, 3, 1, 12, tzinfo=timezone.utc)
+ID1 = UUID("00000000-0000-0000-0000-000000000001")
+ID2 = UUID("00000000-0000-0000-0000-000000000002")
+CASE = UUID("00000000-0000-0000-0000-0000000000ca")
+
+
+def line(event_id, ts, event_type="NOTE"):
+    return {
+        "id": str(event_id),
+        "case_id": str(CASE),
+        "event_ts": ts.isoformat(),
+        "event_type": event_type,
+        "payload": {"text": "x"},
+        "status": "FINAL",
+        "version": 1,
+        "updated_at": None,
+        "created_at": ts.isoformat(),
+    }
+
+
+def test_segment_round_trip(tmp_path):
+    lines = [line(ID1, T0), line(ID2, T0 + timedelta(hours=1))]
+    sha = write_segment(str(tmp_path), "2024/case.jsonl.gz", lines)
+
+    assert read_segment(str(tmp_path), "2024/case.jsonl.gz", sha) == tuple(lines)
+    assert not [p for p in os.listdir(tmp_path / "2024") if p.endswith(".tmp")]
+    e = decode_event(lines[0])
+    assert e["id"] == ID1 and e["event_ts"] == T0 and e["updated_at"] is None
+    assert fold_event(lines[1])["event_ts"] == T0 + timedelta(hours=1)
+
+
+def test_segment_sha_mismatch(tmp_path):
+    sha = write_segment(str(tmp_path), "2024/bad.jsonl.gz", [line(ID1, T0)])
+    with open(tmp_path / "2024" / "bad.jsonl.gz", "wb") as f:
+        f.write(gzip.compress(b"{}\n"))
+    with pytest.raises(RuntimeError):
+        read_segment(str(tmp_path), "2024/bad.jsonl.gz", sha)
+
+
+def test_merge_events_orders_segment_lines_and_hot_rows():
+    hot = {"id": ID1, "event_ts": T0 + timedelta(hours=2), "event_type": "TICKER_RULE"}
+    raw = line(ID2, T0)
+    tie = decode_event(line(ID1, T0))
+    assert merge_events([raw], [hot, tie]) == [tie, raw, hot]
+
+
+def test_naive_asof_is_taken_as_utc(monkeypatch):
+    lines = (line(ID1, T0), line(ID2, T0 + timedelta(hours=1)))
+    naive = datetime(2024, 3, 1, 12, 30)
+    assert lines_asof(lines, naive) == [lines[0]]
+
+    async def segment(db, case_id):
+        return lines
+
+    monkeypatch.setattr(archive, "archived_events", segment)
+    out = asyncio.run(archive.archived_fold_events(None, CASE, naive))
+    assert [e["id"] for e in out] == [str(ID1)]
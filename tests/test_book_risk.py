@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+from app.services.book_risk import risk_facts
+
+
+def test_single_name_vol_and_concentration():
+    X = np.asarray([[0.01], [-0.01], [0.02], [0.0]])
+    out = risk_facts({"AAPL": 0.5}, X, ["AAPL"])
+    expected = 0.5 * float(np.std(X[:, 0], ddof=1))
+    assert math.isclose(out["realized_vol_daily"], expected, rel_tol=1e-6)
+    assert math.isclose(out["realized_vol_annual"], expected * math.sqrt(252), rel_tol=1e-6)
+    assert out["herfindahl"] == 1.0 and out["effective_n"] == 1.0
+    assert out["top_contributors"][0]["ticker"] == "AAPL"
+    assert math.isclose(out["top_contributors"][0]["variance_share"], 1.0)
+
+
+def test_hedged_pair_and_short_history():
+    r = np.asarray([0.01, -0.02, 0.015, 0.005, -0.01])
+    X = np.column_stack([r, r, [np.nan, np.nan, np.nan, np.nan, 0.01]])
+    out = risk_facts({"A": 0.5, "B": -0.5, "C": 0.1}, X, ["A", "B", "C"], include_corr=True)
+    assert out["insufficient_history"] == ["C"]
+    assert out["realized_vol_daily"] == 0.0  # perfectly hedged
+    assert out["avg_pairwise_corr"] == 1.0
+    assert out["corr"]["tickers"] == ["A", "B"]
+    # C still counts in concentration.
+    assert math.isclose(out["herfindahl"], (0.5**2 + 0.5**2 + 0.1**2) / 1.1**2, rel_tol=1e-6)
+
+
+def test_empty_window():
+    out = risk_facts({"A": 1.0}, np.empty((0, 1)), ["A"])
+    assert out["window_days"] == 0
+    assert out["realized_vol_daily"] is None
+    assert out["insufficient_history"] == ["A"]
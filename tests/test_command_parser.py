@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import pytest
+
+from app.api.utils.command_parser import parse_command
+
+
+def test_pending_field_takes_the_input_as_answer():
+    action = parse_command("  5% of NAV ", pending_field="position_intent_pct")
+    assert action["type"] == "ANSWER_FIELD"
+    assert action["field"] == "position_intent_pct"
+    assert action["answer_text"] == "5% of NAV"
+
+
+@pytest.mark.parametrize(
+    "text,action_type",
+    [("events", "SHOW_EVENTS"), ("Draft", "SHOW_DRAFT"), ("finalize", "FINALIZE_DRAFT"), ("cancel", "CANCEL")],
+)
+def test_utility_commands(text, action_type):
+    assert parse_command(text)["type"] == action_type
+
+
+def test_ticker_sets_context():
+    action = parse_command("ticker BRK.B")
+    assert action["type"] == "SET_CONTEXT"
+    assert action["ticker"] == "BRK.B"
+
+
+def test_lowercase_ticker_is_not_matched():
+    assert parse_command("ticker aapl") is None
+
+
+@pytest.mark.parametrize("text", ["long AAPL", "short MSFT"])
+def test_long_short_is_left_to_the_console(text):
+    assert parse_command(text) is None
+
+
+def test_event_starter_seeds_the_remaining_text():
+    action = parse_command("risk: earnings next week")
+    assert action["type"] == "START_EVENT"
+    assert action["event_type"] == "RISK_NOTE"
+    assert action["seed_payload"] == {"note": "earnings next week"}
+
+
+def test_event_starter_without_text_has_no_seed():
+    action = parse_command("update:")
+    assert action["event_type"] == "THESIS_UPDATE"
+    assert action["seed_payload"] is None
+
+
+@pytest.mark.parametrize("text", ["", "   ", "what is my exposure?"])
+def test_free_text_goes_to_the_model(text):
+    assert parse_command(text) is None
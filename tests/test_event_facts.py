@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import numpy as np
+
+from app.services.event_facts import forward_returns
+
+
+def days(*ds):
+    return np.asarray(ds, dtype="datetime64[D]")
+
+
+def test_forward_returns_merge_as_of_the_last_bar_on_or_before_the_event():
+    px_days = days("2024-01-02", "2024-01-03", "2024-01-04", "2024-01-05")
+    px = np.asarray([100.0, 110.0, 121.0, 133.1])
+    # Weekend event maps to Friday's bar; an event before the series has no base.
+    ev_days = days("2024-01-02", "2024-01-06", "2023-12-29")
+
+    base, out = forward_returns(px_days, px, ev_days, horizons=(1, 2))
+
+    assert base.tolist() == [0, 3, -1]
+    np.testing.assert_allclose(out[1][0], 0.1)
+    np.testing.assert_allclose(out[2][0], 0.21)
+    assert np.isnan(out[1][1])  # no bar after the base yet
+    assert np.isnan(out[1][2]) and np.isnan(out[2][2])
+
+
+def test_zero_base_price_gives_nan_not_inf():
+    base, out = forward_returns(days("2024-01-02", "2024-01-03"), np.asarray([0.0, 5.0]), days("2024-01-02"), horizons=(1,))
+    assert base.tolist() == [0]
+    assert np.isnan(out[1][0])
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.routes.events import archived_page, encode_cursor, parse_event_ts
+
+T0 = datetime(2024, 3, 1, 12, tzinfo=timezone.utc)
+
+
+def ev(k, event_type="NOTE"):
+    return {"id": UUID(int=k), "event_ts": T0 + timedelta(hours=k), "event_type": event_type}
+
+
+EVENTS = [ev(1, "INITIATE"), ev(2), ev(3, "RESIZE"), ev(4), ev(5, "CLOSE")]
+
+
+def ids(events):
+    return [e["id"].int for e in events]
+
+
+def test_parse_event_ts_is_always_aware():
+    assert parse_event_ts("2024-03-01T12:00:00") == T0
+    assert parse_event_ts("2024-03-01T13:00:00Z") == T0 + timedelta(hours=1)
+    assert parse_event_ts(datetime(2024, 3, 1, 12)) == T0
+    assert parse_event_ts(None).tzinfo is not None
+    with pytest.raises(HTTPException):
+        parse_event_ts("yesterday")
+
+
+def test_archived_page_order_limit_and_filters():
+    assert ids(archived_page(EVENTS)) == [1, 2, 3, 4, 5]
+    assert ids(archived_page(EVENTS, order="desc", limit=2)) == [5, 4]
+    assert ids(archived_page(EVENTS, event_type="NOTE")) == [2, 4]
+    # Naive bounds are taken as UTC.
+    assert ids(archived_page(EVENTS, since=datetime(2024, 3, 1, 14), until=T0 + timedelta(hours=4))) == [2, 3, 4]
+
+
+def test_archived_page_cursors_are_exclusive():
+    after = encode_cursor(EVENTS[1]["event_ts"], EVENTS[1]["id"])
+    before = encode_cursor(EVENTS[4]["event_ts"], EVENTS[4]["id"])
+    assert ids(archived_page(EVENTS, after=after)) == [3, 4, 5]
+    assert ids(archived_page(EVENTS, after=after, before=before, order="desc")) == [4, 3]
+    with pytest.raises(HTTPException):
+        archived_page(EVENTS, after="not-a-cursor")
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+from app.services.exposure import exposure_from_positions, exposure_series
+
+A, B = uuid4(), uuid4()
+
+
+def ts(day, hour=12):
+    return datetime(2024, 1, day, hour, tzinfo=timezone.utc)
+
+
+def test_exposure_from_positions_totals_and_unsigned():
+    rows = [
+        SimpleNamespace(case_id=A, ticker="AAPL", direction="LONG", pct=3.0),
+        SimpleNamespace(case_id=B, ticker="MSFT", direction="short", pct=1.5),
+        SimpleNamespace(case_id=uuid4(), ticker="AAPL", direction="LONG", pct=1.0),
+        SimpleNamespace(case_id=uuid4(), ticker="TSLA", direction=None, pct=2.0),
+    ]
+    out = exposure_from_positions(rows)
+    assert (out["long"], out["short"], out["gross"], out["net"]) == (4.0, 1.5, 5.5, 2.5)
+    assert out["weights"] == [{"ticker": "AAPL", "weight": 4.0}, {"ticker": "MSFT", "weight": -1.5}]
+    assert [p["ticker"] for p in out["unsigned"]] == ["TSLA"]
+
+
+def test_exposure_series_sweeps_opens_events_and_closes():
+    cases = [
+        SimpleNamespace(id=A, opened_at=ts(1, 9), closed_at=ts(4, 9)),
+        SimpleNamespace(id=B, opened_at=ts(2, 9), closed_at=None),
+    ]
+    events = [
+        SimpleNamespace(case_id=A, event_ts=ts(1), event_type="INITIATE", direction="LONG", pct=2.0),
+        SimpleNamespace(case_id=B, event_ts=ts(2), event_type="INITIATE", direction="SHORT", pct=1.0),
+        SimpleNamespace(case_id=A, event_ts=ts(3), event_type="RESIZE", direction=None, pct=5.0),
+    ]
+    out = exposure_series(cases, events, date(2024, 1, 1), date(2024, 1, 4))
+    assert [d["date"] for d in out] == ["2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04"]
+    assert [(d["long"], d["short"], d["positions"]) for d in out] == [
+        (2.0, 0.0, 1),
+        (2.0, 1.0, 2),
+        (5.0, 1.0, 2),
+        (0.0, 1.0, 1),
+    ]
+    assert out[2]["gross"] == 6.0 and out[2]["net"] == 4.0
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import io
+import math
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from app.services.market_data import WARMUP_DAYS, FileSource, copy_from, full_rows, roll_forward, rolling_stats
+
+
+def naive_stats(prices, window):
+    ret = [math.nan] + [prices[i] / prices[i - 1] - 1.0 for i in range(1, len(prices))]
+    vol = [math.nan] * len(prices)
+    for i in range(window, len(prices)):
+        w = ret[i - window + 1 : i + 1]
+        vol[i] = float(np.std(w, ddof=1)) if not any(math.isnan(x) for x in w) else math.nan
+    return np.asarray(ret), np.asarray(vol)
+
+
+@pytest.fixture
+def prices():
+    rng = np.random.default_rng(7)
+    return 100.0 * np.cumprod(1.0 + rng.normal(0.0, 0.01, 80))
+
+
+def test_rolling_stats_matches_naive(prices):
+    ret, vol = rolling_stats(prices, window=5)
+    exp_ret, exp_vol = naive_stats(prices.tolist(), 5)
+    np.testing.assert_allclose(ret, exp_ret, equal_nan=True)
+    np.testing.assert_allclose(vol, exp_vol, rtol=1e-9, equal_nan=True)
+    assert np.isnan(vol[:5]).all() and not np.isnan(vol[5:]).any()
+
+
+def test_rolling_stats_nan_return_blanks_its_windows(prices):
+    prices = prices.copy()
+    prices[30] = 0.0  # ret[31] is inf -> NaN
+    _, vol = rolling_stats(prices, window=5)
+    assert np.isnan(vol[31:36]).all()
+    assert not np.isnan(vol[36])
+
+
+def test_roll_forward_continues_rolling_stats(prices):
+    window = 20
+    split = 50
+    _, full_vol = rolling_stats(prices, window)
+    full_ret, _ = rolling_stats(prices, window)
+    ret, vol = roll_forward(prices[split - window - 1 : split], prices[split:], window)
+    np.testing.assert_allclose(ret, full_ret[split:], rtol=1e-12)
+    np.testing.assert_allclose(vol, full_vol[split:], rtol=1e-9)
+
+
+def test_full_rows_with_start_keeps_warmup_stats(tmp_path, prices):
+    first = date(2024, 1, 1)
+    days = [first + timedelta(days=k) for k in range(len(prices))]
+    with open(tmp_path / "ABC.csv", "w") as f:
+        f.write("date,close\n")
+        for d, p in zip(days, prices.tolist()):
+            f.write(f"{d.isoformat()},{p!r}\n")
+
+    start = days[40]
+    assert start - timedelta(days=WARMUP_DAYS) <= days[0]
+    bars, ret, vol, mode = full_rows(FileSource(str(tmp_path)), "abc", start, None)
+
+    _, all_vol = rolling_stats(prices)
+    assert mode == "full"
+    assert bars.ticker == "ABC"
+    assert bars.dates[0] == np.datetime64(start, "D")
+    assert len(bars) == len(prices) - 40
+    assert not np.isnan(ret[0]) and not np.isnan(vol[0])
+    np.testing.assert_allclose(vol, all_vol[40:])
+
+
+def test_full_rows_missing_ticker(tmp_path):
+    bars, ret, vol, mode = full_rows(FileSource(str(tmp_path)), "NOPE", None, None)
+    assert bars is None and ret.size == 0 and mode == "full"
+
+
+class Psycopg3Cursor:
+    """The COPY surface of a psycopg 3 cursor (no copy_expert)."""
+
+    def __init__(self):
+        self.sql = None
+        self.data = []
+
+    def copy(self, sql):
+        self.sql = sql
+        cursor = self
+
+        class Copy:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def write(self, chunk):
+                cursor.data.append(chunk)
+
+        return Copy()
+
+
+def test_copy_from_uses_cursor_copy_without_copy_expert():
+    cur = Psycopg3Cursor()
+    copy_from(cur, "COPY t FROM STDIN", io.StringIO("a,1\nb,2\n"))
+    assert cur.sql == "COPY t FROM STDIN"
+    assert "".join(cur.data) == "a,1\nb,2\n"
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from datetime import date
+
+from app.services.price_cache import PriceCache, make_series
+
+
+def series(ticker="AAPL"):
+    return make_series(ticker, [(date(2024, 1, 2), 10.0), (date(2024, 1, 4), 11.0)])
+
+
+def test_summary_asof():
+    s = series()
+    assert s.summary_asof(date(2024, 1, 3)) == {"date": "2024-01-02", "close": 10.0}
+    assert s.summary_asof(date(2024, 1, 1)) is None
+
+
+def test_put_after_invalidate_is_dropped():
+    cache = PriceCache(max_bytes=1 << 20)
+    gen = cache.generation("AAPL")
+    cache.invalidate(["AAPL"])
+    cache.put(series(), generation=gen)
+    assert cache.get_cached("AAPL") is None
+
+    cache.put(series(), generation=cache.generation("AAPL"))
+    assert cache.get_cached("AAPL") is not None
+
+
+def test_clear_runs_callbacks_and_stales_pending_puts():
+    cache = PriceCache(max_bytes=1 << 20)
+    cleared = []
+    cache.on_clear.append(lambda: cleared.append(True))
+    gen = cache.generation("MSFT")
+    cache.clear()
+    cache.put(series("MSFT"), generation=gen)
+    assert cleared == [True]
+    assert cache.get_cached("MSFT") is None
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import threading
+
+import numpy as np
+
+from app.services.price_store import COLUMNS, PriceStore
+
+
+def test_write_then_read_current_version(tmp_path):
+    store = PriceStore(str(tmp_path))
+    cols = {c: np.arange(3, dtype=np.int32 if c == "days" else np.float64) for c in COLUMNS}
+    store.write("aapl", cols)
+    out = store.columns("AAPL")
+    np.testing.assert_array_equal(out["close"], cols["close"])
+
+
+def test_concurrent_manifest_updates_keep_every_entry(tmp_path):
+    stores = [PriceStore(str(tmp_path)) for _ in range(8)]
+    threads = [
+        threading.Thread(
+            target=lambda s=s, i=i: [s.update_manifest({f"T{i}_{k}": {"rows": k}}) for k in range(25)]
+        )
+        for i, s in enumerate(stores)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(stores[0].read_manifest()) == 8 * 25
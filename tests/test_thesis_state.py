@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from app.services.thesis_state import apply_event, empty_state, fold, fold_asofs, state_cursor
+
+T0 = datetime(2024, 1, 2, tzinfo=timezone.utc)
+
+
+def event(event_type, payload, minutes):
+    return {"id": uuid4(), "event_ts": T0 + timedelta(minutes=minutes), "event_type": event_type, "payload": payload}
+
+
+INITIATE = event(
+    "INITIATE",
+    {
+        "direction": "LONG",
+        "horizon_days": 90,
+        "entry_thesis": "margin recovery",
+        "key_drivers": ["margins", "buyback"],
+        "key_risks": ["china"],
+        "invalidation_triggers": ["guide cut"],
+        "conviction": 60,
+        "position_intent_pct": 2.0,
+    },
+    0,
+)
+UPDATE = event(
+    "THESIS_UPDATE",
+    {"drivers_delta": {"add": ["pricing"], "remove": ["buyback"]}, "conviction_delta": 50},
+    10,
+)
+RESIZE = event("RESIZE", {"to_pct": 3.5}, 20)
+RISK = event("RISK_NOTE", {"risk_type": "EARNINGS"}, 30)
+EVENTS = [INITIATE, UPDATE, RESIZE, RISK]
+
+
+def test_fold_applies_every_event_type():
+    state = fold(EVENTS)
+    assert state["direction"] == "LONG"
+    assert state["drivers"] == ["margins", "pricing"]
+    assert state["risks"] == ["china"]
+    assert state["conviction"] == 100  # 60 + 50 clamped
+    assert state["position_pct"] == 3.5
+    assert state["risk_notes"] == 1
+    assert state["event_count"] == 4
+    assert state["last_event_id"] == str(RISK["id"])
+    assert state_cursor(state) == (RISK["event_ts"], RISK["id"])
+
+
+def test_fold_does_not_mutate_the_start_state():
+    base = fold(EVENTS[:2])
+    before = repr(base)
+    fold(EVENTS[2:], base)
+    assert repr(base) == before
+
+
+def test_fold_from_a_checkpoint_matches_a_full_fold():
+    assert fold(EVENTS[2:], fold(EVENTS[:2])) == fold(EVENTS)
+
+
+def test_conviction_delta_without_conviction_is_ignored():
+    state = apply_event(empty_state(), UPDATE)
+    assert state["conviction"] is None
+    assert state["event_count"] == 1
+
+
+def test_fold_asofs_matches_fold_per_point_in_input_order():
+    asofs = [RESIZE["event_ts"], T0 - timedelta(days=1), UPDATE["event_ts"] + timedelta(seconds=1)]
+    states = fold_asofs(EVENTS, asofs)
+    assert states[0] == fold(e for e in EVENTS if e["event_ts"] <= asofs[0])
+    assert states[1] == empty_state()
+    assert states[2] == fold(EVENTS[:2])
+    states[0]["drivers"].append("x")
+    assert "x" not in states[2]["drivers"]
@@ -0,0 +1,75 @@
+"""
+The active TICKER_RULE lookup must use ix_decision_events_ticker_rule.
+
+EXPLAINs the exact statement list_ticker_rules runs (active_rules_stmt) with
+enable_seqscan = off, so the assertion is about the index being *usable*
+(expression and partial predicate match the query) rather than about the
+planner's choice on a small database. Since 0011 decision_events is
+partitioned and the index exists once per partition under generated names,
+so every index in the partition tree of ix_decision_events_ticker_rule counts.
+"""
+from __future__ import annotations
+
+import json
+from typing import Any, Iterator, Set
+
+from sqlalchemy import text
+
+from app.services.ticker_rules import active_rules_stmt
+
+INDEX = "ix_decision_events_ticker_rule"
+
+
+def plan_nodes(node: Any) -> Iterator[dict]:
+    yield node
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def index_tree(db) -> Set[str]:
+    """
+    The index and, on a partitioned decision_events, its per-partition children.
+    """
+    return set(
+        db.execute(
+            text(
+                """
+                SELECT c.relname
+                FROM pg_partition_tree(CAST(:index AS regclass)) t
+                JOIN pg_class c ON c.oid = t.relid
+                """
+            ),
+            {"index": INDEX},
+        ).scalars()
+    )
+
+
+def forced_plan(db, ticker: str) -> dict:
+    sql = str(active_rules_stmt(ticker).compile(dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True}))
+    db.execute(text("SET LOCAL enable_seqscan = off"))
+    raw = db.execute(text("EXPLAIN (FORMAT JSON) " + sql)).scalar()
+    plan = raw if isinstance(raw, list) else json.loads(raw)
+    return plan[0]["Plan"]
+
+
+def test_index_exists_on_every_partition(live_db):
+    names = index_tree(live_db)
+    assert INDEX in names
+
+    relkind = live_db.execute(text("SELECT relkind FROM pg_class WHERE oid = 'decision_events'::regclass")).scalar()
+    if relkind != "p":  # before 0011
+        assert names == {INDEX}
+        return
+    leaves = live_db.execute(text("SELECT count(*) FROM pg_partition_tree('decision_events') WHERE isleaf")).scalar()
+    assert len(names) == leaves + 1
+
+
+def test_active_rules_lookup_uses_ticker_rule_index(live_db):
+    allowed = index_tree(live_db)
+    nodes = list(plan_nodes(forced_plan(live_db, "AAPL")))
+
+    used = {n["Index Name"] for n in nodes if "Index Name" in n}
+    assert used, f"no index scan in plan: {[n['Node Type'] for n in nodes]}"
+    assert used <= allowed, f"unexpected indexes: {sorted(used - allowed)}"
+    seq = [n.get("Relation Name") for n in nodes if n["Node Type"] == "Seq Scan"]
+    assert not seq, f"sequential scans on {seq}"